@@ -0,0 +1,279 @@
+"""Sesión de medición de batería: descarga real, autonomía y desgaste.
+
+Se toman muestras de porcentaje, ``secsleft`` y conexión del cargador a
+intervalo fijo y se guardan en un búfer circular respaldado por una matriz
+NumPy (tamaño fijo, sin crecer durante sesiones largas). Opcionalmente se
+aplica una carga controlada de CPU para medir la autonomía bajo esfuerzo.
+
+Al terminar se ajusta una recta a la curva de descarga (mínimos cuadrados)
+para estimar el consumo y la autonomía real; con la capacidad de diseño y de
+carga completa (WMI ``BatteryStaticData`` y ``BatteryFullChargedCapacity``
+en Windows) se informa además el desgaste.
+
+La fuente de lecturas, el reloj y la carga son intercambiables:
+``SimulatedBattery`` y ``VirtualClock`` permiten probar una sesión de horas
+en milisegundos.
+"""
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+import psutil
+
+# Columnas del búfer: tiempo, porcentaje, segundos restantes, cargador conectado
+T, PERCENT, SECSLEFT, PLUGGED = range(4)
+
+
+class RingBuffer:
+    """Matriz de ``capacity`` filas que descarta las más antiguas al llenarse"""
+
+    def __init__(self, capacity, columns=4):
+        self._data = np.full((capacity, columns), np.nan)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def append(self, row):
+        with self._lock:
+            self._data[self._next] = row
+            self._next = (self._next + 1) % len(self._data)
+            self._count = min(self._count + 1, len(self._data))
+
+    def __len__(self):
+        return self._count
+
+    def array(self):
+        """Copia de las filas en orden cronológico"""
+        with self._lock:
+            if self._count < len(self._data):
+                return self._data[:self._count].copy()
+            return np.concatenate((self._data[self._next:], self._data[:self._next]))
+
+
+class PsutilBatterySource:
+    def __init__(self, psutil_module=None):
+        self._psutil = psutil_module or psutil
+
+    def read(self):
+        battery = self._psutil.sensors_battery()
+        if battery is None:
+            return None
+        secs = battery.secsleft if isinstance(battery.secsleft, (int, float)) and battery.secsleft > 0 else np.nan
+        return battery.percent, secs, bool(battery.power_plugged)
+
+
+class VirtualClock:
+    """Reloj simulado: ``sleep`` avanza el tiempo sin esperar"""
+
+    def __init__(self, start=0.0):
+        self._now = start
+        self._lock = threading.Lock()
+
+    def now(self):
+        with self._lock:
+            return self._now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self._now += seconds
+
+
+class SimulatedBattery:
+    """Batería simulada con consumo en reposo y bajo carga (W) y lecturas al 1 %"""
+
+    def __init__(self, clock, capacity_wh=50.0, percent=80.0, idle_w=8.0, load_w=20.0,
+                 plugged=False, resolution=1.0):
+        self.clock = clock
+        self.capacity_wh = capacity_wh
+        self.idle_w = idle_w
+        self.load_w = load_w
+        self.plugged = plugged
+        self.resolution = resolution
+        self.loaded = False
+        self._energy_wh = capacity_wh * percent / 100
+        self._last = clock.now()
+
+    def _power(self):
+        return self.idle_w + (self.load_w if self.loaded else 0.0)
+
+    def _advance(self):
+        now = self.clock.now()
+        if not self.plugged:
+            self._energy_wh = max(self._energy_wh - self._power() * (now - self._last) / 3600, 0.0)
+        self._last = now
+
+    def set_load(self, loaded):
+        self._advance()
+        self.loaded = loaded
+
+    def read(self):
+        self._advance()
+        percent = self._energy_wh / self.capacity_wh * 100
+        # Como los sistemas reales, se informa en pasos de ``resolution`` %
+        shown = np.floor(percent / self.resolution) * self.resolution
+        secs = np.nan if self.plugged else self._energy_wh / self._power() * 3600
+        return float(shown), secs, self.plugged
+
+
+def _burn(stop):
+    a = np.random.default_rng(0).random((128, 128))
+    while not stop.is_set():
+        a = np.tanh(a @ a)
+
+
+class CpuLoad:
+    """Carga controlada: ``workers`` procesos ocupando un núcleo cada uno"""
+
+    def __init__(self, workers=1):
+        self.workers = workers
+        self._ctx = multiprocessing.get_context('spawn')
+        self._stop = self._ctx.Event()
+        self._processes = []
+
+    def start(self):
+        self._stop.clear()
+        self._processes = [self._ctx.Process(target=_burn, args=(self._stop,), daemon=True)
+                           for _ in range(self.workers)]
+        for p in self._processes:
+            p.start()
+
+    def stop(self):
+        self._stop.set()
+        for p in self._processes:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+
+
+class SimulatedLoad:
+    """Carga para ``SimulatedBattery``: solo cambia el consumo simulado"""
+
+    def __init__(self, battery):
+        self.battery = battery
+
+    def start(self):
+        self.battery.set_load(True)
+
+    def stop(self):
+        self.battery.set_load(False)
+
+
+def _longest_run(mask):
+    """``slice`` del tramo más largo de valores ``True`` consecutivos en ``mask``"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    if not len(edges):
+        return slice(0, 0)
+    starts, ends = edges[::2], edges[1::2]
+    longest = int(np.argmax(ends - starts))
+    return slice(starts[longest], ends[longest])
+
+
+def fit_discharge(samples, capacity_wh=None):
+    """Ajusta porcentaje = a + b·t sobre el tramo continuo más largo sin cargador"""
+    # Al 0 % la curva deja de bajar: esas muestras no cuentan. Un tramo con el
+    # cargador conectado en medio sube el porcentaje, así que no se unen tramos
+    unplugged = samples[_longest_run((samples[:, PLUGGED] == 0) & (samples[:, PERCENT] > 0))]
+    if len(unplugged) < 3 or np.ptp(unplugged[:, PERCENT]) == 0:
+        return None
+    t = unplugged[:, T] - unplugged[0, T]
+    slope, intercept = np.polyfit(t, unplugged[:, PERCENT], 1)
+    if slope >= 0:
+        return None
+    predicted = intercept + slope * t
+    residual = unplugged[:, PERCENT] - predicted
+    total = unplugged[:, PERCENT] - unplugged[:, PERCENT].mean()
+    r2 = 1 - (residual @ residual) / (total @ total) if total @ total else 0.0
+    rate = -slope * 3600  # % por hora
+    fit = {
+        'Descarga (%/h)': round(float(rate), 2),
+        'Autonomía con carga completa (h)': round(100 / rate, 2),
+        'Autonomía restante (h)': round(float(unplugged[-1, PERCENT]) / rate, 2),
+        'R² del ajuste': round(float(r2), 4),
+    }
+    if capacity_wh:
+        fit['Consumo medio (W)'] = round(rate / 100 * capacity_wh, 2)
+    os_estimates = unplugged[:, SECSLEFT][~np.isnan(unplugged[:, SECSLEFT])]
+    if len(os_estimates):
+        fit['Autonomía según el sistema (h)'] = round(float(np.median(os_estimates)) / 3600, 2)
+    return fit
+
+
+def battery_wear(design_mwh, full_mwh):
+    """Capacidades en mWh a un resumen de desgaste"""
+    if not design_mwh or not full_mwh:
+        return None
+    return {
+        'Capacidad de diseño (Wh)': round(design_mwh / 1000, 2),
+        'Capacidad de carga completa (Wh)': round(full_mwh / 1000, 2),
+        'Desgaste (%)': round(max(1 - full_mwh / design_mwh, 0) * 100, 1),
+    }
+
+
+class BatterySession:
+    """Muestrea la batería a intervalo fijo; ``stop`` corta la sesión desde otro hilo"""
+
+    def __init__(self, source=None, interval=10.0, capacity=4096, clock=None, sleep=None):
+        self.source = source or PsutilBatterySource()
+        self.interval = interval
+        self.samples = RingBuffer(capacity)
+        self._clock = clock or time.monotonic
+        self._sleep = sleep
+        self._stop = threading.Event()
+
+    def _wait(self, seconds):
+        if self._sleep is not None:
+            self._sleep(seconds)
+            return self._stop.is_set()
+        return self._stop.wait(seconds)
+
+    def _sample(self):
+        reading = self.source.read()
+        if reading is not None:
+            percent, secs, plugged = reading
+            self.samples.append((self._clock(), percent, secs, float(plugged)))
+        return reading
+
+    def run(self, duration, load=None, capacity_wh=None, wear=None):
+        """Toma muestras durante ``duration`` segundos (o hasta ``stop``)"""
+        self._stop.clear()
+        if self._sample() is None:
+            return {'Error': 'No se detectó batería'}
+        if load is not None:
+            load.start()
+        try:
+            end = self._clock() + duration
+            while self._clock() < end and not self._wait(self.interval):
+                self._sample()
+        finally:
+            if load is not None:
+                load.stop()
+        return self.result(capacity_wh, wear, load is not None)
+
+    def stop(self):
+        self._stop.set()
+
+    def result(self, capacity_wh=None, wear=None, loaded=False):
+        data = self.samples.array()
+        summary = {
+            'Muestras': len(data),
+            'Intervalo (s)': self.interval,
+            'Duración (min)': round(float(data[-1, T] - data[0, T]) / 60, 1) if len(data) else 0,
+            'Carga controlada': loaded,
+            'Porcentaje inicial': float(data[0, PERCENT]) if len(data) else None,
+            'Porcentaje final': float(data[-1, PERCENT]) if len(data) else None,
+            'Cargador conectado en algún momento': bool(np.any(data[:, PLUGGED] == 1)) if len(data) else None,
+        }
+        fit = fit_discharge(data, capacity_wh)
+        problems = []
+        if fit is None:
+            problems.append("No hubo descarga suficiente para estimar la autonomía (desconecte el cargador)")
+        else:
+            summary['Ajuste de descarga'] = fit
+        if wear:
+            summary['Capacidad'] = wear
+            if wear['Desgaste (%)'] >= 40:
+                problems.append(f"Batería desgastada ({wear['Desgaste (%)']}% menos que la capacidad de diseño)")
+        summary['Problemas'] = problems
+        summary['Resultado'] = 'OK' if not problems else 'REVISAR'
+        return summary
@@ -0,0 +1,34 @@
+"""Ejecuta la prueba de audio contra lazos sintéticos (sin tarjeta de sonido).
+
+Uso: python benchmarks/bench_audio.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_test import SyntheticLoopback, run_loopback_test  # noqa: E402
+
+SCENARIOS = {
+    'lazo limpio': dict(),
+    'parlante distorsionado': dict(distortion=0.5),
+    'canal derecho muerto': dict(dead_channels=[1]),
+    'entrada saturada': dict(overdrive=6),
+    'micrófono ruidoso': dict(noise=0.05),
+    'sin señal': dict(gain=0.0),
+}
+
+
+def main():
+    for name, options in SCENARIOS.items():
+        t0 = time.perf_counter()
+        m = run_loopback_test(SyntheticLoopback(**options))
+        elapsed = (time.perf_counter() - t0) * 1000
+        channels = ' '.join(f"[{c['Estado']} snr={c['SNR (dB)']} thd={c['THD (%)']}]" for c in m['Canales'])
+        print(f"{name:<24} {m['Resultado']:<6} latencia={m['Latencia entrada-salida (ms)']} ms "
+              f"{channels} análisis={elapsed:.0f} ms {'; '.join(m['Problemas'])}")
+
+
+if __name__ == "__main__":
+    main()
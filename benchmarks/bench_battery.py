@@ -0,0 +1,47 @@
+"""Sesiones de batería simuladas y costo por muestra del lector real.
+
+Uso: python benchmarks/bench_battery.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from battery_session import (BatterySession, PsutilBatterySource, SimulatedBattery,  # noqa: E402
+                             SimulatedLoad, VirtualClock, battery_wear)
+
+SCENARIOS = {
+    'reposo 2 h, batería nueva': dict(hours=2, load=False, full_mwh=50000),
+    'con carga 1 h, batería gastada': dict(hours=1, load=True, full_mwh=27000),
+    'cargador conectado': dict(hours=1, load=False, full_mwh=50000, plugged=True),
+}
+
+
+def main():
+    for name, options in SCENARIOS.items():
+        clock = VirtualClock()
+        battery = SimulatedBattery(clock, capacity_wh=options['full_mwh'] / 1000, percent=95,
+                                   plugged=options.get('plugged', False))
+        session = BatterySession(battery, interval=10, clock=clock.now, sleep=clock.sleep)
+        t0 = time.perf_counter()
+        r = session.run(options['hours'] * 3600, SimulatedLoad(battery) if options['load'] else None,
+                        battery.capacity_wh, battery_wear(50000, options['full_mwh']))
+        fit = r.get('Ajuste de descarga', {})
+        print(f"{name:<32} {r['Muestras']} muestras en {(time.perf_counter() - t0) * 1000:.0f} ms: "
+              f"{fit.get('Descarga (%/h)')} %/h, {fit.get('Consumo medio (W)')} W, "
+              f"autonomía {fit.get('Autonomía con carga completa (h)')} h, "
+              f"desgaste {r['Capacidad']['Desgaste (%)']}% {r['Resultado']}")
+
+    source = PsutilBatterySource()
+    n = 200
+    t0 = time.perf_counter()
+    for _ in range(n):
+        source.read()
+    per_read = (time.perf_counter() - t0) / n
+    print(f"lectura real: {per_read * 1e6:.0f} µs por muestra "
+          f"({per_read / 10 * 100:.4f}% de CPU con una muestra cada 10 s)")
+
+
+if __name__ == "__main__":
+    main()
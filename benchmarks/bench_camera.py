@@ -0,0 +1,32 @@
+"""Ejecuta la prueba de cámara contra fuentes sintéticas (sin cámara ni pantalla).
+
+Uso: python benchmarks/bench_camera.py [segundos]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from camera_bench import SyntheticFrameSource, run_camera_benchmark  # noqa: E402
+
+SCENARIOS = {
+    'webcam 30 fps': dict(fps=30),
+    'webcam 30 fps, pierde 1 de 10': dict(fps=30, drop_every=10),
+    'webcam lenta 3 fps': dict(fps=3),
+    'sensor muerto (negro)': dict(fps=30, black=True),
+    'imagen congelada': dict(fps=30, frozen=True),
+}
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    for name, options in SCENARIOS.items():
+        m = run_camera_benchmark(SyntheticFrameSource(**options), duration)
+        print(f"{name:<32} {m['Resultado']:<6} fps={m['FPS efectivos']:<6} "
+              f"jitter={m.get('Jitter (ms)')} ms perdidos={m.get('Cuadros perdidos (estimado)')} "
+              f"no analizados={m['Cuadros no analizados']} lectura p95={(m['Latencia de lectura (ms)'] or {}).get('p95')} ms "
+              f"{'; '.join(m['Problemas'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Ejecuta la prueba de núcleos y muestra el rendimiento por núcleo.
+
+Uso: python benchmarks/bench_cpu_stress.py [segundos] [procesos]
+
+Con más procesos que núcleos permitidos, los sobrantes se fijan a núcleos ya
+ocupados y deben aparecer con menos operaciones/s. Con ``taskset -c 0,1`` solo
+se lanzan y fijan dos procesos.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cpu_stress import run_cpu_stress  # noqa: E402
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    r = run_cpu_stress(duration, workers=workers)
+    for core in r['Núcleos']:
+        print(f"núcleo {core['Núcleo']:<3} fijado={core['Fijado al núcleo']!s:<5} {core['Operaciones/s']} op/s "
+              f"errores={core['Errores de cálculo']} {core['Frecuencia media (MHz)']} MHz {core['Estado']}")
+    print(f"total {r['Operaciones/s (total)']} op/s, temperatura máx. {r['Temperatura máxima (°C)']} °C, "
+          f"{len(r['Muestras'])} muestras: {r['Resultado']}")
+
+
+if __name__ == "__main__":
+    main()
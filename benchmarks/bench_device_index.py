@@ -0,0 +1,71 @@
+"""Compara las consultas por sección contra el inventario de dispositivos de una pasada.
+
+Uso: python benchmarks/bench_device_index.py [dispositivos] [coste_por_fila_us] [latencia_por_consulta_ms]
+
+Antes cada sección de puertos consultaba su propia clase con un filtro por
+subcadena, y el proveedor recorre todas las entidades en cada consulta (la
+latencia por consulta simula ese recorrido). Ahora ``Win32_PnPEntity`` se
+consulta y clasifica una vez, y los adaptadores WiFi (cuyo estado solo está en
+``Win32_NetworkAdapter``) se piden aparte. También se mide la clasificación sola con
+inventarios crecientes para mostrar que es lineal.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_inventory import DeviceIndex, DeviceInventory, query_devices  # noqa: E402
+from platform_backend import NETWORK_ADAPTER_COLUMNS, WIFI_NAME_PATTERNS  # noqa: E402
+from wmi_session import WMISession, contains, like  # noqa: E402
+from fake_wmi import FakeWMIProvider, synthetic_device_inventory, synthetic_network_adapters  # noqa: E402
+
+
+def before(session):
+    # Una consulta por sección, como hacía check_ports (las clases dedicadas se simulan sobre PnPEntity)
+    session.query("Win32_PnPEntity", ["Name", "Status", "PNPDeviceID"], like("PNPDeviceID", "USB\\%"))
+    session.query("Win32_PnPEntity", ["Name"], contains("Name", "jack"))
+    session.query("Win32_PnPEntity", ["Name", "Status", "PNPDeviceID"], contains(["Name", "PNPDeviceID"], "HDMI"))
+    session.query("Win32_PnPEntity", ["Name", "Status"], contains("Name", "Bluetooth"))
+    session.query("Win32_NetworkAdapter", ["Name", "NetConnectionStatus", "NetEnabled"],
+                  like("Name", "%wireless%", "%wi-fi%"))
+    session.query("Win32_PnPEntity", ["Name"], contains("Name", "Webcam"))
+
+
+def after(session):
+    inventory = DeviceInventory(lambda: query_devices(session))
+    for category in ('USB', 'Jack', 'HDMI', 'Bluetooth', 'Cámara'):
+        inventory.index().get(category)
+    session.query("Win32_NetworkAdapter", NETWORK_ADAPTER_COLUMNS, like("Name", *WIFI_NAME_PATTERNS))
+    return inventory
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    row_cost = (float(sys.argv[2]) if len(sys.argv) > 2 else 20.0) / 1e6
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 100.0) / 1e3
+    rows = synthetic_device_inventory(count)
+    adapters = synthetic_network_adapters(rows)
+    print(f"Win32_PnPEntity sintético con {count} dispositivos")
+    for label, run in (("antes (consulta por sección)", before), ("después (una pasada)", after)):
+        provider = FakeWMIProvider({'Win32_PnPEntity': rows, 'Win32_NetworkAdapter': adapters},
+                                   latency=latency, row_cost=row_cost)
+        start = time.perf_counter()
+        result = run(WMISession(connect=provider.connect))
+        elapsed = time.perf_counter() - start
+        builds = f", índice construido {result.builds} vez" if result else ""
+        print(f"{label:<30} {len(provider.queries):>2} consultas {provider.rows_materialized:>7} filas "
+              f"{elapsed * 1000:>9.2f} ms{builds}")
+
+    print("\nclasificación sola (sin WMI):")
+    for n in (count // 4, count // 2, count, count * 2):
+        sample = synthetic_device_inventory(n)
+        start = time.perf_counter()
+        index = DeviceIndex(sample)
+        elapsed = time.perf_counter() - start
+        print(f"  {n:>7} dispositivos {elapsed * 1000:>8.2f} ms  {elapsed / n * 1e6:.2f} µs/dispositivo")
+    print(f"  categorías: {index.counts()}")
+
+
+if __name__ == "__main__":
+    main()
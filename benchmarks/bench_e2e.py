@@ -0,0 +1,208 @@
+"""Benchmark de punta a punta de la revisión sobre un equipo simulado.
+
+Corre todos los recolectores y el resto del flujo (revisión con y sin
+historial previo, resumen en pantalla, reporte JSON, exportación de valores y
+pruebas de audio y cámara) con los proveedores de ``fake_system`` a varias
+escalas. Cada repetición usa un equipo simulado nuevo, como una ejecución
+nueva de la herramienta; el tiempo es la mediana de las repeticiones y el pico
+de memoria (tracemalloc) se mide en una pasada aparte.
+
+El resultado es un JSON (en stdout o en ``--salida``). Con ``--base`` se
+compara contra un resultado guardado y el proceso termina con código 1 si
+alguna medida empeora más que ``--umbral``.
+
+Uso: python benchmarks/bench_e2e.py [--escalas pequeño,mediano,grande] [--repeticiones N]
+                                    [--latencia FACTOR] [--salida ARCHIVO] [--base ARCHIVO] [--umbral 0.2]
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as app  # noqa: E402
+from fake_system import simulated_machine  # noqa: E402
+
+FORMAT_VERSION = 1
+
+SCALES = {
+    'pequeño': {'devices': 150, 'programs': 100, 'partitions': 1, 'nics': 2},
+    'mediano': {'devices': 1500, 'programs': 1500, 'partitions': 4, 'nics': 6},
+    'grande': {'devices': 10000, 'programs': 15000, 'partitions': 12, 'nics': 24},
+}
+
+# Diferencias menores que estas se consideran ruido aunque superen el umbral relativo
+MIN_DELTA = {'etapas_s': 0.005, 'recolectores_s': 0.005, 'memoria_pico_kib': 256}
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def pipeline(workdir, camera_seconds):
+    """Etapas del flujo en orden: (nombre, función sin argumentos)"""
+    state = {}
+    history = os.path.join(workdir, 'historial.db')
+
+    def collect():
+        state['report'] = app.collect_report(20, history_path=history)
+
+    def collect_again():
+        # Segunda revisión del mismo equipo: reutiliza las secciones del historial
+        app.collect_report(20, history_path=history)
+
+    return state, [
+        ('revisión', collect),
+        ('revisión con historial', collect_again),
+        ('resumen', lambda: app.print_summary(state['report'])),
+        ('guardar JSON', lambda: app.save_to_file(state['report'], os.path.join(workdir, 'reporte.json'))),
+        ('exportar valores', lambda: app.export_report_records([state['report']], os.path.join(workdir, 'valores'),
+                                                                ['jsonl', 'npz'])),
+        ('prueba de audio', lambda: app.prueba_microfono_sonido(False)),
+        ('prueba de cámara', lambda: app.prueba_camara(False, camera_seconds)),
+    ]
+
+
+def run_once(sizes, latency_scale, camera_seconds, traced=False):
+    """Una ejecución completa; devuelve tiempos (o picos de memoria) por etapa"""
+    measures = {}
+    with tempfile.TemporaryDirectory() as workdir, open(os.devnull, 'w') as devnull, \
+            simulated_machine(latency_scale=latency_scale, **sizes) as machine:
+        state, stages = pipeline(workdir, camera_seconds)
+        with contextlib.redirect_stdout(devnull):
+            if traced:
+                tracemalloc.start()
+            try:
+                for name, stage in stages:
+                    if traced:
+                        tracemalloc.reset_peak()
+                        stage()
+                        measures[name] = round(tracemalloc.get_traced_memory()[1] / 1024)
+                    else:
+                        start = time.perf_counter()
+                        stage()
+                        measures[name] = time.perf_counter() - start
+            finally:
+                if traced:
+                    tracemalloc.stop()
+        collectors = {name: t for name, t in state['report']['Tiempos de Recolección (s)'].items() if name != 'Total'}
+        counters = {
+            'consultas_wmi': len(machine.wmi.queries) + len(machine.battery_wmi.queries),
+            'filas_wmi': machine.wmi.rows_materialized + machine.battery_wmi.rows_materialized,
+            'llamadas_psutil': machine.psutil.calls,
+            'claves_registro_abiertas': sum(r.opens for r in machine.registries),
+            'procesos_powershell': machine.powershell.starts,
+            'comandos_powershell': machine.powershell.commands_run,
+        }
+    return measures, collectors, counters
+
+
+def bench_scale(sizes, repetitions, latency_scale, camera_seconds):
+    stages, collectors = {}, {}
+    for _ in range(repetitions):
+        times, collector_times, counters = run_once(sizes, latency_scale, camera_seconds)
+        for name, t in times.items():
+            stages.setdefault(name, []).append(t)
+        for name, t in collector_times.items():
+            collectors.setdefault(name, []).append(t)
+    # Tiempo y memoria en pasadas separadas: tracemalloc distorsiona el tiempo
+    peaks, _, _ = run_once(sizes, latency_scale, camera_seconds, traced=True)
+    return {
+        'tamaños': dict(sizes),
+        'etapas_s': {name: round(statistics.median(v), 4) for name, v in stages.items()},
+        'recolectores_s': {name: round(statistics.median(v), 4) for name, v in collectors.items()},
+        'memoria_pico_kib': peaks,
+        'contadores': counters,
+    }
+
+
+def compare(result, baseline, threshold):
+    """Imprime las diferencias contra ``baseline``; devuelve las regresiones"""
+    regressions = []
+    for scale, current in result['escalas'].items():
+        previous = baseline.get('escalas', {}).get(scale)
+        if previous is None:
+            log(f"{scale}: sin datos en la base")
+            continue
+        if previous.get('tamaños') != current['tamaños']:
+            log(f"{scale}: los tamaños difieren de la base, la comparación es orientativa")
+        for group, floor in MIN_DELTA.items():
+            for name, value in current[group].items():
+                old = previous.get(group, {}).get(name)
+                if old is None:
+                    continue
+                change = (value - old) / old if old else 0.0
+                regressed = value - old > floor and change > threshold
+                if regressed:
+                    regressions.append((scale, group, name, old, value))
+                log(f"{scale:<8} {group:<17} {name:<36} {old:>10g} -> {value:>10g}  {change:>+7.1%}"
+                    f"{'  REGRESIÓN' if regressed else ''}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de punta a punta con hardware simulado")
+    parser.add_argument('--escalas', default=','.join(SCALES),
+                        help=f"Escalas a medir, separadas por comas ({', '.join(SCALES)})")
+    parser.add_argument('--repeticiones', type=int, default=3, help="Repeticiones por escala (mediana)")
+    parser.add_argument('--latencia', type=float, default=1.0,
+                        help="Factor sobre las latencias inyectadas (0 = sin latencia)")
+    parser.add_argument('--camara', type=float, default=1.0, help="Segundos de la prueba de cámara")
+    parser.add_argument('--salida', help="Archivo JSON para el resultado (por defecto, la salida estándar)")
+    parser.add_argument('--base', help="Resultado guardado contra el que comparar")
+    parser.add_argument('--umbral', type=float, default=0.2,
+                        help="Empeoramiento relativo que cuenta como regresión (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    args.escalas = [s.strip() for s in args.escalas.split(',') if s.strip()]
+    unknown = [s for s in args.escalas if s not in SCALES]
+    if unknown:
+        parser.error(f"Escalas desconocidas: {', '.join(unknown)}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = {
+        'formato': FORMAT_VERSION,
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticiones': args.repeticiones,
+        'factor_latencia': args.latencia,
+        'escalas': {},
+    }
+    for scale in args.escalas:
+        log(f"Escala {scale}: {SCALES[scale]}")
+        result['escalas'][scale] = bench_scale(SCALES[scale], args.repeticiones, args.latencia, args.camara)
+        for name, t in result['escalas'][scale]['etapas_s'].items():
+            log(f"  {name:<24} {t * 1000:>9.1f} ms  pico {result['escalas'][scale]['memoria_pico_kib'][name]:>8} KiB")
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        log(f"Resultado guardado en {args.salida}")
+    else:
+        print(text)
+
+    if args.base:
+        with open(args.base, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.umbral)
+        if regressions:
+            log(f"{len(regressions)} regresiones por encima del {args.umbral:.0%}")
+            return 1
+        log("Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Mide el costo de la instrumentación: span vacío y consulta WMI con y sin tracer.
+
+Uso: python benchmarks/bench_instrumentation.py [iteraciones]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentation import Tracer  # noqa: E402
+from wmi_session import WMISession  # noqa: E402
+from fake_wmi import FakeWMIProvider, synthetic_pnp_entities  # noqa: E402
+
+
+def per_call_us(func, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    tracer = Tracer()
+
+    def empty_span():
+        with tracer.span('vacío', 'prueba'):
+            pass
+
+    print(f"span vacío                  {per_call_us(empty_span, n):8.2f} µs")
+    tracer.reset()
+
+    provider = FakeWMIProvider({'Win32_PnPEntity': synthetic_pnp_entities(50)})
+    for label, session in (("consulta en caché sin tracer", WMISession(provider.connect)),
+                           ("consulta en caché con tracer", WMISession(provider.connect, tracer=tracer))):
+        session.query('Win32_PnPEntity', ['Name', 'Status'])
+        print(f"{label:<28}{per_call_us(lambda: session.query('Win32_PnPEntity', ['Name', 'Status']), n // 10):8.2f} µs")
+
+    start = time.perf_counter()
+    summary = tracer.summary()
+    trace = tracer.chrome_trace()
+    print(f"resumen y traza de {summary['Spans']} spans ({len(trace['traceEvents'])} eventos): "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Pasada completa del backend de Linux sobre un árbol de ejemplo y sobre ``/``.
+
+Cada pasada pide al backend todo lo que usa una revisión (sistema,
+procesador, GPU, BIOS, Secure Boot, batería, activación, dispositivos
+clasificados por ``device_inventory``, adaptadores WiFi, los primeros 20
+programas y las huellas) con la caché vacía, y luego otra vez con los archivos ya leídos.
+
+Uso: python benchmarks/bench_linux_backend.py [paquetes_dpkg] [paquetes_rpm] [repeticiones]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from device_inventory import DeviceIndex  # noqa: E402
+from fake_linux_root import write_linux_root  # noqa: E402
+from linux_backend import LinuxBackend  # noqa: E402
+
+
+def full_pass(backend):
+    results = {}
+    for name, call in (('os_name', backend.os_name), ('processor', backend.processor), ('gpus', backend.gpus),
+                       ('bios', backend.bios), ('secure_boot', backend.secure_boot),
+                       ('battery_capacity', backend.battery_capacity), ('activation', backend.activation),
+                       ('devices', lambda: DeviceIndex(backend.device_rows()).counts()),
+                       ('wifi_adapters', backend.wifi_adapters),
+                       ('software', lambda: backend.top_software(20)),
+                       ('fingerprints', lambda: (backend.machine_fingerprint(), backend.gpu_fingerprint(),
+                                                 backend.software_fingerprint()))):
+        try:
+            results[name] = call()
+        except Exception as e:
+            results[name] = f"Error: {e}"
+    return results
+
+
+def bench(label, root, repetitions):
+    cold, warm = [], []
+    for _ in range(repetitions):
+        backend = LinuxBackend(root)
+        start = time.perf_counter()
+        results = full_pass(backend)
+        cold.append(time.perf_counter() - start)
+        reads = backend.reads
+        start = time.perf_counter()
+        full_pass(backend)
+        warm.append(time.perf_counter() - start)
+    print(f"{label}: {statistics.median(cold) * 1000:.1f} ms sin caché, "
+          f"{statistics.median(warm) * 1000:.1f} ms con caché, {reads} archivos leídos")
+    for name, value in results.items():
+        text = repr(value if name != 'software' else [s['Nombre'] for s in value[:3]] if isinstance(value, list)
+                    else value)
+        print(f"  {name:<17} {text[:110]}")
+
+
+def main():
+    packages = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rpm_packages = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    repetitions = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        write_linux_root(tmp, packages=packages, rpm_packages=rpm_packages)
+        bench(f"árbol de ejemplo ({packages} dpkg, {rpm_packages} rpm)", tmp, repetitions)
+    bench("este equipo (/)", '/', repetitions)
+
+
+if __name__ == "__main__":
+    main()
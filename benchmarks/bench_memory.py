@@ -0,0 +1,33 @@
+"""Ejecuta la prueba de RAM sana y con un bit dañado simulado.
+
+Uso: python benchmarks/bench_memory.py [MB] [segundos]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory_test import run_memory_test  # noqa: E402
+
+
+def stuck_bit(buffer):
+    # Un bit que queda siempre en 1 en una palabra del medio
+    buffer[len(buffer) // 2] |= 1 << 13
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    for name, hook in (('memoria sana', None), ('bit pegado', stuck_bit)):
+        r = run_memory_test(fraction=1.0, max_bytes=size * 1024 ** 2, time_budget=budget, after_write=hook)
+        if 'Error' in r:
+            print(f"{name:<14} {r['Error']}")
+            continue
+        diffs = {p: v['Diferencias'] for p, v in r['Patrones'].items()}
+        print(f"{name:<14} {r['Memoria probada']} {r['Hilos']} hilos {r['Duración (s)']} s "
+              f"escritura={r.get('Escritura (GB/s)')} lectura={r.get('Lectura (GB/s)')} copia={r.get('Copia (GB/s)')} GB/s "
+              f"diferencias={diffs} {r['Resultado']}")
+
+
+if __name__ == "__main__":
+    main()
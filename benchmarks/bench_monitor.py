@@ -0,0 +1,42 @@
+"""Mide el costo del monitor: CPU propia y latencia de los scrapes.
+
+Uso: python benchmarks/bench_monitor.py [segundos] [intervalo]
+"""
+import os
+import sys
+import threading
+import time
+import urllib.request
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitor import serve_monitor  # noqa: E402
+
+
+def main():
+    duration = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    process = psutil.Process()
+    cpu0, t0 = sum(process.cpu_times()[:2]), time.monotonic()
+    monitor, server = serve_monitor(('127.0.0.1', 0), interval)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    time.sleep(duration)
+    cpu = (sum(process.cpu_times()[:2]) - cpu0) / (time.monotonic() - t0) * 100
+
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    for path in ('/metrics', '/json', '/historial'):
+        start = time.perf_counter()
+        n = 100
+        for _ in range(n):
+            size = len(urllib.request.urlopen(url + path).read())
+        print(f"{path:<11} {size:>7} bytes  {(time.perf_counter() - start) / n * 1000:.2f} ms por pedido")
+    print(f"monitor: {len(monitor.rings)} series, {duration:g} s a {interval:g} s de intervalo, "
+          f"CPU del proceso {cpu:.2f}% (objetivo < 1%)")
+    server.shutdown()
+    monitor.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Mide la sección Red antes y después de la instantánea única, y la prueba de enlace local.
+
+Uso: python benchmarks/bench_network.py [repeticiones] [segundos_por_interfaz]
+"""
+import os
+import socket
+import sys
+import time
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network import NetworkSnapshot, run_link_test  # noqa: E402
+
+
+def before():
+    # Versión anterior: net_if_stats() dos veces por dirección
+    return [{'Interfaz': interface, 'Dirección IP': addr.address, 'Máscara de Red': addr.netmask,
+             'Estado': "Conectado" if interface in psutil.net_if_stats() and psutil.net_if_stats()[interface].isup
+             else "Desconectado"}
+            for interface, addrs in psutil.net_if_addrs().items() for addr in addrs if addr.family == socket.AF_INET]
+
+
+def after():
+    snapshot = NetworkSnapshot()
+    return snapshot.addresses(), snapshot.interfaces()
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    for label, func in (("antes (tabla por dirección)", before), ("después (instantánea)", after)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        print(f"{label:<30} {(time.perf_counter() - start) / repeat * 1000:8.3f} ms por revisión")
+
+    result = run_link_test(time_budget=budget)
+    print(f"\nprueba de enlace contra el par {result['Par']}:")
+    for entry in result['Interfaces']:
+        rtt = entry.get('RTT (ms)') or {}
+        print(f"  {entry['Interfaz']:<10} subida {entry.get('Subida (Mbps)')} Mbps  bajada {entry.get('Bajada (Mbps)')} Mbps  "
+              f"RTT p50 {rtt.get('p50')} ms p99 {rtt.get('p99')} ms  {entry['Resultado']}")
+
+
+if __name__ == "__main__":
+    main()
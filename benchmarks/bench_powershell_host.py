@@ -0,0 +1,61 @@
+"""Compara un proceso por comprobación contra el host de PowerShell persistente.
+
+Usa ``fake_powershell.py`` con un arranque simulado (por defecto 1 s, como
+PowerShell en un equipo típico) y verifica además los tiempos máximos, la
+salida suelta y la recuperación cuando el proceso termina.
+
+Uso: python benchmarks/bench_powershell_host.py [comprobaciones] [segundos_de_arranque]
+"""
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ps_host import CommandError, HostError, PowerShellHost  # noqa: E402
+
+FAKE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_powershell.py')
+
+
+def spawn_per_check(checks, startup):
+    # Comportamiento anterior: un proceso nuevo por comprobación
+    for _ in range(checks):
+        subprocess.run([sys.executable, FAKE, str(startup)], input='{"id":1,"script":"Confirm-SecureBootUEFI"}\n',
+                       capture_output=True, text=True, check=True)
+
+
+def main():
+    checks = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    startup = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+    start = time.perf_counter()
+    spawn_per_check(checks, startup)
+    print(f"un proceso por comprobación  {checks:>3} comprobaciones  {time.perf_counter() - start:7.2f} s")
+
+    host = PowerShellHost([sys.executable, FAKE, str(startup)], timeout=2.0)
+    start = time.perf_counter()
+    for _ in range(checks):
+        assert host.run('Confirm-SecureBootUEFI') is True
+    print(f"host persistente             {checks:>3} comprobaciones  {time.perf_counter() - start:7.2f} s")
+    start = time.perf_counter()
+    results = host.batch(['Confirm-SecureBootUEFI'] * checks)
+    assert results == [True] * checks
+    print(f"host persistente, en lote    {checks:>3} comprobaciones  {(time.perf_counter() - start) * 1000:7.2f} ms")
+
+    # Salida suelta, error del comando, tiempo agotado y caída del proceso en un mismo lote
+    results = host.batch(["Write-Host ruido", "throw 'falla'", "Start-Sleep -Seconds 5", "Confirm-SecureBootUEFI",
+                          "[Environment]::Exit(3)", "Get-CimInstance SoftwareLicensingProduct"], timeout=0.5)
+    assert results[0] is None
+    assert isinstance(results[1], CommandError) and str(results[1]) == 'falla'
+    assert isinstance(results[2], HostError)
+    assert results[3] is True
+    assert isinstance(results[4], HostError)
+    assert results[5][0]['LicenseStatus'] == 1
+    print(f"recuperación: {host.starts} procesos lanzados, {host.timeouts} tiempo agotado, "
+          f"{host.commands_run} comandos respondidos")
+    host.close()
+
+
+if __name__ == "__main__":
+    main()
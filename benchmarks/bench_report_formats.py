@@ -0,0 +1,110 @@
+"""Compara carga y tamaño del reporte JSON actual con JSON Lines y NPZ.
+
+Simula N reportes: con el formato actual hay que abrir un archivo por equipo y
+volver a convertir "12.5 GB" / "43%" en números; con los exportadores basta
+una lectura de los valores crudos.
+
+Uso: python benchmarks/bench_report_formats.py [equipos]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_schema import NotebookRecord, format_gb, format_percent  # noqa: E402
+from report_export import WRITERS  # noqa: E402
+
+
+def synthetic_record(i, rng):
+    ram = rng.choice([4, 8, 16, 32]) * 1024**3
+    disk = rng.choice([128, 256, 512, 1024]) * 1000**3
+    return NotebookRecord(
+        hostname=f"NB-{i:06d}", checked_at="2026-10-17T10:00:00", os="Windows 10 10.0.19045",
+        bios_serial=f"SN{i:08d}", bios_manufacturer="LENOVO", bios_version="N2HET77W", bios_ok=True,
+        secure_boot=rng.random() > 0.2, cpu_model="Intel(R) Core(TM) i5-8250U CPU @ 1.60GHz",
+        cpu_physical_cores=4, cpu_logical_cores=8, cpu_max_mhz=1800.0,
+        cpu_usage_percent=rng.uniform(0, 100), cpu_freq_mhz=rng.uniform(800, 3400), cpu_temp_max_c=None,
+        ram_total_bytes=ram, ram_available_bytes=int(ram * 0.4), ram_used_bytes=int(ram * 0.6),
+        ram_percent=60.0, disk_count=1, disk_total_bytes=disk, disk_used_bytes=int(disk * rng.random()),
+        disk_max_percent=round(rng.uniform(5, 99), 1), battery_percent=float(rng.randint(1, 100)),
+        battery_plugged=rng.random() > 0.5, battery_secs_left=rng.uniform(600, 20000),
+        gpu_count=1, gpu_ram_bytes=1024**3, usb_devices=rng.randint(2, 10),
+        bluetooth_available=True, wifi_available=True, uptime_seconds=rng.uniform(60, 10**6))
+
+
+def legacy_report(r):
+    # Forma de notebook_report.json: textos de presentación, sangría de 4
+    return {
+        'Información General': {
+            'Sistema Operativo': r.os, 'Nombre del Host': r.hostname,
+            'Procesador': {'Modelo': r.cpu_model, 'Núcleos Físicos': r.cpu_physical_cores,
+                           'Núcleos Lógicos': r.cpu_logical_cores, 'Frecuencia Máxima': f"{r.cpu_max_mhz:.0f} MHz"},
+            'Memoria RAM': {'Total': format_gb(r.ram_total_bytes), 'Disponible': format_gb(r.ram_available_bytes),
+                            'En uso': format_gb(r.ram_used_bytes), 'Porcentaje en uso': format_percent(r.ram_percent)},
+            'Discos': [{'Dispositivo': 'C:\\', 'Espacio Total': format_gb(r.disk_total_bytes),
+                        'Espacio Usado': format_gb(r.disk_used_bytes), 'Porcentaje Usado': format_percent(r.disk_max_percent)}],
+            'Batería': {'Porcentaje': format_percent(r.battery_percent),
+                        'Estado': 'Cargando' if r.battery_plugged else 'Descargando'},
+        },
+        'BIOS': {'Fabricante': r.bios_manufacturer, 'Versión': r.bios_version, 'Número de Serie': r.bios_serial,
+                 'SecureBoot': 'Activado' if r.secure_boot else 'Desactivado'},
+        'Estado de Salud': {'CPU': {'Uso total': f"{r.cpu_usage_percent:.1f}%"}},
+        'Fecha de Revisión': r.checked_at,
+    }
+
+
+def parse_legacy(report):
+    # Lo que hoy hace la ingesta: volver a interpretar los textos
+    gb = lambda text: float(text.split()[0]) * 1024**3  # noqa: E731
+    pct = lambda text: float(text.rstrip('%'))  # noqa: E731
+    info = report['Información General']
+    return {
+        'ram_total_bytes': gb(info['Memoria RAM']['Total']),
+        'ram_percent': pct(info['Memoria RAM']['Porcentaje en uso']),
+        'disk_max_percent': max(pct(d['Porcentaje Usado']) for d in info['Discos']),
+        'battery_percent': pct(info['Batería']['Porcentaje']),
+        'cpu_usage_percent': pct(report['Estado de Salud']['CPU']['Uso total']),
+    }
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(42)
+    records = [synthetic_record(i, rng) for i in range(count)]
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_dir = os.path.join(tmp, 'legacy')
+        os.mkdir(legacy_dir)
+        for r in records:
+            with open(os.path.join(legacy_dir, f"{r.hostname}.json"), 'w', encoding='utf-8') as f:
+                json.dump(legacy_report(r), f, indent=4, ensure_ascii=False)
+        legacy_size = sum(os.path.getsize(os.path.join(legacy_dir, n)) for n in os.listdir(legacy_dir))
+
+        def load_legacy():
+            rows = []
+            for name in os.listdir(legacy_dir):
+                with open(os.path.join(legacy_dir, name), encoding='utf-8') as f:
+                    rows.append(parse_legacy(json.load(f)))
+            return rows
+
+        _, legacy_time = timed(load_legacy)
+        print(f"{count} reportes sintéticos")
+        print(f"{'json (actual)':<16} {legacy_size / 1024:>10.0f} KiB  carga+parseo {legacy_time * 1000:>9.1f} ms")
+        for name, writer in WRITERS.items():
+            path = os.path.join(tmp, f"fleet.{writer.extension}")
+            writer.write(records, path)
+            _, load_time = timed(lambda: writer.load(path))
+            print(f"{name:<16} {os.path.getsize(path) / 1024:>10.0f} KiB  carga        {load_time * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Ingesta y consultas del índice de reportes sobre una flota sintética.
+
+Genera N archivos ``notebook_report.json`` (la mitad sin ``_valores``, como
+los reportes anteriores, para medir también la interpretación de textos) y
+mide la ingesta en uno y en varios procesos, la reingesta sin cambios, la de
+archivos tocados con el mismo contenido y algunas consultas típicas.
+
+Uso: python benchmarks/bench_report_index.py [reportes] [procesos]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_index import ReportIndex, extract_record, parse_aggregate, parse_filter  # noqa: E402
+from report_schema import format_gb, format_percent  # noqa: E402
+
+GB = 1024 ** 3
+CPUS = ["Intel(R) Core(TM) i5-8350U CPU @ 1.70GHz", "Intel(R) Core(TM) i7-1165G7 @ 2.80GHz",
+        "AMD Ryzen 5 PRO 4650U with Radeon Graphics"]
+
+
+def synthetic_report(i, rng, with_values):
+    ram = rng.choice([4, 8, 16, 32]) * GB
+    ram_percent = round(rng.uniform(20, 90), 1)
+    disks = [(rng.choice([128, 256, 512]) * GB, round(rng.uniform(10, 99), 1)) for _ in range(rng.randint(1, 3))]
+    battery = round(rng.uniform(5, 100))
+    wear = round(rng.uniform(0, 60), 1)
+    secure_boot = rng.random() > 0.2
+    cpu = CPUS[i % len(CPUS)]
+    report = {
+        'Información General': {
+            'Sistema Operativo': "Windows 10 10.0.19045",
+            'Nombre del Host': f"NB-{i:06d}",
+            'Procesador': {'Modelo': cpu, 'Núcleos Físicos': 4, 'Núcleos Lógicos': 8, 'Frecuencia Máxima': "1896 MHz"},
+            'Memoria RAM': {'Total': format_gb(ram), 'Disponible': format_gb(ram * (1 - ram_percent / 100)),
+                            'En uso': format_gb(ram * ram_percent / 100), 'Porcentaje en uso': format_percent(ram_percent)},
+            'Discos': [{'Dispositivo': f"{chr(67 + k)}:\\", 'Espacio Total': format_gb(total),
+                        'Espacio Usado': format_gb(total * pct / 100), 'Porcentaje Usado': format_percent(pct)}
+                       for k, (total, pct) in enumerate(disks)],
+            'Batería': {'Porcentaje': format_percent(battery), 'Estado': "Descargando", 'Desgaste (%)': wear},
+        },
+        'BIOS': {'Fabricante': "Dell Inc.", 'Versión': "DELL - 1072009", 'Número de Serie': f"SN{i:07d}",
+                 'Estado': 'OK', 'SecureBoot': 'Activado' if secure_boot else 'Desactivado'},
+        'Estado de Salud': {
+            'CPU': {'Uso total': f"{rng.uniform(1, 60):.1f}%"},
+            'Discos': [{'Disco': f"{chr(67 + k)}:\\", 'Uso': f"{pct}%", 'Estado': 'OK' if pct < 90 else 'ALTO USO'}
+                       for k, (_, pct) in enumerate(disks)],
+        },
+        'Software Instalado (primeros 20)': [{'Nombre': f"Programa {n}", 'Versión': "1.0"} for n in range(20)],
+        'Fecha de Revisión': f"2026-{(i % 12) + 1:02d}-{(i % 28) + 1:02d} 10:00:00",
+    }
+    if with_values:
+        # Los reportes actuales traen los valores crudos; los anteriores solo textos
+        report['_valores'] = extract_record(report)
+    return report
+
+
+def write_fleet(directory, count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        sub = os.path.join(directory, f"lote{i // 1000:03d}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"notebook_report_{i:06d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(synthetic_report(i, rng, with_values=i % 2 == 0), f, ensure_ascii=False, indent=4)
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<44} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as tmp:
+        reports = os.path.join(tmp, 'reportes')
+        timed(f"generar {count} reportes", lambda: write_fleet(reports, count))
+
+        for k, (label, n) in enumerate((("ingesta (1 proceso)", 1), (f"ingesta ({workers} procesos)", workers))):
+            index = ReportIndex(os.path.join(tmp, f"indice_{k}.db"))
+            stats = timed(label, lambda: index.ingest([reports], workers=n))
+            index.close()
+        print(f"  {stats}")
+
+        index = ReportIndex(os.path.join(tmp, "indice_1.db"))
+        stats = timed("reingesta sin cambios", lambda: index.ingest([reports], workers=workers))
+        print(f"  sin cambios: {stats['Sin cambios']}")
+        touched = [os.path.join(root, name) for root, _, names in os.walk(reports) for name in names][::10]
+        for path in touched:
+            os.utime(path)
+        stats = timed(f"reingesta con {len(touched)} archivos tocados", lambda: index.ingest([reports], workers=workers))
+        print(f"  contenido repetido: {stats['Contenido repetido']}, interpretados: {stats['Interpretados']}")
+
+        queries = [
+            ("batería < 60% o disco > 90% o Secure Boot apagado",
+             dict(filters=[parse_filter('battery_percent<60'), parse_filter('disk_alerts>=1'),
+                           parse_filter('secure_boot=false')], any_of=True, columns=['hostname'])),
+            ("RAM >= 16 GB y desgaste > 40%",
+             dict(filters=[parse_filter('ram_total_bytes>=16GB'), parse_filter('battery_wear_percent>40')],
+                  columns=['hostname', 'battery_wear_percent'])),
+            ("promedio de batería por procesador",
+             dict(group_by='cpu_model', aggregates=[parse_aggregate('count'),
+                                                    parse_aggregate('avg:battery_percent')])),
+            ("un equipo por número de serie",
+             dict(filters=[parse_filter(f"bios_serial=SN{count // 2:07d}")])),
+        ]
+        for label, kwargs in queries:
+            rows = timed(f"consulta: {label}", lambda: index.query(**kwargs))
+            print(f"  {len(rows)} filas")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Almacén deduplicado sobre una flota sintética salida de pocas imágenes.
+
+Genera N reportes como los de ``bench_report_index`` pero con el software
+completo de una de unas pocas imágenes y una GPU por modelo, los guarda en el
+almacén y mide la ingesta, la reingesta sin cambios, la reconstrucción de
+reportes (verificando que sean iguales a los originales) y el tamaño en disco
+frente a los archivos JSON.
+
+Uso: python benchmarks/bench_report_store.py [reportes] [procesos] [imágenes]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_report_index import synthetic_report  # noqa: E402
+from report_store import ReportStore  # noqa: E402
+
+GPUS = [{'Name': "Intel(R) UHD Graphics 620", 'AdapterRAM': "1.00 GB", 'CurrentHorizontalResolution': 1920,
+         'CurrentVerticalResolution': 1080, 'DriverVersion': "31.0.101.2111"},
+        {'Name': "AMD Radeon(TM) Graphics", 'AdapterRAM': "0.50 GB", 'CurrentHorizontalResolution': 1920,
+         'CurrentVerticalResolution': 1200, 'DriverVersion': "31.0.12027.9001"}]
+
+
+def image_software(image, programs=250):
+    rng = random.Random(image)
+    return [{'Nombre': f"Programa {n:03d}", 'Versión': f"{rng.randint(1, 20)}.{rng.randint(0, 9)}",
+             'Publicador': f"Empresa {n % 40}", 'Fecha de Instalación': f"2025{rng.randint(1, 12):02d}15"}
+            for n in range(programs)]
+
+
+def write_fleet(directory, count, images, seed=0):
+    rng = random.Random(seed)
+    software = [image_software(image) for image in range(images)]
+    total = 0
+    for i in range(count):
+        report = synthetic_report(i, rng, with_values=True)
+        report['Información General']['GPU'] = [GPUS[i % len(GPUS)]]
+        del report['Software Instalado (primeros 20)']
+        report['Software Instalado'] = software[i % images]
+        sub = os.path.join(directory, f"lote{i // 1000:03d}")
+        os.makedirs(sub, exist_ok=True)
+        path = os.path.join(sub, f"notebook_report_{i:06d}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        total += os.path.getsize(path)
+    return total
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<44} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    images = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    mb = 1024 ** 2
+    with tempfile.TemporaryDirectory() as tmp:
+        reports = os.path.join(tmp, 'reportes')
+        size = timed(f"generar {count} reportes ({images} imágenes)", lambda: write_fleet(reports, count, images))
+        print(f"  archivos JSON: {size / mb:.1f} MB")
+
+        store = ReportStore(os.path.join(tmp, 'almacen.db'))
+        stats = timed("ingesta", lambda: store.ingest([reports], workers=workers))
+        print(f"  {stats}")
+        stats = timed("reingesta sin cambios", lambda: store.ingest([reports], workers=workers))
+        print(f"  sin cambios: {stats['Sin cambios']}")
+
+        revisions = store.revisions(limit=0)
+        sample = random.Random(1).sample(revisions, min(1000, len(revisions)))
+        restored = timed(f"reconstruir {len(sample)} reportes", lambda: [store.load(r['id']) for r in sample])
+        print(f"  secciones descomprimidas: {store.decompressed}")
+        for revision, report in zip(sample, restored):
+            with open(revision['path'], encoding='utf-8') as f:
+                if json.load(f) != report:
+                    raise SystemExit(f"La revisión {revision['id']} no coincide con {revision['path']}")
+        print("  todos coinciden con el original")
+        timed("revisiones de un equipo", lambda: store.revisions(f"SN{count // 2:07d}"))
+
+        summary = store.stats()
+        for key, value in summary.items():
+            if key != 'Por sección':
+                print(f"  {key}: {value}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
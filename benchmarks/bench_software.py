@@ -0,0 +1,70 @@
+"""Compara la enumeración anterior del software instalado con la nueva.
+
+Uso: python benchmarks/bench_software.py [programas]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from software_inventory import UNINSTALL_KEYS, iter_installed_software, top_software  # noqa: E402
+from fake_registry import FakeRegistryBackend, synthetic_hive  # noqa: E402
+
+
+def old_top20(reg):
+    # Réplica del algoritmo anterior: QueryValueEx repetido, sin cerrar handles
+    software_list = []
+    for path in UNINSTALL_KEYS:
+        key = reg.open_key(None, path)
+        for subkey_name in reg.iter_subkeys(key):
+            try:
+                subkey = reg.open_key(key, subkey_name)
+                name = reg.query_value(subkey, "DisplayName")[0]
+                version = reg.query_value(subkey, "DisplayVersion")[0] if reg.query_value(subkey, "DisplayVersion") else "N/A"
+                publisher = reg.query_value(subkey, "Publisher")[0] if reg.query_value(subkey, "Publisher") else "N/A"
+                install_date = reg.query_value(subkey, "InstallDate")[0] if reg.query_value(subkey, "InstallDate") else "N/A"
+                software_list.append({'Nombre': name, 'Versión': version,
+                                      'Publicador': publisher, 'Fecha de Instalación': install_date})
+            except OSError:
+                continue
+    return sorted([s for s in software_list if s.get('Nombre')], key=lambda x: x['Nombre'])[:20]
+
+
+def stream_all(reg):
+    # Volcado completo a un destino que solo cuenta bytes, sin construir la lista
+    written = 0
+    count = 0
+    for entry in iter_installed_software(reg):
+        written += len(repr(entry))
+        count += 1
+    return count
+
+
+def measure(label, func, tree):
+    # Tiempo y memoria en pasadas separadas: tracemalloc distorsiona el tiempo
+    start = time.perf_counter()
+    func(FakeRegistryBackend(tree))
+    elapsed = time.perf_counter() - start
+    reg = FakeRegistryBackend(tree)
+    tracemalloc.start()
+    result = func(reg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = result if isinstance(result, int) else len(result)
+    print(f"{label:<24} {size:>6} entradas {elapsed * 1000:>9.1f} ms  pico {peak / 1024:>9.0f} KiB  "
+          f"lecturas {reg.value_reads:>7}  handles abiertos {reg.open_handles:>6}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    tree = synthetic_hive(count)
+    print(f"Colmena sintética con {count} programas")
+    measure("antes (top 20)", old_top20, tree)
+    measure("después (top 20)", lambda reg: top_software(20, reg), tree)
+    measure("después (todo, stream)", stream_all, tree)
+
+
+if __name__ == "__main__":
+    main()
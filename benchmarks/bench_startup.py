@@ -0,0 +1,68 @@
+"""Mide el arranque del diagnóstico: tiempo de importación y hasta la primera salida.
+
+* Ejecuta ``python -X importtime -c "import main"`` y muestra los módulos que
+  más tardan en importarse (tiempo acumulado), y si se cargaron módulos
+  pesados (cv2, sounddevice, numpy...) que una recolección no necesita.
+* Lanza ``main.py collect --no-interactivo`` y mide cuánto tarda en aparecer
+  la primera línea en pantalla.
+
+Uso: python benchmarks/bench_startup.py [repeticiones]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('cv2', 'sounddevice', 'soundfile', 'numpy', 'wmi', 'pythoncom')
+
+
+def import_profile():
+    """Devuelve ``[(microsegundos acumulados, módulo)]`` de -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                            cwd=ROOT, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:  propio |  acumulado | módulo" (la sangría indica anidamiento)
+        _, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative_us), name.rstrip()[1:]))
+    return rows
+
+
+def heavy_loaded():
+    code = f"import main, sys; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    return result.stdout.strip() or '(ninguno)'
+
+
+def time_to_first_output():
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, 'main.py'), 'collect', '--no-interactivo',
+                             '--sin-historial'], cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    proc.stdout.readline()
+    elapsed = time.perf_counter() - start
+    proc.kill()
+    proc.wait()
+    return elapsed
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rows = import_profile()
+    total = next(us for us, name in rows if name == 'main')
+    # Módulos importados directamente por main (un nivel de sangría)
+    direct = [(us, name.strip()) for us, name in rows if name.startswith('  ') and not name.startswith('    ')]
+    print(f"Importación de main: {total / 1000:.1f} ms")
+    for us, name in sorted(direct, reverse=True)[:10]:
+        print(f"  {us / 1000:>8.1f} ms  {name}")
+    print(f"Módulos pesados cargados al importar: {heavy_loaded()}")
+    samples = [time_to_first_output() for _ in range(repeats)]
+    print(f"Tiempo hasta la primera salida: mediana {statistics.median(samples) * 1000:.0f} ms, "
+          f"mín {min(samples) * 1000:.0f} ms ({repeats} ejecuciones)")
+
+
+if __name__ == "__main__":
+    main()
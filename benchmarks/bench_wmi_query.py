@@ -0,0 +1,46 @@
+"""Compara SELECT * + filtro en Python contra proyección y WHERE en WQL.
+
+Uso: python benchmarks/bench_wmi_query.py [filas] [coste_por_fila_us]
+
+El coste por fila (por defecto 50 µs) simula la serialización COM de cada
+objeto que el proveedor WMI real entrega a Python.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wmi_session import WMISession, contains  # noqa: E402
+from fake_wmi import FakeWMIProvider, synthetic_pnp_entities  # noqa: E402
+
+
+def run(label, provider, query):
+    session = WMISession(connect=provider.connect)
+    start = time.perf_counter()
+    devices = query(session)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(devices):>6} encontrados {provider.rows_materialized:>8} filas materializadas "
+          f"{elapsed * 1000:>9.2f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    row_cost = (float(sys.argv[2]) if len(sys.argv) > 2 else 50.0) / 1e6
+    tables = {'Win32_PnPEntity': synthetic_pnp_entities(count)}
+
+    def before(session):
+        # Comportamiento anterior: todas las columnas y filtrado en Python
+        rows = session._connect().query("SELECT * FROM Win32_PnPEntity")
+        return [{'Name': r.Name, 'Status': r.Status} for r in rows if 'bluetooth' in str(r.Name).lower()]
+
+    def after(session):
+        return session.query("Win32_PnPEntity", ["Name", "Status"], contains("Name", "Bluetooth"))
+
+    print(f"Win32_PnPEntity sintético con {count} filas")
+    run("antes (SELECT * + Python)", FakeWMIProvider(tables, row_cost=row_cost), before)
+    run("después (proyección+WHERE)", FakeWMIProvider(tables, row_cost=row_cost), after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Árbol de archivos de un notebook Linux para ``linux_backend.LinuxBackend``.
+
+Escribe bajo un directorio los archivos de sysfs, procfs y de las bases de
+paquetes que lee el backend: DMI, ``/proc/cpuinfo``, batería, EFI con Secure
+Boot, GPU y conectores DRM, dispositivos USB (concentradores, Bluetooth y
+otros), adaptador Bluetooth con rfkill, ALSA con salida HDMI y auriculares,
+interfaces de red, cámaras de video4linux, ``/var/lib/dpkg/status`` y un
+``rpmdb.sqlite`` con cabeceras rpm reales.
+"""
+import os
+import sqlite3
+import struct
+
+from linux_backend import (EFI_GLOBAL_GUID, RPM_INT32, RPM_STRING, RPMTAG_INSTALLTIME, RPMTAG_NAME, RPMTAG_RELEASE,
+                           RPMTAG_VENDOR, RPMTAG_VERSION)
+
+INSTALL_TIME = 1760000000
+
+
+def _write(root, path, content):
+    full = os.path.join(root, path.lstrip('/'))
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    with open(full, 'wb') as f:
+        f.write(content if isinstance(content, bytes) else f"{content}\n".encode('utf-8'))
+
+
+def _link(root, path, target):
+    full = os.path.join(root, path.lstrip('/'))
+    os.makedirs(os.path.dirname(full), exist_ok=True)
+    os.symlink(os.path.join(root, target.lstrip('/')), full)
+
+
+def _attrs(root, directory, values):
+    for name, value in values.items():
+        _write(root, f"{directory}/{name}", value)
+
+
+def rpm_header(entries):
+    """Cabecera rpm (sin la marca inicial, como en ``rpmdb.sqlite``) con ``{tag: str o int}``"""
+    index, data = [], b''
+    for tag, value in sorted(entries.items()):
+        if isinstance(value, int):
+            data += b'\0' * (-len(data) % 4)
+            index.append(struct.pack('>iiii', tag, RPM_INT32, len(data), 1))
+            data += struct.pack('>i', value)
+        else:
+            index.append(struct.pack('>iiii', tag, RPM_STRING, len(data), 1))
+            data += value.encode('utf-8') + b'\0'
+    return struct.pack('>ii', len(index), len(data)) + b''.join(index) + data
+
+
+def write_linux_root(root, usb_devices=12, cameras=1, packages=2000, rpm_packages=0, nics=2):
+    """Crea el árbol bajo ``root``; los tamaños controlan USB, cámaras, paquetes e interfaces"""
+    _write(root, '/etc/os-release', 'PRETTY_NAME="Debian GNU/Linux 12 (bookworm)"\nID=debian')
+    _write(root, '/proc/sys/kernel/osrelease', '6.1.0-26-amd64')
+    _attrs(root, '/sys/class/dmi/id', {
+        'bios_vendor': 'Dell Inc.', 'bios_version': '1.14.0', 'bios_date': '03/15/2023', 'bios_release': '1.14',
+        'product_serial': 'BANCO01', 'product_name': 'Latitude 5420', 'product_version': '',
+        'sys_vendor': 'Dell Inc.', 'board_vendor': 'Dell Inc.', 'board_name': '0W4J4K', 'chassis_type': '10',
+    })
+
+    cpuinfo = []
+    for cpu in range(8):
+        cpuinfo.append(f"processor\t: {cpu}\nmodel name\t: 11th Gen Intel(R) Core(TM) i5-1145G7 @ 2.60GHz\n"
+                       f"cpu MHz\t\t: 1800.000\nphysical id\t: 0\ncore id\t\t: {cpu // 2}\n")
+    _write(root, '/proc/cpuinfo', '\n'.join(cpuinfo))
+    _write(root, '/sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq', '4400000')
+
+    _attrs(root, '/sys/class/power_supply/AC', {'type': 'Mains', 'online': '1'})
+    _attrs(root, '/sys/class/power_supply/BAT0', {'type': 'Battery', 'energy_full_design': '54000000',
+                                                  'energy_full': '47000000'})
+
+    _write(root, '/sys/firmware/efi/systab', '')
+    _write(root, f"/sys/firmware/efi/efivars/SecureBoot-{EFI_GLOBAL_GUID}", b'\x06\x00\x00\x00\x01')
+
+    # GPU integrada con el panel interno y un monitor HDMI
+    _attrs(root, '/sys/devices/pci0000:00/0000:00:02.0', {'vendor': '0x8086', 'device': '0x9a49'})
+    _link(root, '/sys/class/drm/card0/device', '/sys/devices/pci0000:00/0000:00:02.0')
+    _link(root, '/sys/devices/pci0000:00/0000:00:02.0/driver', '/sys/bus/pci/drivers/i915')
+    _attrs(root, '/sys/class/drm/card0-eDP-1', {'status': 'connected', 'modes': '1920x1080\n1280x720'})
+    _attrs(root, '/sys/class/drm/card0-HDMI-A-1', {'status': 'connected', 'modes': '2560x1440\n1920x1080'})
+    _attrs(root, '/sys/class/drm/card0-DP-1', {'status': 'disconnected', 'modes': ''})
+
+    # USB: un concentrador raíz, el adaptador Bluetooth y el resto de dispositivos
+    usb = '/sys/bus/usb/devices'
+    _attrs(root, f"{usb}/usb1", {'idVendor': '1d6b', 'idProduct': '0002', 'product': 'xHCI Host Controller',
+                                  'manufacturer': 'Linux Foundation', 'bDeviceClass': '09'})
+    _attrs(root, f"{usb}/2-1", {'idVendor': '8087', 'idProduct': '0026', 'product': 'AX201 Bluetooth',
+                                 'bDeviceClass': 'e0'})
+    _attrs(root, f"{usb}/2-1/2-1:1.0", {'bInterfaceClass': 'e0', 'bInterfaceProtocol': '01'})
+    for i in range(usb_devices):
+        _attrs(root, f"{usb}/1-{i + 1}", {'idVendor': f"{0x046d + i:04x}", 'idProduct': 'c52b',
+                                            'product': f"Dispositivo USB {i}", 'bDeviceClass': '00'})
+        _attrs(root, f"{usb}/1-{i + 1}/1-{i + 1}:1.0", {'bInterfaceClass': '03', 'bInterfaceProtocol': '02'})
+    _write(root, '/sys/class/bluetooth/hci0/rfkill0/soft', '0')
+
+    # ALSA: la tarjeta HDA con salidas HDMI y un códec con pin de auriculares
+    _write(root, '/proc/asound/cards', ' 0 [PCH            ]: HDA-Intel - HDA Intel PCH\n'
+                                       '                      HDA Intel PCH at 0x6001138000 irq 145')
+    _write(root, '/proc/asound/pcm', '00-00: ALC3204 Analog : ALC3204 Analog : playback 1 : capture 1\n'
+                                     '00-03: HDMI 0 : HDMI 0 : playback 1')
+    _write(root, '/proc/asound/card0/codec#0', 'Codec: Realtek ALC3204\nNode 0x21 [Pin Complex] wcaps 0x40058d: '
+                                               'Stereo Amp-Out\n  Pincap 0x0001001c: OUT HP EAPD Detect\n'
+                                               '  Pin Default 0x0321101f: [Jack] HP Out at Ext Left\n'
+                                               '    Conn = 1/8, Color = Black\n  Headphone')
+
+    # Red: WiFi, Ethernet y las interfaces virtuales que no cuentan
+    _write(root, '/sys/class/net/lo/operstate', 'unknown')
+    for i in range(nics):
+        name = 'wlp0s20f3' if i == 0 else f"enp{i}s0"
+        _link(root, f"/sys/class/net/{name}/device", f"/sys/devices/pci0000:00/0000:00:{0x14 + i:02x}.0")
+        os.makedirs(os.path.join(root, f"sys/devices/pci0000:00/0000:00:{0x14 + i:02x}.0"), exist_ok=True)
+        _write(root, f"/sys/class/net/{name}/operstate", 'up' if i == 0 else 'down')
+        _write(root, f"/sys/class/net/{name}/flags", '0x1003' if i == 0 else '0x1002')
+        if i == 0:
+            _write(root, f"/sys/class/net/{name}/phy80211/rfkill1/soft", '0')
+
+    # Cámaras: cada una con un nodo de video y uno de metadatos
+    for i in range(cameras):
+        device = f"/sys/devices/pci0000:00/0000:00:14.0/usb1/1-{20 + i}/1-{20 + i}:1.0"
+        os.makedirs(os.path.join(root, device.lstrip('/')), exist_ok=True)
+        for node in (f"video{2 * i}", f"video{2 * i + 1}"):
+            _write(root, f"/sys/class/video4linux/{node}/name", f"Integrated_Webcam_HD {i}")
+            _link(root, f"/sys/class/video4linux/{node}/device", device)
+
+    if packages:
+        stanzas = []
+        for i in range(packages):
+            name = f"paquete-{i:05d}"
+            stanzas.append(f"Package: {name}\nStatus: install ok installed\nArchitecture: amd64\n"
+                           f"Maintainer: Mantenedor {i % 50} <m{i % 50}@example.org>\nVersion: 1.{i % 10}-{i % 3}\n"
+                           f"Description: Paquete de prueba {i}\n Descripción larga del paquete {i}.\n")
+            _write(root, f"/var/lib/dpkg/info/{name}.list", f"/usr/share/doc/{name}")
+        # Un paquete desinstalado que dejó su configuración
+        stanzas.append("Package: quitado\nStatus: deinstall ok config-files\nVersion: 0.1\n")
+        _write(root, '/var/lib/dpkg/status', '\n'.join(stanzas))
+
+    if rpm_packages:
+        path = os.path.join(root, 'var/lib/rpm/rpmdb.sqlite')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute("CREATE TABLE Packages (hnum INTEGER PRIMARY KEY AUTOINCREMENT, blob BLOB NOT NULL)")
+            blobs = [(rpm_header({RPMTAG_NAME: f"rpm-{i:05d}", RPMTAG_VERSION: f"2.{i % 7}", RPMTAG_RELEASE: '1.fc40',
+                                  RPMTAG_VENDOR: 'Fedora Project', RPMTAG_INSTALLTIME: INSTALL_TIME}),)
+                     for i in range(rpm_packages)]
+            blobs.append((rpm_header({RPMTAG_NAME: 'gpg-pubkey', RPMTAG_VERSION: 'a15b79cc'}),))
+            conn.executemany("INSERT INTO Packages (blob) VALUES (?)", blobs)
+        conn.close()
+    return root
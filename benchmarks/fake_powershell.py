@@ -0,0 +1,70 @@
+"""Proceso que imita el protocolo de ``ps_host.HOST_SCRIPT`` en Linux.
+
+Lee una petición JSON por línea y responde con el marcador y un JSON. Entiende
+unos pocos comandos:
+
+* ``Confirm-SecureBootUEFI`` y la consulta de ``SoftwareLicensingProduct``
+  (respuestas fijas),
+* ``Start-Sleep -Seconds N`` (para probar los tiempos máximos),
+* ``Write-Host texto`` (salida suelta sin marcador, que el host descarta),
+* ``throw 'mensaje'`` (error del comando),
+* ``[Environment]::Exit(N)`` (el proceso termina, para probar la recuperación).
+
+Uso: python benchmarks/fake_powershell.py [segundos_de_arranque]
+"""
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ps_host import MARKER  # noqa: E402
+
+FIXED = {
+    'Confirm-SecureBootUEFI': True,
+    'Get-CimInstance SoftwareLicensingProduct': [
+        {'Name': 'Windows(R), Professional edition', 'Description': 'Windows(R) Operating System, RETAIL channel',
+         'LicenseStatus': 1},
+    ],
+}
+
+
+def execute(script):
+    for prefix, result in FIXED.items():
+        if script.startswith(prefix):
+            return result
+    match = re.match(r"Start-Sleep -Seconds ([\d.]+)", script)
+    if match:
+        time.sleep(float(match.group(1)))
+        return None
+    if script.startswith('Write-Host '):
+        print(script[len('Write-Host '):], flush=True)
+        return None
+    match = re.match(r"throw '(.*)'", script)
+    if match:
+        raise RuntimeError(match.group(1))
+    match = re.match(r"\[Environment\]::Exit\((\d+)\)", script)
+    if match:
+        sys.exit(int(match.group(1)))
+    raise LookupError(f"The term '{script.split()[0]}' is not recognized as the name of a cmdlet")
+
+
+def main():
+    time.sleep(float(sys.argv[1]) if len(sys.argv) > 1 else 0.0)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        response = {'id': request['id']}
+        try:
+            response['result'] = execute(request['script'])
+            response['ok'] = True
+        except Exception as e:
+            response.update(ok=False, error=str(e), type=type(e).__name__)
+        print(MARKER + json.dumps(response, separators=(',', ':')), flush=True)
+
+
+if __name__ == "__main__":
+    main()
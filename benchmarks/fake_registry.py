@@ -0,0 +1,94 @@
+"""Colmena de registro falsa con la interfaz de ``software_inventory.WinregBackend``.
+
+Cuenta aperturas, cierres y lecturas de valores para comparar estrategias de
+enumeración en Linux.
+"""
+import time
+
+from software_inventory import UNINSTALL_KEYS
+
+
+class FakeKey:
+    def __init__(self, registry, node):
+        self._registry = registry
+        self.node = node
+        self.closed = False
+
+    def Close(self):
+        if not self.closed:
+            self.closed = True
+            self._registry.closes += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.Close()
+
+
+class FakeRegistryBackend:
+    """Árbol de diccionarios: las claves son dicts y los valores escalares"""
+
+    def __init__(self, tree, latency=0.0):
+        self.tree = tree
+        # Costo simulado de cada apertura de clave
+        self.latency = latency
+        self.opens = 0
+        self.closes = 0
+        self.value_reads = 0
+
+    def open_key(self, parent, path):
+        if self.latency:
+            time.sleep(self.latency)
+        node = self.tree if parent is None else parent.node
+        for part in path.split('\\'):
+            child = node.get(part)
+            if not isinstance(child, dict):
+                raise FileNotFoundError(path)
+            node = child
+        self.opens += 1
+        return FakeKey(self, node)
+
+    def iter_subkeys(self, key):
+        return [name for name, child in key.node.items() if isinstance(child, dict)]
+
+    def last_write(self, key):
+        return 0
+
+    def iter_values(self, key):
+        for name, data in key.node.items():
+            if not isinstance(data, dict):
+                self.value_reads += 1
+                yield name, data
+
+    def query_value(self, key, name):
+        """Equivalente a ``winreg.QueryValueEx`` (usado por la versión anterior)"""
+        self.value_reads += 1
+        data = key.node.get(name)
+        if data is None or isinstance(data, dict):
+            raise FileNotFoundError(name)
+        return data, 1
+
+    @property
+    def open_handles(self):
+        return self.opens - self.closes
+
+
+def synthetic_hive(count):
+    """Colmena con ``count`` programas repartidos entre las dos claves Uninstall"""
+    tree = {}
+    for k, path in enumerate(UNINSTALL_KEYS):
+        node = tree
+        for part in path.split('\\'):
+            node = node.setdefault(part, {})
+        for i in range(k, count, len(UNINSTALL_KEYS)):
+            node[f"{{{i:08X}-0000-0000-0000-000000000000}}"] = {
+                'DisplayName': f"Programa {(i * 7919) % count:06d}",
+                'DisplayVersion': f"{i % 10}.{i % 7}.{i % 100}",
+                'Publisher': f"Editor {i % 50}",
+                'InstallDate': f"2024{(i % 12) + 1:02d}{(i % 28) + 1:02d}",
+                'UninstallString': f"C:\\Program Files\\P{i}\\uninstall.exe",
+                'EstimatedSize': i % 100000,
+                'NoModify': 1,
+            }
+    return tree
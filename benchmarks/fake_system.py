@@ -0,0 +1,348 @@
+"""Equipo simulado completo para medir la revisión de punta a punta en Linux.
+
+Reúne los proveedores falsos que usa ``main.py``:
+
+* WMI: ``FakeWMIProvider`` con procesador, GPU, BIOS, batería y un
+  inventario PnP de tamaño configurable,
+* registro: ``FakeRegistryBackend`` con ``programs`` programas instalados y
+  las claves de las huellas (BIOS y controladores de video),
+* PowerShell: ``benchmarks/fake_powershell.py`` con el protocolo del host,
+* ``FakePsutil``: memoria, particiones, batería, sensores, CPU e interfaces
+  de red (``partitions`` y ``nics`` configurables),
+* módulos ``sounddevice`` (lazo parlante -> micrófono en memoria), ``cv2``
+  (cámara sobre ``camera_bench.SyntheticFrameSource``) y ``winsound``.
+
+Cada proveedor tiene una latencia inyectada por llamada. ``simulated_machine``
+instala todo sobre el módulo ``main`` y lo restaura al salir.
+"""
+import contextlib
+import os
+import socket
+import sys
+import threading
+import time
+import types
+from types import SimpleNamespace
+
+import numpy as np
+import psutil
+
+import main
+import software_inventory
+from cpu_sampler import CpuSampler
+from device_inventory import DeviceInventory
+from network import NetworkSnapshot
+from platform_backend import BIOS_REGISTRY_KEY, DISPLAY_CLASS_KEY, WindowsBackend
+from ps_host import PowerShellHost
+from fake_registry import FakeRegistryBackend, synthetic_hive
+from fake_wmi import FakeWMIProvider, synthetic_device_inventory, synthetic_network_adapters
+
+FAKE_POWERSHELL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_powershell.py')
+
+GB = 1024 ** 3
+
+# Latencias por llamada (s) de un portátil típico; ``scale`` las multiplica
+LATENCIES = {
+    'wmi': 0.02,
+    'wmi_row': 0.00005,
+    'registry': 0.00002,
+    'psutil': 0.0005,
+    'powershell_start': 0.3,
+    'audio_block': 0.0,
+    'beep': 0.1,
+}
+
+
+class FakePsutil:
+    """Subconjunto de ``psutil`` que lee la revisión, con datos sintéticos"""
+
+    NIC_DUPLEX_FULL = psutil.NIC_DUPLEX_FULL
+    NIC_DUPLEX_HALF = psutil.NIC_DUPLEX_HALF
+    NIC_DUPLEX_UNKNOWN = psutil.NIC_DUPLEX_UNKNOWN
+
+    def __init__(self, partitions=2, nics=3, cores=8, battery=True, latency=0.0, seed=0):
+        self.partitions = partitions
+        self.nics = nics
+        self.cores = cores
+        self.battery = battery
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def virtual_memory(self):
+        self._call()
+        total, available = 16 * GB, 9 * GB
+        return SimpleNamespace(total=total, available=available, used=total - available,
+                               free=available, percent=round((total - available) / total * 100, 1))
+
+    def disk_partitions(self, all=False):
+        self._call()
+        return [SimpleNamespace(device=f"{chr(67 + i)}:\\", mountpoint=f"{chr(67 + i)}:\\", fstype='NTFS',
+                                opts='rw,fixed') for i in range(self.partitions)]
+
+    def disk_usage(self, path):
+        self._call()
+        total = 512 * GB
+        used = int(total * (0.3 + 0.1 * (ord(path[0]) % 5)))
+        return SimpleNamespace(total=total, used=used, free=total - used, percent=round(used / total * 100, 1))
+
+    def sensors_battery(self):
+        self._call()
+        if not self.battery:
+            return None
+        return SimpleNamespace(percent=76, secsleft=9000, power_plugged=False)
+
+    def sensors_temperatures(self):
+        self._call()
+        return {'coretemp': [SimpleNamespace(label=f"Core {i}", current=45.0 + i, high=90.0, critical=100.0)
+                             for i in range(self.cores)]}
+
+    def cpu_percent(self, interval=None, percpu=False):
+        self._call()
+        values = [float(v) for v in self._rng.uniform(5, 40, self.cores).round(1)]
+        return values if percpu else sum(values) / len(values)
+
+    def cpu_freq(self, percpu=False):
+        self._call()
+        return SimpleNamespace(current=2400.0, min=400.0, max=4200.0)
+
+    def cpu_count(self, logical=True):
+        return self.cores if logical else max(self.cores // 2, 1)
+
+    def boot_time(self):
+        self._call()
+        return time.time() - 3 * 3600
+
+    def _nic_names(self):
+        names = ['Wi-Fi', 'Ethernet', 'Loopback Pseudo-Interface 1']
+        return (names + [f"Ethernet {i}" for i in range(2, self.nics)])[:self.nics]
+
+    def net_if_addrs(self):
+        self._call()
+        addrs = {}
+        for i, name in enumerate(self._nic_names()):
+            addrs[name] = [
+                SimpleNamespace(family=socket.AF_INET, address=f"192.168.{i}.10", netmask='255.255.255.0',
+                                broadcast=None, ptp=None),
+                SimpleNamespace(family=socket.AF_INET6, address=f"fe80::{i + 1}", netmask=None,
+                                broadcast=None, ptp=None),
+            ]
+        return addrs
+
+    def net_if_stats(self):
+        self._call()
+        return {name: SimpleNamespace(isup=i != 1, duplex=psutil.NIC_DUPLEX_FULL, speed=1000, mtu=1500, flags='')
+                for i, name in enumerate(self._nic_names())}
+
+    def net_io_counters(self, pernic=False, nowrap=True):
+        self._call()
+        counters = {name: SimpleNamespace(bytes_sent=10 ** 6 * (i + 1), bytes_recv=10 ** 7 * (i + 1),
+                                          packets_sent=1000, packets_recv=5000, errin=0, errout=0,
+                                          dropin=i, dropout=0)
+                    for i, name in enumerate(self._nic_names())}
+        if pernic:
+            return counters
+        return SimpleNamespace(**{field: sum(getattr(c, field) for c in counters.values())
+                                  for field in vars(next(iter(counters.values())))})
+
+
+def fake_sounddevice(latency=0.0, delay=0.03, gain=0.5, noise=1e-3, seed=0):
+    """Módulo ``sounddevice`` cuyo ``Stream`` devuelve lo reproducido con retardo y ruido"""
+    module = types.ModuleType('sounddevice')
+
+    class CallbackStop(Exception):
+        pass
+
+    class Stream:
+        def __init__(self, samplerate, blocksize, channels, callback, finished_callback=None, **kwargs):
+            self.samplerate = samplerate
+            self.blocksize = blocksize
+            self.channels = channels
+            self.callback = callback
+            self.finished_callback = finished_callback
+            self._stop = threading.Event()
+            self._thread = None
+
+        def _run(self):
+            inputs, outputs = self.channels
+            rng = np.random.default_rng(seed)
+            frames = self.blocksize
+            # Línea de retardo: lo que sale por el parlante llega al micrófono ``delay`` s después
+            # (como en un dispositivo real, nunca antes que un bloque)
+            line = np.zeros(max(int(delay * self.samplerate), frames), dtype=np.float32)
+            while not self._stop.is_set():
+                outdata = np.zeros((frames, outputs), dtype=np.float32)
+                heard = line[:frames] * gain
+                indata = np.clip(heard[:, None] + rng.normal(0, noise, (frames, inputs)), -1, 1).astype(np.float32)
+                try:
+                    self.callback(indata, outdata, frames, None, None)
+                    stop = False
+                except CallbackStop:
+                    stop = True
+                line = np.concatenate([line[frames:], outdata[:, 0]])
+                if latency:
+                    time.sleep(latency)
+                if stop:
+                    break
+            if self.finished_callback:
+                self.finished_callback()
+
+        def __enter__(self):
+            self._thread = threading.Thread(target=self._run, name="fake-sounddevice", daemon=True)
+            self._thread.start()
+            return self
+
+        def __exit__(self, *exc):
+            self._stop.set()
+            self._thread.join()
+
+    def rec(frames, samplerate, channels, **kwargs):
+        return np.zeros((frames, channels), dtype=np.float32)
+
+    module.CallbackStop = CallbackStop
+    module.Stream = Stream
+    module.rec = rec
+    module.play = lambda data, samplerate, **kwargs: None
+    module.wait = lambda: None
+    return module
+
+
+def fake_cv2(fps=30.0, width=640, height=480):
+    """Módulo ``cv2`` con una cámara sintética y sin ventanas"""
+    from camera_bench import SyntheticFrameSource
+    module = types.ModuleType('cv2')
+    module.CAP_PROP_FPS = 5
+
+    class VideoCapture:
+        def __init__(self, index):
+            self._source = SyntheticFrameSource(fps, width, height)
+
+        def isOpened(self):
+            return True
+
+        def get(self, prop):
+            return fps if prop == module.CAP_PROP_FPS else 0.0
+
+        def read(self):
+            return self._source.read()
+
+        def release(self):
+            pass
+
+    module.VideoCapture = VideoCapture
+    module.imshow = lambda title, frame: None
+    module.waitKey = lambda delay=0: -1
+    module.destroyAllWindows = lambda: None
+    return module
+
+
+def fake_winsound(latency=0.0):
+    module = types.ModuleType('winsound')
+    module.Beep = lambda frequency, duration: time.sleep(latency)
+    return module
+
+
+def synthetic_wmi_tables(devices):
+    """Clases WMI que consulta la revisión; ``devices`` entidades PnP"""
+    pnp = synthetic_device_inventory(devices)
+    return {
+        'Win32_Processor': [{'Name': 'Intel(R) Core(TM) i7-1165G7 @ 2.80GHz', 'NumberOfCores': 4,
+                             'NumberOfLogicalProcessors': 8, 'MaxClockSpeed': 2803}],
+        'Win32_VideoController': [
+            {'Name': 'Intel(R) Iris(R) Xe Graphics', 'AdapterRAM': 1073741824, 'CurrentHorizontalResolution': 1920,
+             'CurrentVerticalResolution': 1080, 'DriverVersion': '31.0.101.2111'},
+        ],
+        'Win32_BIOS': [{'Manufacturer': 'Dell Inc.', 'Name': '1.14.0', 'Version': 'DELL   - 20170001',
+                        'ReleaseDate': '20230315000000.000000+000', 'SerialNumber': 'BANCO01',
+                        'SMBIOSBIOSVersion': '1.14.0', 'SMBIOSMajorVersion': 3, 'SMBIOSMinorVersion': 2,
+                        'Status': 'OK'}],
+        'Win32_PnPEntity': pnp,
+        'Win32_NetworkAdapter': synthetic_network_adapters(pnp),
+    }
+
+
+def synthetic_battery_tables():
+    return {
+        'BatteryStaticData': [{'DesignedCapacity': 54000}],
+        'BatteryFullChargedCapacity': [{'FullChargedCapacity': 47000}],
+    }
+
+
+def synthetic_registry(programs):
+    """Colmena con los programas y las claves que usan las huellas de la revisión"""
+    tree = synthetic_hive(programs)
+    node = tree
+    for part in BIOS_REGISTRY_KEY.split('\\'):
+        node = node.setdefault(part, {})
+    node.update(SystemManufacturer='Dell Inc.', SystemProductName='Latitude 5420', BIOSVersion='1.14.0')
+    node = tree
+    for part in DISPLAY_CLASS_KEY.split('\\'):
+        node = node.setdefault(part, {})
+    node['0000'] = {'DriverDesc': 'Intel(R) Iris(R) Xe Graphics', 'DriverVersion': '31.0.101.2111'}
+    return tree
+
+
+def _replace(stack, target, name, value):
+    original = getattr(target, name)
+    setattr(target, name, value)
+    stack.callback(setattr, target, name, original)
+
+
+def _replace_module(stack, name, module):
+    original = sys.modules.get(name)
+    sys.modules[name] = module
+
+    def restore():
+        if original is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = original
+    stack.callback(restore)
+
+
+@contextlib.contextmanager
+def simulated_machine(devices=200, programs=300, partitions=2, nics=3, latency_scale=1.0, cores=8):
+    """Instala el equipo simulado sobre ``main``; entrega los proveedores para leer sus contadores"""
+    lat = {name: value * latency_scale for name, value in LATENCIES.items()}
+    wmi = FakeWMIProvider(synthetic_wmi_tables(devices), latency=lat['wmi'], row_cost=lat['wmi_row'])
+    battery_wmi = FakeWMIProvider(synthetic_battery_tables(), latency=lat['wmi'])
+    tree = synthetic_registry(programs)
+    registries = []
+
+    def registry_backend():
+        backend = FakeRegistryBackend(tree, latency=lat['registry'])
+        registries.append(backend)
+        return backend
+
+    fake_psutil = FakePsutil(partitions, nics, cores, latency=lat['psutil'])
+    sampler = CpuSampler(psutil_module=fake_psutil)
+    host = PowerShellHost([sys.executable, FAKE_POWERSHELL, str(lat['powershell_start'])], tracer=main.tracer)
+    # El equipo simulado es un Windows aunque el benchmark corra en otro sistema
+    backend = WindowsBackend(main.wmi_session, main.wmi_battery_session, host, tracer=main.tracer)
+    with contextlib.ExitStack() as stack:
+        for session, provider in ((main.wmi_session, wmi), (main.wmi_battery_session, battery_wmi)):
+            # Conexión nueva: la abierta antes apunta al proveedor anterior
+            _replace(stack, session, '_connect', provider.connect)
+            _replace(stack, session, '_conn', None)
+            stack.callback(session.clear)
+        _replace(stack, software_inventory, 'WinregBackend', registry_backend)
+        _replace(stack, main, 'psutil', fake_psutil)
+        _replace(stack, main, 'cpu_sampler', sampler)
+        _replace(stack, main, 'network_snapshot', NetworkSnapshot(fake_psutil))
+        _replace(stack, main, 'powershell', host)
+        _replace(stack, main, 'backend', backend)
+        _replace(stack, main, 'device_inventory', DeviceInventory(backend.device_rows))
+        _replace_module(stack, 'sounddevice', fake_sounddevice(lat['audio_block']))
+        _replace_module(stack, 'cv2', fake_cv2())
+        _replace_module(stack, 'winsound', fake_winsound(lat['beep']))
+        stack.callback(host.close)
+        stack.callback(sampler.stop)
+        yield SimpleNamespace(wmi=wmi, battery_wmi=battery_wmi, registries=registries, psutil=fake_psutil,
+                              powershell=host)
@@ -0,0 +1,110 @@
+"""Proveedor WMI falso para pruebas y benchmarks en Linux.
+
+Entiende el subconjunto de WQL que genera ``wmi_session.build_wql``
+(``SELECT cols FROM clase [WHERE col LIKE 'patrón' OR ...]``) y lleva la
+cuenta de conexiones, consultas y filas materializadas.
+"""
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+from wmi_session import Like
+
+_SELECT_RE = re.compile(r"^SELECT (?P<cols>.+?) FROM (?P<cls>\w+)(?: WHERE (?P<where>.+))?$", re.DOTALL)
+_LIKE_RE = re.compile(r"(\w+) LIKE '((?:[^'\\]|\\.)*)'")
+
+
+class FakeWMIProvider:
+    """Tablas en memoria que responden consultas WQL como ``wmi.WMI()``"""
+
+    def __init__(self, tables, latency=0.0, row_cost=0.0):
+        self.tables = tables
+        self.latency = latency
+        # Coste simulado de serializar cada fila por COM hacia Python
+        self.row_cost = row_cost
+        self.connections = 0
+        self.queries = []
+        self.rows_materialized = 0
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """Fábrica de conexiones para ``WMISession(connect=...)``"""
+        with self._lock:
+            self.connections += 1
+        return self
+
+    def query(self, wql):
+        match = _SELECT_RE.match(wql.strip())
+        if not match:
+            raise ValueError(f"WQL no soportado: {wql}")
+        with self._lock:
+            self.queries.append(wql)
+        if self.latency:
+            time.sleep(self.latency)
+        cols = None if match['cols'].strip() == '*' else [c.strip() for c in match['cols'].split(',')]
+        conditions = []
+        if match['where']:
+            conditions = [Like(col, pat.replace("\\'", "'").replace("\\\\", "\\"))
+                          for col, pat in _LIKE_RE.findall(match['where'])]
+        results = []
+        for row in self.tables.get(match['cls'], []):
+            if conditions and not any(c.matches(row) for c in conditions):
+                continue
+            # El proveedor real solo materializa las propiedades pedidas
+            results.append(SimpleNamespace(**(row if cols is None else {c: row.get(c) for c in cols})))
+        with self._lock:
+            self.rows_materialized += len(results)
+        if self.row_cost:
+            time.sleep(self.row_cost * len(results))
+        return results
+
+
+def synthetic_pnp_entities(count, bluetooth_every=500):
+    """Genera ``count`` entidades PnP con propiedades típicas de Win32_PnPEntity"""
+    rows = []
+    for i in range(count):
+        name = f"Intel(R) Wireless Bluetooth(R) #{i}" if i % bluetooth_every == 0 else f"Dispositivo genérico PnP #{i}"
+        rows.append({
+            'Name': name, 'Status': 'OK', 'PNPDeviceID': f"ROOT\\DEVICE\\{i:05d}",
+            'PNPClass': 'System', 'ClassGuid': '{4d36e97d-e325-11ce-bfc1-08002be10318}',
+            'Caption': name, 'Description': name, 'DeviceID': f"ROOT\\DEVICE\\{i:05d}",
+            'Manufacturer': '(Estándar)', 'Service': 'generic', 'ConfigManagerErrorCode': 0,
+            'Present': True, 'SystemName': 'BANCO-01',
+        })
+    return rows
+
+
+# (PNPClass, ClassGuid, enumerador, nombre) de los dispositivos típicos de un portátil
+_DEVICE_KINDS = [
+    ('USB', '{36fc9e60-c465-11cf-8056-444553540000}', 'USB', "Concentrador raíz USB (USB 3.0)"),
+    ('HIDClass', '{745a17a0-74d3-11d0-b6fe-00a0c90f57da}', 'USB', "Dispositivo de entrada USB"),
+    ('Bluetooth', '{e0cbf06c-cd8b-4647-bb8a-263b43f0f974}', 'USB', "Intel(R) Wireless Bluetooth(R)"),
+    ('Bluetooth', '{e0cbf06c-cd8b-4647-bb8a-263b43f0f974}', 'BTHENUM', "Servicio de Bluetooth"),
+    ('Monitor', '{4d36e96e-e325-11ce-bfc1-08002be10318}', 'DISPLAY', "Monitor PnP genérico"),
+    ('MEDIA', '{4d36e96c-e325-11ce-bfc1-08002be10318}', 'HDAUDIO', "Realtek High Definition Audio"),
+    ('AudioEndpoint', '{c166523c-fe0c-4a94-a586-f1a80cfbbf3e}', 'SWD', "Auriculares (Realtek Audio)"),
+    ('AudioEndpoint', '{c166523c-fe0c-4a94-a586-f1a80cfbbf3e}', 'SWD', "Intel(R) Display Audio (HDMI)"),
+    ('Camera', '{ca3e7ab9-b4c3-4ae6-8251-579ef933890f}', 'USB', "Integrated Webcam"),
+    ('Net', '{4d36e972-e325-11ce-bfc1-08002be10318}', 'PCI', "Intel(R) Wi-Fi 6 AX201 160MHz"),
+    ('Net', '{4d36e972-e325-11ce-bfc1-08002be10318}', 'PCI', "Realtek PCIe GbE Family Controller"),
+    # Sin PNPClass (Windows 7): se clasifica por ClassGuid
+    (None, '{4d36e96e-e325-11ce-bfc1-08002be10318}', 'DISPLAY', "Monitor HDMI externo"),
+]
+
+
+def synthetic_device_inventory(count, special_every=20):
+    """``count`` entidades PnP: cada ``special_every`` una de ``_DEVICE_KINDS``, el resto genéricas"""
+    rows = synthetic_pnp_entities(count, bluetooth_every=count + 1)
+    for n, i in enumerate(range(0, count, special_every)):
+        pnp_class, guid, enumerator, name = _DEVICE_KINDS[n % len(_DEVICE_KINDS)]
+        rows[i].update(Name=f"{name} #{i}", PNPClass=pnp_class, ClassGuid=guid,
+                       PNPDeviceID=f"{enumerator}\\VID_{i:04X}\\{i}", DeviceID=f"{enumerator}\\VID_{i:04X}\\{i}")
+    return rows
+
+
+def synthetic_network_adapters(devices):
+    """Filas de ``Win32_NetworkAdapter`` para las entidades de red de ``devices``"""
+    return [{'Name': d['Name'], 'PNPDeviceID': d['PNPDeviceID'], 'NetEnabled': True,
+             'NetConnectionStatus': 2 if n == 0 else 7, 'AdapterType': 'Ethernet 802.3', 'PhysicalAdapter': True}
+            for n, d in enumerate(d for d in devices if d.get('PNPClass') == 'Net')]
@@ -0,0 +1,197 @@
+"""Prueba de cámara con medición real de rendimiento.
+
+Registra la marca de tiempo de cada cuadro y calcula FPS efectivos, jitter
+entre cuadros, percentiles de la latencia de lectura y cuadros perdidos. El
+brillo y la varianza de cada cuadro se analizan con NumPy para detectar
+sensores muertos (cuadros negros o sin textura) o congelados.
+
+La captura corre en un hilo propio y entrega los cuadros al análisis por una
+cola acotada: si el análisis se atrasa, el cuadro se cuenta como no analizado
+pero la captura nunca se frena. La fuente de cuadros es intercambiable;
+``SyntheticFrameSource`` permite probar todo en un Linux sin cámara ni
+pantalla.
+"""
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+class OpenCVSource:
+    """Cámara real a través de ``cv2.VideoCapture``"""
+
+    def __init__(self, index=0):
+        import cv2
+        self._cv2 = cv2
+        self._cap = cv2.VideoCapture(index)
+
+    def is_opened(self):
+        return self._cap.isOpened()
+
+    def nominal_fps(self):
+        return self._cap.get(self._cv2.CAP_PROP_FPS) or None
+
+    def read(self):
+        return self._cap.read()
+
+    def release(self):
+        self._cap.release()
+
+
+class SyntheticFrameSource:
+    """Cámara simulada: ritmo fijo, cuadros perdidos, negros o congelados a pedido"""
+
+    def __init__(self, fps=30.0, width=640, height=480, drop_every=0, black=False, frozen=False, seed=0):
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.drop_every = drop_every
+        self.black = black
+        self.frozen = frozen
+        self._rng = np.random.default_rng(seed)
+        self._index = 0
+        self._next = None
+        self._last = None
+
+    def is_opened(self):
+        return True
+
+    def nominal_fps(self):
+        return self.fps
+
+    def read(self):
+        period = 1.0 / self.fps
+        now = time.perf_counter()
+        if self._next is None:
+            self._next = now
+        self._index += 1
+        # Un cuadro perdido: el siguiente llega un período más tarde
+        if self.drop_every and self._index % self.drop_every == 0:
+            self._next += period
+        self._next += period
+        if self._next > now:
+            time.sleep(self._next - now)
+        if self.black:
+            frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        elif self.frozen and self._last is not None:
+            frame = self._last
+        else:
+            frame = self._rng.integers(0, 256, (self.height, self.width, 3), dtype=np.uint8)
+        self._last = frame
+        return True, frame
+
+    def release(self):
+        pass
+
+
+def _percentiles_ms(values):
+    if len(values) == 0:
+        return None
+    p50, p95, p99 = np.percentile(np.asarray(values) * 1000, [50, 95, 99])
+    return {'p50': round(float(p50), 2), 'p95': round(float(p95), 2), 'p99': round(float(p99), 2)}
+
+
+def run_camera_benchmark(source, duration=5.0, queue_size=8, on_frame=None,
+                         black_threshold=10.0, min_fps=10.0, max_failed_reads=30):
+    """Captura durante ``duration`` segundos y devuelve las métricas.
+
+    ``on_frame(frame)`` se llama en el hilo que invoca (por ejemplo para
+    mostrar la vista previa); si devuelve False se detiene la prueba.
+    """
+    frames = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    timestamps = []
+    read_latencies = []
+    counters = {'failed_reads': 0, 'not_analyzed': 0}
+
+    def capture():
+        consecutive_failures = 0
+        end = time.perf_counter() + duration
+        while not stop.is_set() and time.perf_counter() < end:
+            t0 = time.perf_counter()
+            ok, frame = source.read()
+            t1 = time.perf_counter()
+            if not ok or frame is None:
+                counters['failed_reads'] += 1
+                consecutive_failures += 1
+                if consecutive_failures >= max_failed_reads:
+                    break
+                continue
+            consecutive_failures = 0
+            timestamps.append(t1)
+            read_latencies.append(t1 - t0)
+            try:
+                frames.put_nowait(frame)
+            except queue.Full:
+                counters['not_analyzed'] += 1
+        frames.put(None)
+
+    producer = threading.Thread(target=capture, name="camera-capture", daemon=True)
+    producer.start()
+
+    brightness = []
+    variance = []
+    black_frames = 0
+    frozen_frames = 0
+    previous = None
+    while True:
+        frame = frames.get()
+        if frame is None:
+            break
+        # Submuestreo y escala de grises vectorizados: suficiente para detectar fallos
+        small = frame[::4, ::4]
+        gray = small.mean(axis=2) if small.ndim == 3 else small.astype(np.float64)
+        mean = float(gray.mean())
+        brightness.append(mean)
+        variance.append(float(gray.var()))
+        if mean < black_threshold:
+            black_frames += 1
+        if previous is not None and np.array_equal(small, previous):
+            frozen_frames += 1
+        previous = small
+        if on_frame is not None and on_frame(frame) is False:
+            stop.set()
+    producer.join()
+
+    captured = len(timestamps)
+    analyzed = len(brightness)
+    metrics = {
+        'Cuadros capturados': captured,
+        'Cuadros analizados': analyzed,
+        'Cuadros no analizados': counters['not_analyzed'],
+        'Lecturas fallidas': counters['failed_reads'],
+        'FPS nominales': source.nominal_fps(),
+    }
+    if captured >= 2:
+        ts = np.asarray(timestamps)
+        intervals = np.diff(ts)
+        median = float(np.median(intervals))
+        late = intervals[intervals > 1.5 * median]
+        metrics.update({
+            'FPS efectivos': round((captured - 1) / float(ts[-1] - ts[0]), 2),
+            'Jitter (ms)': round(float(intervals.std()) * 1000, 2),
+            'Intervalo entre cuadros (ms)': _percentiles_ms(intervals),
+            'Cuadros perdidos (estimado)': int(np.maximum(np.rint(late / median) - 1, 0).sum()) if median > 0 else 0,
+        })
+    else:
+        metrics['FPS efectivos'] = 0.0
+    metrics['Latencia de lectura (ms)'] = _percentiles_ms(read_latencies)
+    if analyzed:
+        metrics.update({
+            'Brillo promedio': round(float(np.mean(brightness)), 2),
+            'Varianza promedio': round(float(np.mean(variance)), 2),
+            'Cuadros negros': black_frames,
+            'Cuadros congelados': frozen_frames,
+        })
+
+    problems = []
+    if metrics['FPS efectivos'] < min_fps:
+        problems.append(f"FPS efectivos por debajo de {min_fps:g}")
+    if analyzed and (black_frames == analyzed or metrics['Varianza promedio'] < 1.0):
+        problems.append("Sensor posiblemente dañado (imagen negra o sin textura)")
+    if analyzed > 1 and frozen_frames >= analyzed - 1:
+        problems.append("Imagen congelada")
+    metrics['Problemas'] = problems
+    metrics['Resultado'] = 'OK' if captured and not problems else 'FALLÓ'
+    return metrics
@@ -0,0 +1,5 @@
+"""Configuración de pytest: las pruebas usan los proveedores falsos de ``benchmarks``."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
@@ -0,0 +1,112 @@
+"""Muestreo de CPU en segundo plano compartido por toda la revisión.
+
+En lugar de bloquear un segundo en cada ``psutil.cpu_percent(interval=1)``, un
+hilo toma muestras periódicas de uso por núcleo, frecuencia y temperatura en
+una ventana deslizante. Tanto el consumo estimado de la batería como la
+sección de CPU del estado de salud leen de las mismas muestras.
+
+El hilo corre solo mientras dura la revisión: ``collect_report`` lo detiene al
+terminar para no seguir leyendo sensores cada 0,25 s en los modos que quedan
+abiertos (agente, pruebas interactivas).
+"""
+import collections
+import threading
+import time
+
+import psutil
+
+
+class CpuSampler:
+    """Hilo que mantiene una ventana deslizante de muestras de CPU"""
+
+    def __init__(self, interval=0.25, window=20, psutil_module=None):
+        self.interval = interval
+        self._psutil = psutil_module or psutil
+        self._samples = collections.deque(maxlen=window)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Inicia el muestreo (no hace nada si ya está en marcha)"""
+        with self._cond:
+            if self.running:
+                return self
+            self._stop.clear()
+            # Las muestras de una revisión anterior no describen la carga actual
+            self._samples.clear()
+            # La primera llamada sin intervalo fija la referencia de medición
+            self._psutil.cpu_percent(interval=None, percpu=True)
+            self._thread = threading.Thread(target=self._run, name="cpu-sampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el muestreo y espera al hilo"""
+        with self._cond:
+            self._stop.set()
+            thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            sample = {
+                'time': time.monotonic(),
+                'percpu': self._psutil.cpu_percent(interval=None, percpu=True),
+                'freq': self._read_freq(),
+                'temps': self._read_temps(),
+            }
+            with self._cond:
+                self._samples.append(sample)
+                self._cond.notify_all()
+
+    def _read_freq(self):
+        try:
+            freq = self._psutil.cpu_freq()
+            return freq.current if freq else None
+        except Exception:
+            return None
+
+    def _read_temps(self):
+        # sensors_temperatures no existe en Windows
+        if not hasattr(self._psutil, 'sensors_temperatures'):
+            return None
+        try:
+            return self._psutil.sensors_temperatures() or None
+        except Exception:
+            return None
+
+    def samples(self, min_samples=2, timeout=5.0):
+        """Devuelve las muestras de la ventana, esperando a tener ``min_samples``"""
+        self.start()
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while len(self._samples) < min_samples:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return list(self._samples)
+
+    def summary(self, min_samples=2, timeout=5.0):
+        """Resume la ventana: uso mín/prom/máx por núcleo, frecuencia y temperaturas"""
+        samples = self.samples(min_samples, timeout)
+        if not samples:
+            raise RuntimeError("No hay muestras de CPU disponibles")
+        per_core = list(zip(*(s['percpu'] for s in samples)))
+        cores = [{'min': min(c), 'avg': sum(c) / len(c), 'max': max(c)} for c in per_core]
+        freqs = [s['freq'] for s in samples if s['freq']]
+        return {
+            'total': sum(c['avg'] for c in cores) / len(cores) if cores else 0.0,
+            'cores': cores,
+            'freq_current': freqs[-1] if freqs else None,
+            'freq_avg': sum(freqs) / len(freqs) if freqs else None,
+            'temps': samples[-1]['temps'],
+            'samples': len(samples),
+            'window': samples[-1]['time'] - samples[0]['time'] + self.interval,
+        }
@@ -0,0 +1,233 @@
+"""Prueba de esfuerzo y verificación por núcleo.
+
+Se lanza un proceso por cada núcleo lógico que el proceso tiene permitido
+(``Process().cpu_affinity()``: un contenedor, ``taskset`` o una máscara de
+afinidad heredada pueden dejar menos que ``cpu_count``), fijado a ese núcleo
+con ``cpu_affinity``. Cada proceso repite núcleos de cálculo deterministas cuyo
+resultado se conoce de antemano:
+
+* multiplicación de matrices en coma flotante (NumPy/BLAS) con enteros
+  pequeños, de modo que el resultado es exacto y se compara con el obtenido
+  por aritmética entera,
+* una cadena de hashes SHA-256 (operaciones enteras).
+
+Un resultado distinto delata un núcleo defectuoso. Mientras tanto el proceso
+principal muestrea frecuencia y temperatura; al final se informan
+operaciones/s por núcleo y se marcan los núcleos lentos o que bajan su
+frecuencia respecto de ``MaxClockSpeed``.
+"""
+import hashlib
+import multiprocessing
+import os
+import queue
+import time
+
+import numpy as np
+import psutil
+
+MATRIX_SIZE = 96
+HASH_ROUNDS = 2000
+REPORT_INTERVAL = 0.5
+# Cada proceso ya ocupa un núcleo: BLAS no debe abrir hilos propios
+SINGLE_THREAD_ENV = {name: '1' for name in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')}
+
+
+def _operands(seed=1234):
+    rng = np.random.default_rng(seed)
+    return (rng.integers(-8, 8, (MATRIX_SIZE, MATRIX_SIZE)),
+            rng.integers(-8, 8, (MATRIX_SIZE, MATRIX_SIZE)))
+
+
+def _hash_chain(rounds=HASH_ROUNDS, seed=b'diagnostico'):
+    digest = seed
+    for _ in range(rounds):
+        digest = hashlib.sha256(digest).digest()
+    return digest
+
+
+def expected_results():
+    """Resultados de referencia con aritmética entera (sin BLAS)"""
+    a, b = _operands()
+    product = a.astype(np.int64) @ b.astype(np.int64)
+    return int(product.sum()), int(np.abs(product).max()), _hash_chain()
+
+
+def allowed_cpus(ps=psutil):
+    """Núcleos en los que puede correr este proceso (todos si no hay ``cpu_affinity``, p. ej. macOS)"""
+    try:
+        cpus = sorted(ps.Process().cpu_affinity())
+    except (AttributeError, NotImplementedError, psutil.Error):
+        cpus = None
+    return cpus or list(range(ps.cpu_count() or 1))
+
+
+def _worker(index, core, expected, start, stop, results):
+    try:
+        psutil.Process().cpu_affinity([core])
+        pinned = True
+    except (AttributeError, ValueError, psutil.Error):
+        pinned = False
+    a, b = _operands()
+    fa, fb = a.astype(np.float64), b.astype(np.float64)
+    ops = errors = 0
+    start.wait()
+    last = time.perf_counter()
+    while not stop.is_set():
+        product = fa @ fb
+        digest = _hash_chain()
+        if (int(product.sum()), int(np.abs(product).max()), digest) != expected:
+            errors += 1
+        ops += 1
+        now = time.perf_counter()
+        if now - last >= REPORT_INTERVAL:
+            results.put((index, now, ops, errors, pinned))
+            last = now
+    results.put((index, time.perf_counter(), ops, errors, pinned))
+
+
+def _read_temps(ps):
+    try:
+        temps = ps.sensors_temperatures() if hasattr(ps, 'sensors_temperatures') else {}
+        values = [e.current for entries in temps.values() for e in entries if e.current]
+        return max(values) if values else None
+    except Exception:
+        return None
+
+
+def _read_freqs(ps, cpus):
+    try:
+        freqs = ps.cpu_freq(percpu=True) or []
+    except Exception:
+        return [None] * len(cpus)
+    # Windows informa una sola frecuencia para todo el procesador
+    if len(freqs) == 1:
+        return [freqs[0].current] * len(cpus)
+    return [freqs[c].current if c < len(freqs) and freqs[c] else None for c in cpus]
+
+
+def _read_usage(ps, cpus):
+    usage = ps.cpu_percent(interval=None, percpu=True)
+    return [usage[c] if c < len(usage) else None for c in cpus]
+
+
+def run_cpu_stress(duration=10.0, workers=None, max_mhz=None, slow_ratio=0.7, throttle_ratio=0.6,
+                   sample_interval=0.5, psutil_module=None):
+    """Carga los núcleos permitidos durante ``duration`` segundos y devuelve las métricas.
+
+    Con ``workers`` mayor que los núcleos permitidos, los procesos sobrantes se
+    fijan de nuevo desde el primero y comparten núcleo.
+    """
+    ps = psutil_module or psutil
+    allowed = allowed_cpus(ps)
+    cores = workers or len(allowed)
+    cpus = [allowed[i % len(allowed)] for i in range(cores)]
+    expected = expected_results()
+    # 'spawn' en todos los sistemas: no se heredan hilos ni conexiones COM del proceso principal
+    ctx = multiprocessing.get_context('spawn')
+    start, stop = ctx.Event(), ctx.Event()
+    results = ctx.Queue()
+    processes = [ctx.Process(target=_worker, args=(i, cpu, expected, start, stop, results), daemon=True)
+                 for i, cpu in enumerate(cpus)]
+    saved = {name: os.environ.get(name) for name in SINGLE_THREAD_ENV}
+    os.environ.update(SINGLE_THREAD_ENV)
+    try:
+        for p in processes:
+            p.start()
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    progress = {core: [] for core in range(cores)}
+    pinned = {}
+    samples = []
+    t0 = time.perf_counter()
+    start.set()
+    ps.cpu_percent(interval=None, percpu=True)
+    deadline = t0 + duration
+    next_sample = t0 + sample_interval
+    try:
+        while time.perf_counter() < deadline:
+            try:
+                core, t, ops, errors, is_pinned = results.get(timeout=max(min(next_sample, deadline) - time.perf_counter(), 0.01))
+                progress[core].append((t, ops, errors))
+                pinned[core] = is_pinned
+            except queue.Empty:
+                pass
+            if time.perf_counter() >= next_sample:
+                samples.append({
+                    'Tiempo (s)': round(time.perf_counter() - t0, 2),
+                    'Frecuencia (MHz)': _read_freqs(ps, cpus),
+                    'Uso (%)': _read_usage(ps, cpus),
+                    'Temperatura (°C)': _read_temps(ps),
+                })
+                next_sample += sample_interval
+    finally:
+        stop.set()
+        # Se vacía la cola mientras terminan (un proceso no sale con datos sin enviar)
+        end_wait = time.perf_counter() + 10
+        while time.perf_counter() < end_wait:
+            try:
+                core, t, ops, errors, is_pinned = results.get(timeout=0.2)
+            except queue.Empty:
+                if not any(p.is_alive() for p in processes):
+                    break
+                continue
+            progress[core].append((t, ops, errors))
+            pinned[core] = is_pinned
+        for p in processes:
+            p.join(timeout=1)
+            if p.is_alive():
+                p.terminate()
+
+    per_core = []
+    for core in range(cores):
+        points = progress[core]
+        if len(points) >= 2:
+            (t_first, ops_first, _), (t_last, ops_last, errors) = points[0], points[-1]
+            rate = (ops_last - ops_first) / (t_last - t_first) if t_last > t_first else 0.0
+        elif points:
+            rate, errors = 0.0, points[-1][2]
+        else:
+            rate, errors = None, None
+        freqs = [s['Frecuencia (MHz)'][core] for s in samples if s['Frecuencia (MHz)'][core]]
+        per_core.append({
+            'Núcleo': cpus[core],
+            'Fijado al núcleo': pinned.get(core, False),
+            'Operaciones/s': round(rate, 1) if rate is not None else None,
+            'Errores de cálculo': errors,
+            'Frecuencia media (MHz)': round(float(np.mean(freqs)), 1) if freqs else None,
+            'Frecuencia mínima (MHz)': round(float(np.min(freqs)), 1) if freqs else None,
+        })
+
+    rates = [c['Operaciones/s'] for c in per_core if c['Operaciones/s']]
+    median_rate = float(np.median(rates)) if rates else 0.0
+    problems = []
+    for c in per_core:
+        status = 'OK'
+        if c['Errores de cálculo'] is None:
+            status = 'SIN RESPUESTA'
+        elif c['Errores de cálculo']:
+            status = 'FALLA DE CÁLCULO'
+        elif median_rate and (c['Operaciones/s'] or 0) < slow_ratio * median_rate:
+            status = 'BAJO RENDIMIENTO'
+        elif max_mhz and c['Frecuencia media (MHz)'] and c['Frecuencia media (MHz)'] < throttle_ratio * max_mhz:
+            status = 'FRECUENCIA REDUCIDA'
+        c['Estado'] = status
+        if status != 'OK':
+            problems.append(f"Núcleo {c['Núcleo']}: {status.lower()}")
+
+    temps = [s['Temperatura (°C)'] for s in samples if s['Temperatura (°C)'] is not None]
+    return {
+        'Núcleos probados': cores,
+        'Duración (s)': round(duration, 1),
+        'Frecuencia máxima (MHz)': max_mhz,
+        'Operaciones/s (total)': round(sum(rates), 1),
+        'Temperatura máxima (°C)': max(temps) if temps else None,
+        'Núcleos': per_core,
+        'Muestras': samples,
+        'Problemas': problems,
+        'Resultado': 'OK' if not problems else 'FALLÓ',
+    }
@@ -0,0 +1,176 @@
+"""Inventario de dispositivos en una sola pasada sobre ``Win32_PnPEntity``.
+
+Las secciones de puertos (USB, Bluetooth, HDMI, audio, cámara) leían cada
+una su propia clase WMI con filtros por subcadena. Aquí se consultan las
+entidades PnP una sola vez por revisión y cada dispositivo se clasifica con
+búsquedas en diccionarios, en este orden de confianza:
+
+* ``PNPClass`` (nombre de la clase de instalación), en las filas que lo
+  traen (el backend de Linux),
+* ``ClassGuid`` (la misma clase de instalación, en todas las versiones de
+  Windows),
+* el enumerador, es decir el prefijo de ``PNPDeviceID`` (``USB\\``, ``BTH\\``,
+  ``DISPLAY\\``, ``HDAUDIO\\``...), que indica el bus por el que se conecta.
+
+Solo dentro de algunas categorías se mira además el nombre (``HDMI``, jack
+de auriculares). El costo es lineal en la cantidad de dispositivos y
+las secciones leen el mismo índice.
+
+La consulta WMI no pide ``PNPClass``: esa propiedad solo existe desde
+Windows 8 y en Windows 7 el proveedor rechaza la consulta entera por
+inválida. Todas las clases de ``CLASS_CATEGORIES`` tienen su GUID en
+``GUID_CATEGORIES``.
+
+La consulta lleva como WHERE las mismas claves del índice, de modo que el
+proveedor WMI no entrega por COM los miles de dispositivos de sistema que no
+pertenecen a ninguna categoría (ni los dispositivos de audio que no son jack
+ni HDMI).
+
+Los adaptadores WiFi no salen de aquí: su estado de conexión
+(``NetConnectionStatus``, ``NetEnabled``) solo está en
+``Win32_NetworkAdapter`` (ver ``platform_backend``).
+"""
+import threading
+from collections import defaultdict
+
+from wmi_session import AnyOf, Like
+
+PNP_COLUMNS = ['Name', 'Status', 'PNPDeviceID', 'ClassGuid', 'ConfigManagerErrorCode']
+
+# PNPClass en minúsculas -> categoría
+CLASS_CATEGORIES = {
+    'usb': 'USB',
+    'bluetooth': 'Bluetooth',
+    'monitor': 'Monitor',
+    'media': 'Audio',
+    'audioendpoint': 'Audio',
+    'camera': 'Cámara',
+    'image': 'Cámara',
+}
+
+GUID_CATEGORIES = {
+    '{36fc9e60-c465-11cf-8056-444553540000}': 'USB',
+    '{e0cbf06c-cd8b-4647-bb8a-263b43f0f974}': 'Bluetooth',
+    '{4d36e96e-e325-11ce-bfc1-08002be10318}': 'Monitor',
+    '{4d36e96c-e325-11ce-bfc1-08002be10318}': 'Audio',
+    '{c166523c-fe0c-4a94-a586-f1a80cfbbf3e}': 'Audio',
+    '{ca3e7ab9-b4c3-4ae6-8251-579ef933890f}': 'Cámara',
+    '{6bdd1fc6-810f-11d0-bec7-08002be10318}': 'Cámara',
+}
+
+# Enumerador (prefijo de PNPDeviceID) -> categoría por bus
+ENUMERATOR_CATEGORIES = {
+    'USB': 'Conectado por USB',
+    'USB4': 'Conectado por USB',
+    'USBSTOR': 'Conectado por USB',
+    'BTH': 'Bluetooth',
+    'BTHENUM': 'Bluetooth',
+    'BTHLE': 'Bluetooth',
+    'BTHLEDEVICE': 'Bluetooth',
+    'DISPLAY': 'Monitor',
+    'HDAUDIO': 'Audio',
+    'INTELAUDIO': 'Audio',
+}
+
+# Etiquetas por nombre, solo para dispositivos de ciertas categorías
+NAME_TAGS = {
+    'Monitor': (('HDMI', ('hdmi',)),),
+    'Audio': (('HDMI', ('hdmi', 'display audio')), ('Jack', ('jack', 'headphone', 'auricular'))),
+}
+
+
+# Categorías que las secciones solo usan a través de sus etiquetas (jack, HDMI)
+TAGGED_ONLY = {'Audio'}
+
+
+def device_filter():
+    """Condición WQL que deja pasar cualquier dispositivo que alguna sección usa.
+
+    De las categorías de ``TAGGED_ONLY`` basta con los dispositivos cuyo
+    nombre tiene alguna de las palabras de sus etiquetas.
+    """
+    keywords = sorted({k for c in TAGGED_ONLY for _, words in NAME_TAGS[c] for k in words})
+    return AnyOf(*[Like('ClassGuid', g) for g, cat in GUID_CATEGORIES.items() if cat not in TAGGED_ONLY],
+                 *[Like('PNPDeviceID', f"{e}\\%") for e, cat in ENUMERATOR_CATEGORIES.items()
+                   if cat not in TAGGED_ONLY],
+                 *[Like('Name', f"%{k}%") for k in keywords])
+
+
+def query_devices(session):
+    """Filas de ``Win32_PnPEntity`` que pueden pertenecer a alguna categoría"""
+    return session.query('Win32_PnPEntity', PNP_COLUMNS, device_filter())
+
+
+def classify(device):
+    """Categorías de un dispositivo (fila de ``Win32_PnPEntity``)"""
+    categories = set()
+    pnp_class = device.get('PNPClass')
+    category = CLASS_CATEGORIES.get(pnp_class.lower()) if isinstance(pnp_class, str) else None
+    if category is None:
+        guid = device.get('ClassGuid')
+        category = GUID_CATEGORIES.get(guid.lower()) if isinstance(guid, str) else None
+    if category is not None:
+        categories.add(category)
+    device_id = device.get('PNPDeviceID')
+    if isinstance(device_id, str):
+        bus = ENUMERATOR_CATEGORIES.get(device_id.split('\\', 1)[0].upper())
+        if bus is not None:
+            categories.add(bus)
+    tagged = [NAME_TAGS[c] for c in categories if c in NAME_TAGS]
+    if tagged:
+        text = f"{device.get('Name') or ''} {device_id or ''}".lower()
+        for tags in tagged:
+            for tag, keywords in tags:
+                if any(k in text for k in keywords):
+                    categories.add(tag)
+    return categories
+
+
+class DeviceIndex:
+    """Dispositivos agrupados por categoría"""
+
+    def __init__(self, devices):
+        self.devices = devices
+        self._by_category = defaultdict(list)
+        for device in devices:
+            for category in classify(device):
+                self._by_category[category].append(device)
+
+    def get(self, category):
+        return list(self._by_category.get(category, ()))
+
+    def counts(self):
+        return {category: len(devices) for category, devices in sorted(self._by_category.items())}
+
+
+class DeviceInventory:
+    """Índice de la revisión en curso: se consulta y clasifica una sola vez.
+
+    ``fetch`` devuelve las filas de dispositivos (``query_devices`` sobre una
+    sesión WMI, o ``device_rows`` de un backend de plataforma).
+    """
+
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._index = None
+        self._error = None
+        self.builds = 0
+
+    def index(self):
+        with self._lock:
+            if self._index is None and self._error is None:
+                try:
+                    self._index = DeviceIndex(self.fetch())
+                    self.builds += 1
+                except Exception as e:
+                    # Las demás secciones informan el mismo error sin volver a consultar
+                    self._error = e
+            if self._error is not None:
+                raise self._error
+            return self._index
+
+    def clear(self):
+        with self._lock:
+            self._index = None
+            self._error = None
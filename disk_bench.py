@@ -0,0 +1,338 @@
+"""Rendimiento de disco y escaneo de superficie con lectura y verificación.
+
+``run_disk_benchmark`` mide, con un archivo temporal en la partición:
+
+* escritura y lectura secuencial (MB/s) con búferes grandes alineados,
+* escritura y lectura aleatoria de bloques de 4 KiB (IOPS y latencias) con
+  una profundidad de cola configurable (un hilo por solicitud en vuelo),
+* un escaneo de superficie que relee el archivo y verifica su contenido.
+
+``surface_scan`` sirve también para un dispositivo o un archivo loop (por
+ejemplo ``/dev/loop0`` o una imagen en Linux): informa regiones lentas o
+ilegibles y un histograma de latencias. Todo respeta un presupuesto de
+tiempo y de tamaño para que entre en el flujo de trabajo del banco.
+
+Los búferes salen de ``mmap`` anónimo (alineados a página), lo que permite
+E/S directa (``O_DIRECT`` en Linux, ``FILE_FLAG_NO_BUFFERING`` con
+``CreateFile`` en Windows) donde el sistema la soporta; si no, se usa E/S con
+caché, se indica en el resultado y no se informan las lecturas, que saldrían
+de la caché del sistema y no del disco.
+"""
+import mmap
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+MB = 1024 * 1024
+RANDOM_BLOCK = 4096
+# Límites superiores (ms) de cada barra del histograma de latencias
+HISTOGRAM_BUCKETS_MS = (1, 5, 20, 100, 500)
+
+
+def _aligned_buffer(size):
+    return mmap.mmap(-1, size)
+
+
+# Constantes de CreateFile (winbase.h)
+GENERIC_READ = 0x80000000
+GENERIC_WRITE = 0x40000000
+FILE_SHARE_READ = 0x1
+FILE_SHARE_WRITE = 0x2
+OPEN_EXISTING = 3
+FILE_FLAG_NO_BUFFERING = 0x20000000
+FILE_FLAG_WRITE_THROUGH = 0x80000000
+
+
+def _open_unbuffered_windows(path, write):
+    """Abre ``path`` sin la caché de Windows (``CreateFile`` con ``FILE_FLAG_NO_BUFFERING``)"""
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                     wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    handle = kernel32.CreateFileW(os.path.abspath(path), GENERIC_READ | (GENERIC_WRITE if write else 0),
+                                  FILE_SHARE_READ | FILE_SHARE_WRITE, None, OPEN_EXISTING,
+                                  FILE_FLAG_NO_BUFFERING | FILE_FLAG_WRITE_THROUGH, None)
+    if handle is None or handle == wintypes.HANDLE(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        fd = msvcrt.open_osfhandle(handle, 0 if write else os.O_RDONLY)
+    except OSError:
+        kernel32.CloseHandle(handle)
+        raise
+    return open(fd, 'r+b' if write else 'rb', buffering=0)
+
+
+def _open(path, write, direct):
+    if direct and os.name == 'nt':
+        return _open_unbuffered_windows(path, write)
+    flags = (os.O_RDWR if write else os.O_RDONLY) | getattr(os, 'O_BINARY', 0)
+    if direct:
+        flags |= os.O_DIRECT
+    return open(os.open(path, flags), 'r+b' if write else 'rb', buffering=0)
+
+
+def _supports_direct(path):
+    if not hasattr(os, 'O_DIRECT') and os.name != 'nt':
+        return False
+    try:
+        f = _open(path, False, True)
+    except OSError:
+        return False
+    try:
+        # Algunos sistemas de archivos (tmpfs) aceptan la bandera pero fallan al leer
+        f.readinto(_aligned_buffer(RANDOM_BLOCK))
+        return True
+    except OSError:
+        return False
+    finally:
+        f.close()
+
+
+def _drop_cache(f):
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _percentiles_ms(values):
+    if not values:
+        return None
+    p50, p95, p99 = np.percentile(np.asarray(values) * 1000, [50, 95, 99])
+    return {'p50': round(float(p50), 3), 'p95': round(float(p95), 3), 'p99': round(float(p99), 3)}
+
+
+def _histogram(latencies):
+    edges = [0] + [ms / 1000 for ms in HISTOGRAM_BUCKETS_MS] + [float('inf')]
+    counts, _ = np.histogram(latencies, bins=edges)
+    labels = [f"< {ms} ms" for ms in HISTOGRAM_BUCKETS_MS] + [f">= {HISTOGRAM_BUCKETS_MS[-1]} ms"]
+    return dict(zip(labels, (int(c) for c in counts)))
+
+
+def _pattern(block_size, seed=0):
+    """Bloque de datos aleatorios; cada bloque del archivo lleva además su índice"""
+    return np.random.default_rng(seed).integers(0, 256, block_size, dtype=np.uint8).tobytes()
+
+
+def _stamp(buf, template, index):
+    buf[:] = template
+    buf[:8] = index.to_bytes(8, 'little')
+
+
+def surface_scan(path, region_size=MB, time_budget=30.0, size_budget=None, slow_ms=100.0,
+                 expected=None, open_file=None, max_reported=20):
+    """Lee ``path`` por regiones e informa las lentas o ilegibles.
+
+    ``expected(index, data)`` verifica el contenido leído de cada región;
+    ``open_file(path)`` permite sustituir la apertura (dispositivos simulados).
+    """
+    open_file = open_file or (lambda p: open(p, 'rb', buffering=0))
+    buf = _aligned_buffer(region_size)
+    view = memoryview(buf)
+    latencies = []
+    slow, unreadable, corrupt = [], [], []
+    scanned = 0
+    deadline = time.perf_counter() + time_budget
+    with open_file(path) as f:
+        f.seek(0, os.SEEK_END)
+        total = f.tell()
+        limit = min(total, size_budget) if size_budget else total
+        offset = 0
+        while offset < limit and time.perf_counter() < deadline:
+            index = offset // region_size
+            t0 = time.perf_counter()
+            try:
+                f.seek(offset)
+                n = f.readinto(view)
+            except OSError as e:
+                unreadable.append({'Desplazamiento': offset, 'Error': str(e)})
+                offset += region_size
+                continue
+            elapsed = time.perf_counter() - t0
+            if not n:
+                break
+            latencies.append(elapsed)
+            scanned += n
+            if elapsed * 1000 >= slow_ms:
+                slow.append({'Desplazamiento': offset, 'Latencia (ms)': round(elapsed * 1000, 1)})
+            if expected is not None and not expected(index, view[:n]):
+                corrupt.append({'Desplazamiento': offset})
+            offset += region_size
+    view.release()
+    buf.close()
+    result = {
+        'Ruta': path,
+        'Tamaño total (MB)': round(total / MB, 1),
+        'Escaneado (MB)': round(scanned / MB, 1),
+        'Completo': scanned + len(unreadable) * region_size >= limit,
+        'Latencia por región (ms)': _percentiles_ms(latencies),
+        'Histograma de latencias': _histogram(latencies),
+        'Regiones lentas': len(slow),
+        'Regiones ilegibles': len(unreadable),
+        'Regiones con datos incorrectos': len(corrupt),
+        'Detalle': (unreadable + corrupt + slow)[:max_reported],
+    }
+    if scanned:
+        result['Lectura (MB/s)'] = round(scanned / MB / sum(latencies), 1)
+    return result
+
+
+class _RandomIO:
+    """Operaciones aleatorias de 4 KiB con ``queue_depth`` solicitudes en vuelo"""
+
+    def __init__(self, path, file_size, queue_depth, direct, write, protect_every=0, seed=0):
+        self.path = path
+        self.blocks = file_size // RANDOM_BLOCK
+        self.protect_every = protect_every
+        self.queue_depth = queue_depth
+        self.direct = direct
+        self.write = write
+        self.seed = seed
+
+    def run(self, duration, max_ops):
+        deadline = time.perf_counter() + duration
+        per_worker = max(max_ops // self.queue_depth, 1)
+
+        def worker(n):
+            rng = random.Random(self.seed + n)
+            buf = _aligned_buffer(RANDOM_BLOCK)
+            latencies = []
+            with _open(self.path, self.write, self.direct) as f:
+                while len(latencies) < per_worker and time.perf_counter() < deadline:
+                    block = rng.randrange(self.blocks)
+                    if self.protect_every and block % self.protect_every == 0:
+                        block += 1
+                    offset = block * RANDOM_BLOCK
+                    t0 = time.perf_counter()
+                    f.seek(offset)
+                    if self.write:
+                        f.write(buf)
+                    else:
+                        f.readinto(buf)
+                    latencies.append(time.perf_counter() - t0)
+                if self.write:
+                    os.fsync(f.fileno())
+            buf.close()
+            return latencies
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.queue_depth) as pool:
+            results = list(pool.map(worker, range(self.queue_depth)))
+        elapsed = time.perf_counter() - start
+        latencies = [x for r in results for x in r]
+        return len(latencies) / elapsed if elapsed else 0.0, latencies
+
+
+def run_disk_benchmark(directory, file_size=256 * MB, block_size=4 * MB, queue_depth=4,
+                       time_budget=20.0, max_random_ops=20000, free_fraction=0.1, direct=None):
+    """Mide el disco de ``directory`` con un archivo temporal que luego se borra.
+
+    El archivo no supera ``free_fraction`` del espacio libre; ``time_budget``
+    se reparte entre las fases (las secuenciales se cortan al agotarse).
+    """
+    free = shutil.disk_usage(directory).free
+    file_size = min(file_size, int(free * free_fraction)) // block_size * block_size
+    if file_size < block_size:
+        return {'Error': f"Espacio libre insuficiente en {directory}"}
+    phase_budget = time_budget / 5
+    template = _pattern(block_size)
+    buf = _aligned_buffer(block_size)
+    fd, path = tempfile.mkstemp(prefix='.diagnostico_', suffix='.tmp', dir=directory)
+    os.close(fd)
+    result = {'Ruta': directory, 'Profundidad de cola': queue_depth}
+    try:
+        # Se crea el archivo con caché para probar si admite E/S directa
+        with open(path, 'r+b', buffering=0) as f:
+            f.truncate(file_size)
+        if direct is None:
+            direct = _supports_direct(path)
+        result['Modo de E/S'] = 'Directo' if direct else 'Con caché'
+
+        # Escritura secuencial (cada bloque lleva su índice para verificarlo luego)
+        written = 0
+        deadline = time.perf_counter() + phase_budget
+        start = time.perf_counter()
+        with _open(path, True, direct) as f:
+            while written < file_size and time.perf_counter() < deadline:
+                _stamp(buf, template, written // block_size)
+                f.write(buf)
+                written += block_size
+            os.fsync(f.fileno())
+            _drop_cache(f)
+        elapsed = time.perf_counter() - start
+        file_size = written
+        result['Tamaño de prueba (MB)'] = round(file_size / MB, 1)
+        result['Escritura secuencial (MB/s)'] = round(written / MB / elapsed, 1)
+
+        if direct:
+            # Lectura secuencial
+            read = 0
+            deadline = time.perf_counter() + phase_budget
+            start = time.perf_counter()
+            with _open(path, False, direct) as f:
+                while read < file_size and time.perf_counter() < deadline:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    read += n
+            elapsed = time.perf_counter() - start
+            result['Lectura secuencial (MB/s)'] = round(read / MB / elapsed, 1)
+
+            # Aleatorio 4 KiB
+            iops, latencies = _RandomIO(path, file_size, queue_depth, direct,
+                                        write=False).run(phase_budget, max_random_ops)
+            result['Lectura aleatoria 4K (IOPS)'] = round(iops)
+            result['Latencia lectura aleatoria (ms)'] = _percentiles_ms(latencies)
+        else:
+            # Con caché las lecturas miden la memoria, no el disco (en Windows no hay forma de vaciarla)
+            result['Nota'] = "Sin E/S directa: no se informa la velocidad de lectura"
+        # La escritura aleatoria no pisa el primer bloque de 4 KiB (el sello) de cada bloque grande
+        iops, latencies = _RandomIO(path, file_size, queue_depth, direct, write=True,
+                                    protect_every=block_size // RANDOM_BLOCK).run(phase_budget, max_random_ops)
+        result['Escritura aleatoria 4K (IOPS)'] = round(iops)
+        result['Latencia escritura aleatoria (ms)'] = _percentiles_ms(latencies)
+
+        # Escaneo con verificación del sello de cada bloque
+        def expected(index, data):
+            return bytes(data[:8]) == index.to_bytes(8, 'little')
+
+        result['Escaneo de superficie'] = surface_scan(
+            path, region_size=block_size, time_budget=phase_budget, expected=expected,
+            open_file=lambda p: _open(p, False, direct))
+        result['Escaneo de superficie']['Ruta'] = directory
+        if not direct:
+            # El escaneo sigue verificando los datos, pero su velocidad es la de la caché
+            result['Escaneo de superficie'].pop('Lectura (MB/s)', None)
+    except OSError as e:
+        result['Error'] = f"No se pudo completar la prueba: {str(e)}"
+    finally:
+        buf.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    problems = []
+    scan = result.get('Escaneo de superficie', {})
+    if 'Error' in result:
+        problems.append(result['Error'])
+    if scan.get('Regiones ilegibles'):
+        problems.append(f"{scan['Regiones ilegibles']} regiones ilegibles")
+    if scan.get('Regiones con datos incorrectos'):
+        problems.append(f"{scan['Regiones con datos incorrectos']} regiones con datos incorrectos")
+    if scan.get('Regiones lentas'):
+        problems.append(f"{scan['Regiones lentas']} regiones lentas")
+    result['Problemas'] = problems
+    result['Resultado'] = 'OK' if not problems else 'FALLÓ'
+    return result
@@ -0,0 +1,238 @@
+"""Modo flota: diagnosticar muchos equipos en paralelo sin intervención.
+
+Un coordinador ejecuta la recolección contra N objetivos a la vez mediante un
+transporte intercambiable:
+
+* ``LocalTransport``: recolecta en este mismo equipo.
+* ``AgentTransport``: pide el reporte a un agente (``main.py --agente``) por
+  TCP, con un mensaje JSON por línea. Un proceso agente local lanzado con
+  ``spawn_local_agent`` puede hacer de equipo remoto.
+
+El agente escucha en 127.0.0.1 salvo que se indique otra dirección; para
+escuchar en la red exige una clave compartida (``token``) que el coordinador
+envía con cada petición.
+
+Los resultados se agregan en un único conjunto de reportes con estadísticas de
+rendimiento (equipos por minuto).
+"""
+import concurrent.futures
+import hmac
+import ipaddress
+import json
+import os
+import queue
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+from report_writer import dumps, iter_json
+
+READY_PREFIX = "AGENTE_LISTO"
+
+
+def parse_address(target, default_port=8765, default_host="127.0.0.1"):
+    """Convierte ``host:puerto``, solo ``host`` o solo ``puerto`` en una tupla"""
+    target = str(target).strip()
+    if target.isdigit():
+        return default_host, int(target)
+    host, sep, port = target.rpartition(':')
+    if not sep:
+        return target, default_port
+    return host or default_host, int(port)
+
+
+def is_loopback(host):
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _encode(message):
+    return (dumps(message) + "\n").encode('utf-8')
+
+
+def _write_message(stream, message):
+    # Las secciones transmitidas se envían a medida que se codifican
+    for chunk in iter_json(message):
+        stream.write(chunk.encode('utf-8'))
+    stream.write(b"\n")
+
+
+class LocalTransport:
+    """Recolecta en el equipo local (una recolección a la vez)"""
+
+    def __init__(self, collect):
+        self._collect = collect
+        self._lock = threading.Lock()
+
+    def collect(self, target):
+        with self._lock:
+            return json.loads(_encode(self._collect()))
+
+
+class AgentTransport:
+    """Pide el reporte a un agente remoto por TCP"""
+
+    def __init__(self, timeout=300.0, token=None):
+        self.timeout = timeout
+        self.token = token
+
+    def collect(self, target):
+        request = {'accion': 'recolectar'}
+        if self.token:
+            request['token'] = self.token
+        with socket.create_connection(parse_address(target), timeout=self.timeout) as sock:
+            sock.sendall(_encode(request))
+            with sock.makefile('rb') as stream:
+                line = stream.readline()
+        if not line:
+            raise ConnectionError(f"El agente {target} cerró la conexión sin responder")
+        message = json.loads(line)
+        if 'error' in message:
+            raise RuntimeError(message['error'])
+        return message['reporte']
+
+
+class _AgentHandler(socketserver.StreamRequestHandler):
+    # Con búfer: la respuesta se escribe en muchos fragmentos pequeños
+    wbufsize = 1 << 16
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                if self.server.token and not hmac.compare_digest(str(request.get('token', '')), self.server.token):
+                    raise PermissionError("Clave del agente incorrecta")
+                if request.get('accion') != 'recolectar':
+                    raise ValueError(f"Acción desconocida: {request.get('accion')}")
+                with self.server.collect_lock:
+                    response = {'reporte': self.server.collect()}
+            except Exception as e:
+                response = {'error': str(e)}
+            _write_message(self.wfile, response)
+            self.wfile.flush()
+
+
+class AgentServer(socketserver.ThreadingTCPServer):
+    """Servidor del agente: responde cada petición con un reporte recolectado"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, collect, token=None):
+        super().__init__(address, _AgentHandler)
+        self.collect = collect
+        self.token = token
+        # Un equipo solo se recolecta una vez a la vez
+        self.collect_lock = threading.Lock()
+
+
+def serve_agent(collect, address="127.0.0.1:8765", token=None):
+    """Atiende peticiones de recolección hasta que se interrumpa el proceso.
+
+    Fuera de la interfaz local el agente no tiene otra protección que la
+    clave, así que sin ``token`` solo puede escuchar en 127.0.0.1.
+    """
+    address = parse_address(address)
+    if not token and not is_loopback(address[0]):
+        raise ValueError(f"Para escuchar en {address[0]} el agente necesita una clave (--token-agente)")
+    with AgentServer(address, collect, token) as server:
+        host, port = server.server_address[:2]
+        print(f"{READY_PREFIX} {host}:{port}", flush=True)
+        server.serve_forever()
+
+
+def spawn_local_agent(extra_args=(), script=None, timeout=30.0):
+    """Lanza ``main.py --agente`` en un proceso local y devuelve ``(proceso, 'host:puerto')``"""
+    script = script or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    proc = subprocess.Popen([sys.executable, script, '--agente', '127.0.0.1:0', '--no-interactivo', *extra_args],
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding='utf-8', errors='replace')
+    # La salida se lee en otro hilo: un agente colgado o mudo no bloquea la espera
+    lines = queue.Queue()
+
+    def pump():
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    threading.Thread(target=pump, name="agente-local-salida", daemon=True).start()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            line = lines.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            proc.kill()
+            proc.wait()
+            raise TimeoutError(f"El agente local no respondió en {timeout:g} s")
+        if line is None:
+            raise RuntimeError(f"El agente local terminó con código {proc.wait()}")
+        if line.startswith(READY_PREFIX):
+            # El hilo sigue vaciando la salida para que el agente no se bloquee al escribir
+            return proc, line.split()[1]
+
+
+def default_transports(collect_local, timeout=300.0, token=None):
+    """Elige transporte por objetivo: ``local`` o ``host:puerto`` de un agente"""
+    local = LocalTransport(collect_local)
+    agent = AgentTransport(timeout, token)
+    return lambda target: local if target == 'local' else agent
+
+
+def run_fleet(targets, transport_for, concurrency=8, on_result=None):
+    """Recolecta todos los objetivos con hasta ``concurrency`` en paralelo"""
+    results = [None] * len(targets)
+
+    def collect_one(index, target):
+        start = time.perf_counter()
+        entry = {'Equipo': target}
+        try:
+            entry['Reporte'] = transport_for(target).collect(target)
+        except Exception as e:
+            entry['Error'] = str(e)
+        entry['Duración (s)'] = round(time.perf_counter() - start, 3)
+        return index, entry
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [executor.submit(collect_one, i, t) for i, t in enumerate(targets)]
+        for future in concurrent.futures.as_completed(futures):
+            index, entry = future.result()
+            results[index] = entry
+            if on_result is not None:
+                on_result(entry)
+    elapsed = time.perf_counter() - start
+
+    durations = [r['Duración (s)'] for r in results]
+    ok = sum(1 for r in results if 'Error' not in r)
+    return {
+        'Resumen': {
+            'Equipos': len(results),
+            'Correctos': ok,
+            'Fallidos': len(results) - ok,
+            'Concurrencia': concurrency,
+            'Tiempo total (s)': round(elapsed, 3),
+            'Equipos por minuto': round(len(results) / elapsed * 60, 2) if elapsed > 0 else None,
+            'Duración promedio (s)': round(sum(durations) / len(durations), 3) if durations else None,
+            'Duración máxima (s)': max(durations) if durations else None,
+        },
+        'Equipos': results,
+    }
+
+
+def load_targets(specs):
+    """Expande la lista de objetivos; ``@archivo`` lee un objetivo por línea"""
+    targets = []
+    for spec in specs:
+        if spec.startswith('@'):
+            with open(spec[1:], encoding='utf-8') as f:
+                targets.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+        else:
+            targets.append(spec)
+    return targets
@@ -0,0 +1,205 @@
+"""Instrumentación de la revisión con intervalos medidos (spans).
+
+Cada recolector, consulta WMI, lectura del registro o subproceso se envuelve
+en ``tracer.span(nombre, categoría)``. Un span registra tiempo de reloj,
+tiempo de CPU del hilo, filas, bytes, errores y tiempos agotados, y su span
+padre dentro del mismo hilo. Con esos datos se arma la sección
+``_diagnostics`` del reporte y, opcionalmente, un archivo de trazas en el
+formato de Chrome (``chrome://tracing`` o https://ui.perfetto.dev).
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+
+class Span:
+    """Un intervalo medido; ``set`` agrega atributos (filas, bytes, ...)"""
+
+    __slots__ = ('name', 'category', 'start', 'duration', 'cpu', 'thread', 'parent', 'attrs', 'error', 'timeout')
+
+    def __init__(self, name, category, attrs):
+        self.name = name
+        self.category = category
+        self.attrs = dict(attrs)
+        self.start = 0.0
+        self.duration = 0.0
+        self.cpu = 0.0
+        self.thread = threading.current_thread().name
+        self.parent = None
+        self.error = None
+        self.timeout = False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """Acumula los spans terminados de una revisión (seguro entre hilos)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._spans = []
+        self._origin = time.perf_counter()
+
+    def reset(self):
+        with self._lock:
+            self._spans = []
+            self._origin = time.perf_counter()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextlib.contextmanager
+    def span(self, name, category, **attrs):
+        span = Span(name, category, attrs)
+        stack = self._stack()
+        span.parent = stack[-1].name if stack else None
+        stack.append(span)
+        t0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            yield span
+        except Exception as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - t0
+            span.cpu = time.thread_time() - c0
+            span.start = t0 - self._origin
+            stack.pop()
+            with self._lock:
+                self._spans.append(span)
+
+    def record(self, name, category, start, duration, timeout=False, error=None, **attrs):
+        """Agrega un span medido por fuera (por ejemplo un recolector abandonado)"""
+        span = Span(name, category, attrs)
+        span.start = start - self._origin
+        span.duration = duration
+        span.timeout = timeout
+        span.error = error
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self, top=10):
+        """Resumen para la sección ``_diagnostics`` del reporte"""
+        spans = self.spans()
+        by_category = {}
+        for s in spans:
+            c = by_category.setdefault(s.category, {'Llamadas': 0, 'Tiempo total (s)': 0.0, 'CPU (s)': 0.0,
+                                                     'Filas': 0, 'Bytes': 0, 'Errores': 0, 'Tiempos agotados': 0})
+            c['Llamadas'] += 1
+            c['Tiempo total (s)'] += s.duration
+            c['CPU (s)'] += s.cpu
+            c['Filas'] += s.attrs.get('filas', 0) or 0
+            c['Bytes'] += s.attrs.get('bytes', 0) or 0
+            c['Errores'] += bool(s.error)
+            c['Tiempos agotados'] += s.timeout
+        for c in by_category.values():
+            c['Tiempo total (s)'] = round(c['Tiempo total (s)'], 3)
+            c['CPU (s)'] = round(c['CPU (s)'], 3)
+        slowest = sorted((s for s in spans if s.category != 'recolector'), key=lambda s: s.duration, reverse=True)
+        return {
+            'Por categoría': by_category,
+            'Recolectores': [self._describe(s) for s in spans if s.category == 'recolector'],
+            'Más lentos': [self._describe(s) for s in slowest[:top]],
+            'Spans': len(spans),
+        }
+
+    @staticmethod
+    def _describe(span):
+        entry = {'Nombre': span.name, 'Categoría': span.category, 'Hilo': span.thread,
+                 'Duración (s)': round(span.duration, 4), 'CPU (s)': round(span.cpu, 4)}
+        if span.parent:
+            entry['Dentro de'] = span.parent
+        entry.update(span.attrs)
+        if span.error:
+            entry['Error'] = span.error
+        if span.timeout:
+            entry['Tiempo agotado'] = True
+        return entry
+
+    def chrome_trace(self):
+        """Eventos completos (``ph: X``) del formato Trace Event de Chrome"""
+        pid = os.getpid()
+        threads = {}
+        events = []
+        for s in self.spans():
+            tid = threads.setdefault(s.thread, len(threads) + 1)
+            args = dict(s.attrs, cpu_ms=round(s.cpu * 1000, 3))
+            if s.error:
+                args['error'] = s.error
+            if s.timeout:
+                args['timeout'] = True
+            events.append({'name': s.name, 'cat': s.category, 'ph': 'X', 'pid': pid, 'tid': tid,
+                           'ts': round(s.start * 1e6, 1), 'dur': round(s.duration * 1e6, 1), 'args': args})
+        for name, tid in threads.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False, default=str)
+        return path
+
+
+class Profiler:
+    """cProfile por hilo: los recolectores corren en un pool y cProfile solo ve su propio hilo.
+
+    ``wrap`` perfila cada llamada en el hilo donde ocurre; ``print_stats``
+    combina todos los perfiles y muestra los puntos más costosos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles = []
+
+    def run(self, func, *args, **kwargs):
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Desde Python 3.12 hay un solo perfilador activo por intérprete (y ve todos los hilos)
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._profiles.append(profiler)
+
+    def wrap(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(func, *args, **kwargs)
+        return wrapper
+
+    def stats(self, stream=None):
+        import pstats
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0], stream=stream)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def print_stats(self, top=25, stream=None, path=None):
+        """Muestra las ``top`` funciones con más tiempo propio; ``path`` guarda el perfil completo"""
+        stats = self.stats(stream)
+        if stats is None:
+            return
+        if path:
+            stats.dump_stats(path)
+        stats.sort_stats('tottime').print_stats(top)
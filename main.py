@@ -1,21 +1,26 @@
 import os
 import platform
-import subprocess
-import winreg
-import wmi
 import psutil
 import socket
 import time
-import sounddevice as sd
-import soundfile as sf
-import cv2
-import numpy as np
 import datetime
-import json
-from collections import defaultdict
-from colorama import Fore, Back, Style, init
+import multiprocessing
+from colorama import Fore, Style, init
 import sys
-import io
+import argparse
+from wmi_session import WMISession, default_connect
+from device_inventory import DeviceInventory
+from network import NetworkSnapshot
+from scheduler import CollectorRegistry, run_collectors
+from instrumentation import Profiler, Tracer
+from ps_host import PowerShellHost
+from cpu_sampler import CpuSampler
+import fleet
+from report_schema import RawValues, NotebookRecord, format_gb, format_percent, format_mhz
+from report_export import WRITERS, export_records
+from report_writer import ReportWriter, StreamedSection, write_file_atomic
+from snapshot_store import SectionCache, SnapshotStore, diff_reports
+from platform_backend import NET_CONNECTED, default_backend
 
 
 # para el color
@@ -27,22 +32,44 @@ if sys.stdout.encoding != 'UTF-8':
 if sys.stderr.encoding != 'UTF-8':
     sys.stderr.reconfigure(encoding='utf-8', errors='replace')
 
-def safe_wmi_query(wmi_class, attributes):
-    """Realiza consultas WMI de manera segura"""
-    c = wmi.WMI()
-    try:
-        items = []
-        for item in c.query(f"SELECT * FROM {wmi_class}"):
-            item_info = {}
-            for attr in attributes:
-                try:
-                    item_info[attr] = getattr(item, attr, "N/A")
-                except:
-                    item_info[attr] = "Error"
-            items.append(item_info)
-        return items
-    except Exception as e:
-        return [{'Error': f"Consulta WMI fallida: {str(e)}"}]
+# Spans de recolectores, consultas y subprocesos de la revisión en curso (sección _diagnostics)
+tracer = Tracer()
+
+# Sesión WMI compartida por todos los recolectores de una ejecución
+wmi_session = WMISession(tracer=tracer)
+# Las clases de batería (capacidad de diseño y de carga completa) están en root\wmi
+wmi_battery_session = WMISession(lambda: default_connect('root\\wmi'), tracer=tracer)
+# Interfaces de red y sus contadores, leídos una vez por revisión
+network_snapshot = NetworkSnapshot()
+
+# Un solo proceso de PowerShell para todas las comprobaciones (se lanza con el primer comando)
+powershell = PowerShellHost(tracer=tracer)
+
+# WMI, registro y PowerShell en Windows; sysfs y procfs en Linux (ver platform_backend)
+backend = default_backend(wmi_session, wmi_battery_session, powershell, tracer=tracer)
+# Dispositivos clasificados una vez por revisión para todas las secciones de puertos
+device_inventory = DeviceInventory(backend.device_rows)
+
+# Muestreo de CPU compartido por la batería y el estado de salud
+cpu_sampler = CpuSampler()
+
+# Secciones estables reutilizadas de la revisión anterior
+section_cache = SectionCache()
+
+# Valores numéricos crudos de la revisión en curso (ver report_schema)
+raw_values = RawValues()
+
+def machine_fingerprint():
+    """Huella del equipo (BIOS en el registro o en /sys/class/dmi)"""
+    return backend.machine_fingerprint()
+
+def gpu_fingerprint():
+    """Cambia si se instala o actualiza un controlador de video"""
+    return backend.gpu_fingerprint()
+
+def software_fingerprint():
+    """Cambia si se instala, actualiza o desinstala un programa"""
+    return backend.software_fingerprint()
 
 def get_system_info():
     """Obtiene información general del sistema"""
@@ -51,30 +78,24 @@ def get_system_info():
     info = {}
     
     # Información básica
-    info['Sistema Operativo'] = f"{platform.system()} {platform.release()} {platform.version()}"
+    info['Sistema Operativo'] = backend.os_name()
     info['Arquitectura'] = platform.machine()
     info['Nombre del Host'] = socket.gethostname()
+    raw_values.update(os=info['Sistema Operativo'], hostname=info['Nombre del Host'])
     
     # Información del procesador
-    try:
-        cpu_info = safe_wmi_query("Win32_Processor", ["Name", "NumberOfCores", "NumberOfLogicalProcessors", "MaxClockSpeed"])[0]
-        info['Procesador'] = {
-            'Modelo': cpu_info.get('Name', 'N/A').strip(),
-            'Núcleos Físicos': cpu_info.get('NumberOfCores', 'N/A'),
-            'Núcleos Lógicos': cpu_info.get('NumberOfLogicalProcessors', 'N/A'),
-            'Frecuencia Máxima': f"{cpu_info.get('MaxClockSpeed', 'N/A')} MHz" if cpu_info.get('MaxClockSpeed') != 'N/A' else 'N/A'
-        }
-    except Exception as e:
-        info['Procesador'] = {'Error': f"No se pudo obtener información: {str(e)}"}
+    info['Procesador'] = section_cache.get('Procesador', machine_fingerprint, _get_processor_info)
     
     # Información de memoria RAM
     try:
         mem = psutil.virtual_memory()
+        raw_values.update(ram_total_bytes=mem.total, ram_available_bytes=mem.available,
+                          ram_used_bytes=mem.used, ram_percent=mem.percent)
         info['Memoria RAM'] = {
-            'Total': f"{round(mem.total / (1024**3), 2)} GB",
-            'Disponible': f"{round(mem.available / (1024**3), 2)} GB",
-            'En uso': f"{round(mem.used / (1024**3), 2)} GB",
-            'Porcentaje en uso': f"{mem.percent}%"
+            'Total': format_gb(mem.total),
+            'Disponible': format_gb(mem.available),
+            'En uso': format_gb(mem.used),
+            'Porcentaje en uso': format_percent(mem.percent)
         }
     except Exception as e:
         info['Memoria RAM'] = {'Error': f"No se pudo obtener información: {str(e)}"}
@@ -82,21 +103,28 @@ def get_system_info():
     # Información de discos
     try:
         disks = []
+        usages = []
         for partition in psutil.disk_partitions():
-            if 'fixed' in partition.opts or 'remote' in partition.opts:
+            # En Linux disk_partitions() ya omite los sistemas de archivos virtuales y no informa 'fixed'
+            if 'fixed' in partition.opts or 'remote' in partition.opts or backend.name == 'Linux':
                 try:
                     usage = psutil.disk_usage(partition.mountpoint)
+                    usages.append(usage)
                     disks.append({
                         'Dispositivo': partition.device,
                         'Punto de Montaje': partition.mountpoint,
                         'Sistema de Archivos': partition.fstype,
-                        'Espacio Total': f"{round(usage.total / (1024**3), 2)} GB",
-                        'Espacio Usado': f"{round(usage.used / (1024**3), 2)} GB",
-                        'Espacio Libre': f"{round(usage.free / (1024**3), 2)} GB",
-                        'Porcentaje Usado': f"{usage.percent}%"
+                        'Espacio Total': format_gb(usage.total),
+                        'Espacio Usado': format_gb(usage.used),
+                        'Espacio Libre': format_gb(usage.free),
+                        'Porcentaje Usado': format_percent(usage.percent)
                     })
                 except:
                     continue
+        raw_values.update(disk_count=len(usages),
+                          disk_total_bytes=sum(u.total for u in usages),
+                          disk_used_bytes=sum(u.used for u in usages),
+                          disk_max_percent=max((u.percent for u in usages), default=None))
         info['Discos'] = disks if disks else [{'Error': 'No se encontraron discos'}]
     except Exception as e:
         info['Discos'] = {'Error': f"No se pudo obtener información: {str(e)}"}
@@ -105,16 +133,20 @@ def get_system_info():
     try:
         battery = psutil.sensors_battery()
         if battery:
+            raw_values.update(battery_percent=battery.percent, battery_plugged=battery.power_plugged,
+                              battery_secs_left=battery.secsleft if battery.secsleft and battery.secsleft > 0 else None)
             battery_info = {
-                'Porcentaje': f"{battery.percent}%",
+                'Porcentaje': format_percent(battery.percent),
                 'Estado': "Cargando" if battery.power_plugged else "Descargando",
                 'Tiempo estimado': "Calculando..." if battery.power_plugged else f"{round(battery.secsleft/3600, 2)} horas" if battery.secsleft else "Desconocido"
             }
             
+            battery_info.update(_get_battery_wear() or {})
+            
             # Estimación de consumo
             if not battery.power_plugged:
                 consumption = "Moderado"
-                cpu_usage = psutil.cpu_percent(interval=1)
+                cpu_usage = cpu_sampler.summary()['total']
                 if cpu_usage > 70: consumption = "Alto"
                 elif cpu_usage < 30: consumption = "Bajo"
                 battery_info['Consumo estimado'] = consumption
@@ -127,51 +159,76 @@ def get_system_info():
     
     # Información de red
     try:
-        net_info = []
-        for interface, addrs in psutil.net_if_addrs().items():
-            for addr in addrs:
-                if addr.family == socket.AF_INET:
-                    net_info.append({
-                        'Interfaz': interface,
-                        'Dirección IP': addr.address,
-                        'Máscara de Red': addr.netmask,
-                        'Estado': "Conectado" if interface in psutil.net_if_stats() and psutil.net_if_stats()[interface].isup else "Desconectado"
-                    })
+        net_info = network_snapshot.addresses()
         info['Red'] = net_info if net_info else [{'Error': 'No se encontraron interfaces de red'}]
     except Exception as e:
         info['Red'] = {'Error': f"No se pudo obtener información: {str(e)}"}
     
     # Información de GPU
+    info['GPU'] = section_cache.get('GPU', gpu_fingerprint, _get_gpu_info)
+    
+    return info
+
+def _get_battery_capacity():
+    """Capacidad de diseño y de carga completa en mWh (None si no se puede leer)"""
     try:
-        gpus = safe_wmi_query("Win32_VideoController", ["Name", "AdapterRAM", "CurrentHorizontalResolution", "CurrentVerticalResolution", "DriverVersion"])
+        return backend.battery_capacity()
+    except Exception:
+        return None, None
+
+def _get_battery_wear():
+    design, full = _get_battery_capacity()
+    if not design or not full:
+        return None
+    # NumPy (vía battery_session) solo se carga si hay datos de capacidad
+    from battery_session import battery_wear
+    return battery_wear(design, full)
+
+def _get_processor_info():
+    try:
+        cpu_info = backend.processor()
+        raw_values.update(cpu_model=str(cpu_info.get('Name', 'N/A')).strip(),
+                          cpu_physical_cores=cpu_info.get('NumberOfCores'),
+                          cpu_logical_cores=cpu_info.get('NumberOfLogicalProcessors'),
+                          cpu_max_mhz=cpu_info.get('MaxClockSpeed'))
+        return {
+            'Modelo': cpu_info.get('Name', 'N/A').strip(),
+            'Núcleos Físicos': cpu_info.get('NumberOfCores', 'N/A'),
+            'Núcleos Lógicos': cpu_info.get('NumberOfLogicalProcessors', 'N/A'),
+            'Frecuencia Máxima': f"{cpu_info.get('MaxClockSpeed', 'N/A')} MHz" if cpu_info.get('MaxClockSpeed') != 'N/A' else 'N/A'
+        }
+    except Exception as e:
+        return {'Error': f"No se pudo obtener información: {str(e)}"}
+
+def _get_gpu_info():
+    try:
+        gpus = backend.gpus()
+        adapter_ram = 0
         for gpu in gpus:
-            if gpu.get('AdapterRAM') not in ['N/A', 'Error']:
-                gpu['AdapterRAM'] = f"{round(int(gpu['AdapterRAM']) / (1024**3), 2)} GB"
-        info['GPU'] = gpus if gpus else [{'Error': 'No se detectaron GPUs'}]
+            if gpu.get('AdapterRAM') not in ['N/A', 'Error', None]:
+                adapter_ram += int(gpu['AdapterRAM'])
+                gpu['AdapterRAM'] = format_gb(int(gpu['AdapterRAM']))
+        if gpus and 'Error' not in gpus[0]:
+            raw_values.update(gpu_count=len(gpus), gpu_ram_bytes=adapter_ram)
+        return gpus if gpus else [{'Error': 'No se detectaron GPUs'}]
     except Exception as e:
-        info['GPU'] = {'Error': f"No se pudo obtener información: {str(e)}"}
-    
-    return info
+        return {'Error': f"No se pudo obtener información: {str(e)}"}
 
 def check_headphone_jack():
     jack_info = {'Estado': 'No verificado'}
     
     try:
-        import winsound
         try:
-            winsound.Beep(1000, 100)
-            jack_info['Estado'] = 'Puerto Audio Existente'
-            jack_info['Prueba'] = 'Conecte auriculares para verificar si sale sonido'
+            if backend.beep(1000, 100):
+                jack_info['Estado'] = 'Puerto Audio Existente'
+                jack_info['Prueba'] = 'Conecte auriculares para verificar si sale sonido'
         except:
             jack_info['Estado'] = 'Posible problema de audio'
             
-        # Verificación básica con WMI
+        # Verificación básica con el inventario de dispositivos
         try:
-            c = wmi.WMI()
-            jacks = [dev for dev in c.Win32_SoundDevice() 
-                    if 'jack' in dev.Name.lower()]
-            jack_info['Puerto_Detectado'] = 'Sí' if jacks else 'No'
-        except:
+            jack_info['Puerto_Detectado'] = 'Sí' if device_inventory.index().get('Jack') else 'No'
+        except Exception:
             pass
             
     except Exception as e:
@@ -179,126 +236,119 @@ def check_headphone_jack():
     
     return jack_info
 
+def _device_rows(devices):
+    return [{'Name': d.get('Name'), 'Status': d.get('Status'), 'PNPDeviceID': d.get('PNPDeviceID')} for d in devices]
+
+def check_wifi():
+    """Adaptadores WiFi con su estado (el de Win32_NetworkAdapter, no el de la entidad PnP)"""
+    try:
+        wifi_adapters = [{
+            'Nombre': adapter.get('Name'),
+            'Estado': 'Habilitado' if adapter.get('NetEnabled') == 1 else 'Deshabilitado',
+            'Conexión': 'Conectado' if adapter.get('NetConnectionStatus') == NET_CONNECTED else 'Desconectado'
+        } for adapter in backend.wifi_adapters()]
+        raw_values.set('wifi_available', bool(wifi_adapters))
+        return {
+            'Adaptadores': wifi_adapters if wifi_adapters else [{'Estado': 'No se detectaron adaptadores WiFi'}],
+            'Estado': 'Disponible' if wifi_adapters else 'No disponible'
+        }
+    except Exception as e:
+        return {'Error': f"No se pudo obtener información: {str(e)}"}
+
+def check_network_interfaces():
+    """Estado, velocidad y contadores de error y descarte de cada interfaz"""
+    try:
+        return network_snapshot.interfaces()
+    except Exception as e:
+        return {'Error': f"No se pudo obtener información: {str(e)}"}
+
 def check_ports():
     """Verifica los puertos disponibles y su estado"""
     print("\n=== INFORMACIÓN DE PUERTOS ===")
     
     ports_info = {}
-    c = wmi.WMI()
     
-    # Puertos USB
     try:
-        usb_devices = safe_wmi_query("Win32_USBHub", ["Name", "Status", "PNPDeviceID"])
-        ports_info['Puertos USB'] = {
-            'Total detectados': len(usb_devices),
-            'Dispositivos': usb_devices,
-            'Nota': 'Verificar físicamente conectando dispositivos. Algunos pueden ser controladores internos.'
-        }
+        devices = device_inventory.index()
     except Exception as e:
-        ports_info['Puertos USB'] = {'Error': f"No se pudo obtener información: {str(e)}"}
+        error = {'Error': f"No se pudo obtener información: {str(e)}"}
+        return {'Puertos USB': error, 'Jack_Auriculares': check_headphone_jack(), 'HDMI': error,
+                'Bluetooth': error, 'WiFi': check_wifi(), 'Cámaras': error}
+    
+    # Puertos USB: controladores y concentradores
+    usb_devices = _device_rows(devices.get('USB'))
+    raw_values.set('usb_devices', len(usb_devices))
+    ports_info['Puertos USB'] = {
+        'Total detectados': len(usb_devices),
+        'Dispositivos': usb_devices,
+        'Conectados por USB': len(devices.get('Conectado por USB')),
+        'Nota': 'Verificar físicamente conectando dispositivos. Algunos pueden ser controladores internos.'
+    }
     
     # Puerto AUX
     ports_info['Jack_Auriculares'] = check_headphone_jack()  
 
 
     # HDMI
-    try:
-        hdmi_devices = []
-        for display in safe_wmi_query("Win32_DesktopMonitor", ["Name", "Status", "PNPDeviceID"]):
-            if 'HDMI' in str(display.get('Name', '')).upper() or 'HDMI' in str(display.get('PNPDeviceID', '')).upper():
-                hdmi_devices.append(display)
-        ports_info['HDMI'] = {
-            'Dispositivos': hdmi_devices if hdmi_devices else [{'Estado': 'No se detectaron salidas HDMI'}],
-            'Nota': 'Verificar físicamente conectando un monitor externo.'
-        }
-    except Exception as e:
-        ports_info['HDMI'] = {'Error': f"No se pudo obtener información: {str(e)}"}
+    hdmi_devices = _device_rows(devices.get('HDMI'))
+    ports_info['HDMI'] = {
+        'Dispositivos': hdmi_devices if hdmi_devices else [{'Estado': 'No se detectaron salidas HDMI'}],
+        'Monitores detectados': len(devices.get('Monitor')),
+        'Nota': 'Verificar físicamente conectando un monitor externo.'
+    }
     
     # Bluetooth
-    try:
-        bt_devices = []
-        for device in safe_wmi_query("Win32_PnPEntity", ["Name", "Status"]):
-            if device.get('Name') and 'bluetooth' in str(device.get('Name')).lower():
-                bt_devices.append(device)
-        ports_info['Bluetooth'] = {
-            'Dispositivos': bt_devices if bt_devices else [{'Estado': 'No se detectaron dispositivos Bluetooth'}],
-            'Estado': 'Disponible' if bt_devices else 'No disponible'
-        }
-    except Exception as e:
-        ports_info['Bluetooth'] = {'Error': f"No se pudo obtener información: {str(e)}"}
+    bt_devices = _device_rows(devices.get('Bluetooth'))
+    raw_values.set('bluetooth_available', bool(bt_devices))
+    ports_info['Bluetooth'] = {
+        'Dispositivos': bt_devices if bt_devices else [{'Estado': 'No se detectaron dispositivos Bluetooth'}],
+        'Estado': 'Disponible' if bt_devices else 'No disponible'
+    }
     
     # WiFi
-    try:
-        wifi_adapters = []
-        for adapter in safe_wmi_query("Win32_NetworkAdapter", ["Name", "NetConnectionStatus", "NetEnabled"]):
-            if adapter.get('Name') and ('wireless' in str(adapter.get('Name')).lower() or 'wi-fi' in str(adapter.get('Name')).lower()):
-                wifi_adapters.append({
-                    'Nombre': adapter.get('Name'),
-                    'Estado': 'Habilitado' if adapter.get('NetEnabled') == 1 else 'Deshabilitado',
-                    'Conexión': 'Conectado' if adapter.get('NetConnectionStatus') == 2 else 'Desconectado'
-                })
-        ports_info['WiFi'] = {
-            'Adaptadores': wifi_adapters if wifi_adapters else [{'Estado': 'No se detectaron adaptadores WiFi'}],
-            'Estado': 'Disponible' if wifi_adapters else 'No disponible'
-        }
-    except Exception as e:
-        ports_info['WiFi'] = {'Error': f"No se pudo obtener información: {str(e)}"}
+    ports_info['WiFi'] = check_wifi()
+    
+    # Cámaras
+    cameras = _device_rows(devices.get('Cámara'))
+    ports_info['Cámaras'] = {
+        'Total detectadas': len(cameras),
+        'Dispositivos': cameras if cameras else [{'Estado': 'No se detectaron cámaras'}],
+    }
     
     return ports_info
 
-def get_installed_software():
-    """Obtiene una lista de software instalado"""
+def get_installed_software(limit=20):
+    """Obtiene una lista de software instalado (completa si ``limit`` es None)"""
     print("\n=== SOFTWARE INSTALADO ===")
     
-    software_list = []
+    if limit is None:
+        # El registro se recorre una sola vez; el historial, el reporte y la flota leen la misma copia
+        return section_cache.get('Software Instalado', software_fingerprint,
+                                 lambda: StreamedSection(_stream_installed_software()))
+    return section_cache.get(f'Software Instalado (primeros {limit})', software_fingerprint,
+                             lambda: _top_installed_software(limit))
+
+def _top_installed_software(limit):
     try:
-        # Software de 32 bits
-        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
-        for i in range(0, winreg.QueryInfoKey(key)[0]):
-            try:
-                subkey_name = winreg.EnumKey(key, i)
-                subkey = winreg.OpenKey(key, subkey_name)
-                name = winreg.QueryValueEx(subkey, "DisplayName")[0]
-                version = winreg.QueryValueEx(subkey, "DisplayVersion")[0] if winreg.QueryValueEx(subkey, "DisplayVersion") else "N/A"
-                publisher = winreg.QueryValueEx(subkey, "Publisher")[0] if winreg.QueryValueEx(subkey, "Publisher") else "N/A"
-                install_date = winreg.QueryValueEx(subkey, "InstallDate")[0] if winreg.QueryValueEx(subkey, "InstallDate") else "N/A"
-                software_list.append({
-                    'Nombre': name,
-                    'Versión': version,
-                    'Publicador': publisher,
-                    'Fecha de Instalación': install_date
-                })
-            except:
-                continue
-        
-        # Software de 64 bits
-        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Uninstall")
-        for i in range(0, winreg.QueryInfoKey(key)[0]):
-            try:
-                subkey_name = winreg.EnumKey(key, i)
-                subkey = winreg.OpenKey(key, subkey_name)
-                name = winreg.QueryValueEx(subkey, "DisplayName")[0]
-                version = winreg.QueryValueEx(subkey, "DisplayVersion")[0] if winreg.QueryValueEx(subkey, "DisplayVersion") else "N/A"
-                publisher = winreg.QueryValueEx(subkey, "Publisher")[0] if winreg.QueryValueEx(subkey, "Publisher") else "N/A"
-                install_date = winreg.QueryValueEx(subkey, "InstallDate")[0] if winreg.QueryValueEx(subkey, "InstallDate") else "N/A"
-                software_list.append({
-                    'Nombre': name,
-                    'Versión': version,
-                    'Publicador': publisher,
-                    'Fecha de Instalación': install_date
-                })
-            except:
-                continue
+        # Primeros elementos por nombre
+        with tracer.span('Programas instalados', 'registro') as span:
+            programs = backend.top_software(limit)
+            span.set(filas=len(programs))
+        return programs
     except Exception as e:
         return [{'Error': f"No se pudo obtener software instalado: {str(e)}"}]
-    
-    # Ordenar y limitar a 20 elementos
-    return sorted([s for s in software_list if s.get('Nombre')], key=lambda x: x['Nombre'])[:20]
+
+def _stream_installed_software():
+    try:
+        yield from backend.iter_software()
+    except Exception as e:
+        yield {'Error': f"No se pudo obtener software instalado: {str(e)}"}
 
 def get_boot_time():
     """Obtiene información del tiempo de arranque"""
     try:
         boot_time = psutil.boot_time()
+        raw_values.set('uptime_seconds', time.time() - boot_time)
         return {
             'Último arranque': datetime.datetime.fromtimestamp(boot_time).strftime("%Y-%m-%d %H:%M:%S"),
             'Tiempo activo': str(datetime.datetime.now() - datetime.datetime.fromtimestamp(boot_time))
@@ -309,15 +359,7 @@ def get_boot_time():
 def get_windows_activation_status():
     """Verifica el estado de activación de Windows"""
     try:
-        result = subprocess.run(['cscript', os.path.join(os.environ['SYSTEMROOT'], 'System32', 'slmgr.vbs'), '/dli'], 
-                               capture_output=True, text=True, check=True)
-        activation_info = {}
-        for line in result.stdout.split('\n'):
-            if 'Nombre:' in line:
-                activation_info['Nombre'] = line.split(':')[1].strip()
-            elif 'Estado de la licencia:' in line:
-                activation_info['Estado'] = line.split(':')[1].strip()
-        return activation_info
+        return backend.activation()
     except Exception as e:
         return {'Error': f"No se pudo verificar: {str(e)}"}
 
@@ -326,22 +368,18 @@ def get_bios_info():
     """Obtiene información detallada de la BIOS"""
     print("\n=== INFORMACIÓN DE LA BIOS ===")
     
+    bios_info = section_cache.get('BIOS', machine_fingerprint, _collect_bios_info)
+    if 'Error' in bios_info:
+        return bios_info
+    # El estado y Secure Boot cambian sin tocar la BIOS: se leen en cada revisión
+    return {**bios_info, **_collect_bios_status()}
+
+def _collect_bios_info():
     bios_info = {}
-    c = wmi.WMI()
     
     try:
         # Información básica de la BIOS
-        bios_data = safe_wmi_query("Win32_BIOS", [
-            "Manufacturer", 
-            "Name", 
-            "Version", 
-            "ReleaseDate", 
-            "SerialNumber",
-            "SMBIOSBIOSVersion",
-            "SMBIOSMajorVersion",
-            "SMBIOSMinorVersion",
-            "Status"
-        ])[0]
+        bios_data = backend.bios()
         
         bios_info = {
             'Fabricante': bios_data.get('Manufacturer', 'N/A'),
@@ -350,31 +388,38 @@ def get_bios_info():
             'Fecha de Lanzamiento': bios_data.get('ReleaseDate', 'N/A'),
             'Número de Serie': bios_data.get('SerialNumber', 'N/A'),
             'Versión SMBIOS': bios_data.get('SMBIOSBIOSVersion', 'N/A'),
-            'Estado': bios_data.get('Status', 'N/A')
         }
-        
-        # Verificación de estado
-        if bios_info['Estado'] == 'OK':
-            bios_info['Estado_Verificacion'] = 'Funcional'
-        else:
-            bios_info['Estado_Verificacion'] = 'Requiere atención'
-            
-        # Detección de modo seguro
-        try:
-            secure_boot = subprocess.check_output(
-                "powershell Confirm-SecureBootUEFI",
-                shell=True,
-                stderr=subprocess.PIPE
-            ).decode().strip()
-            bios_info['SecureBoot'] = 'Activado' if 'True' in secure_boot else 'Desactivado'
-        except:
-            bios_info['SecureBoot'] = 'No soportado o error'
+        raw_values.update(bios_serial=bios_info['Número de Serie'], bios_manufacturer=bios_info['Fabricante'],
+                          bios_version=bios_info['Versión'])
             
     except Exception as e:
         bios_info['Error'] = f"No se pudo obtener información: {str(e)}"
     
     return bios_info
 
+def _collect_bios_status():
+    status = {}
+    try:
+        status['Estado'] = backend.bios().get('Status', 'N/A')
+    except Exception:
+        status['Estado'] = 'N/A'
+    
+    # Verificación de estado
+    if status['Estado'] == 'OK':
+        status['Estado_Verificacion'] = 'Funcional'
+    else:
+        status['Estado_Verificacion'] = 'Requiere atención'
+    raw_values.set('bios_ok', status['Estado'] == 'OK')
+        
+    # Detección de modo seguro
+    try:
+        secure_boot = backend.secure_boot()
+        status['SecureBoot'] = 'Activado' if secure_boot else 'Desactivado'
+        raw_values.set('secure_boot', secure_boot)
+    except Exception:
+        status['SecureBoot'] = 'No soportado o error'
+    return status
+
 
 def check_health():
     """Verifica el estado de salud del sistema"""
@@ -382,11 +427,20 @@ def check_health():
     
     health_info = {}
     
+    try:
+        cpu = cpu_sampler.summary()
+    except Exception as e:
+        cpu = None
+        cpu_error = str(e)
+    
     # Temperatura
     try:
-        temps = psutil.sensors_temperatures()
+        if cpu is None:
+            raise RuntimeError(cpu_error)
+        temps = cpu['temps']
         if temps:
             temp_info = {}
+            raw_values.set('cpu_temp_max_c', max((e.current for entries in temps.values() for e in entries), default=None))
             for name, entries in temps.items():
                 temp_info[name] = [{'Sensor': entry.label, 'Actual': entry.current, 'Máxima': entry.high} for entry in entries]
             health_info['Temperaturas'] = temp_info
@@ -397,11 +451,15 @@ def check_health():
     
     # CPU
     try:
-        cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
+        if cpu is None:
+            raise RuntimeError(cpu_error)
+        raw_values.update(cpu_usage_percent=cpu['total'], cpu_freq_mhz=cpu['freq_current'])
         health_info['CPU'] = {
-            'Uso total': f"{sum(cpu_percent)/len(cpu_percent):.1f}%",
-            'Uso por núcleo': [f"{p}%" for p in cpu_percent],
-            'Frecuencia actual': f"{psutil.cpu_freq().current:.1f} MHz" if hasattr(psutil, 'cpu_freq') and psutil.cpu_freq() else 'N/A'
+            'Uso total': f"{cpu['total']:.1f}%",
+            'Uso por núcleo': [f"{core['avg']:.1f}%" for core in cpu['cores']],
+            'Uso por núcleo (mín/prom/máx)': [f"{core['min']:.1f}/{core['avg']:.1f}/{core['max']:.1f}%" for core in cpu['cores']],
+            'Frecuencia actual': format_mhz(cpu['freq_current']) if cpu['freq_current'] else 'N/A',
+            'Ventana de muestreo': f"{cpu['samples']} muestras en {cpu['window']:.1f} s"
         }
     except Exception as e:
         health_info['CPU'] = {'Error': f"No se pudo obtener: {str(e)}"}
@@ -425,127 +483,398 @@ def check_health():
     
     return health_info
 
-def prueba_microfono_sonido():
-    """Función para probar micrófono y sistema de sonido"""
+def check_disk_performance(time_budget=20.0):
+    """Rendimiento y escaneo de superficie de cada partición donde se pueda escribir"""
+    # NumPy solo se carga si se pide la prueba de disco
+    from disk_bench import run_disk_benchmark
+    print("\n=== PRUEBA DE DISCOS ===")
+    results = []
+    seen = set()
+    for partition in psutil.disk_partitions():
+        if partition.device in seen or 'ro' in partition.opts.split(',') or 'cdrom' in partition.opts:
+            continue
+        seen.add(partition.device)
+        try:
+            result = run_disk_benchmark(partition.mountpoint, time_budget=time_budget)
+            results.append({'Disco': partition.device, **result})
+        except Exception as e:
+            results.append({'Disco': partition.device, 'Error': f"No se pudo medir: {str(e)}"})
+    return results if results else [{'Error': 'No se encontraron discos'}]
+
+def check_cpu_stress(duration=10.0):
+    """Esfuerzo por núcleo con verificación de resultados"""
+    # NumPy y los procesos de carga solo se usan si se pide la prueba
+    from cpu_stress import run_cpu_stress
+    print(f"\n=== PRUEBA DE NÚCLEOS ({duration:g} s a plena carga) ===")
+    max_mhz = None
+    try:
+        max_mhz = float(backend.processor()['MaxClockSpeed'])
+    except Exception:
+        freq = psutil.cpu_freq()
+        max_mhz = freq.max if freq and freq.max else None
+    try:
+        return run_cpu_stress(duration, max_mhz=max_mhz)
+    except Exception as e:
+        return {'Error': f"No se pudo ejecutar la prueba: {str(e)}"}
+
+def check_memory(time_budget=30.0):
+    """Integridad y ancho de banda de una parte de la memoria disponible"""
+    from memory_test import run_memory_test
+    print(f"\n=== PRUEBA DE MEMORIA RAM (hasta {time_budget:g} s) ===")
+    try:
+        return run_memory_test(time_budget=time_budget)
+    except Exception as e:
+        return {'Error': f"No se pudo ejecutar la prueba: {str(e)}"}
+
+def print_memory_test(result):
+    if 'Error' in result:
+        print(f"  {Fore.RED}{result['Error']}{Style.RESET_ALL}")
+        return
+    color = Fore.GREEN if result['Resultado'] == 'OK' else Fore.RED
+    print(f"  {result['Memoria probada']} en {result['Duración (s)']} s: escritura {result.get('Escritura (GB/s)', 'N/A')} GB/s, "
+          f"lectura {result.get('Lectura (GB/s)', 'N/A')} GB/s, copia {result.get('Copia (GB/s)', 'N/A')} GB/s "
+          f"{color}{result['Resultado']}{Style.RESET_ALL}")
+    for problem in result['Problemas']:
+        print(f"    {Fore.RED}{problem}{Style.RESET_ALL}")
+
+def print_cpu_stress(result):
+    if 'Error' in result:
+        print(f"  {Fore.RED}{result['Error']}{Style.RESET_ALL}")
+        return
+    for core in result['Núcleos']:
+        color = Fore.GREEN if core['Estado'] == 'OK' else Fore.RED
+        print(f"  Núcleo {core['Núcleo']}: {core['Operaciones/s']} op/s, "
+              f"{core['Frecuencia media (MHz)'] or 'N/A'} MHz {color}{core['Estado']}{Style.RESET_ALL}")
+    print(f"  Temperatura máxima: {result['Temperatura máxima (°C)'] or 'N/A'} °C")
+
+def run_battery_test(args):
+    """Comando test-battery: sesión de descarga con muestreo periódico"""
+    from battery_session import BatterySession, CpuLoad, battery_wear
+    print("\n=== SESIÓN DE BATERÍA ===")
+    print(f"Desconecte el cargador. Duración: {args.tiempo_bateria / 60:.1f} min, una muestra cada "
+          f"{args.intervalo_bateria:g} s (Ctrl+C termina antes)")
+    if args.interactivo:
+        input("Presione Enter para comenzar...")
+    design, full = _get_battery_capacity()
+    wear = battery_wear(design, full)
+    capacity_wh = full / 1000 if full else None
+    load = CpuLoad(args.carga_bateria) if args.carga_bateria else None
+    session = BatterySession(interval=args.intervalo_bateria,
+                             capacity=int(args.tiempo_bateria / args.intervalo_bateria) + 2)
+    try:
+        result = session.run(args.tiempo_bateria, load, capacity_wh, wear)
+    except KeyboardInterrupt:
+        # Lo medido hasta la interrupción sigue sirviendo
+        result = session.result(capacity_wh, wear, load is not None)
+    if 'Error' in result:
+        print(f"  {Fore.RED}{result['Error']}{Style.RESET_ALL}")
+    else:
+        fit = result.get('Ajuste de descarga', {})
+        print(f"  {result['Porcentaje inicial']}% -> {result['Porcentaje final']}% en {result['Duración (min)']} min")
+        if fit:
+            print(f"  Descarga: {fit['Descarga (%/h)']} %/h, autonomía con carga completa: "
+                  f"{fit['Autonomía con carga completa (h)']} h")
+        if 'Capacidad' in result:
+            print(f"  Desgaste: {result['Capacidad']['Desgaste (%)']}%")
+        for problem in result['Problemas']:
+            print(f"  {Fore.RED}{problem}{Style.RESET_ALL}")
+    save_to_file({'Sesión de Batería': result}, "battery_report.json")
+    return result
+
+def print_disk_results(results):
+    for disk in results:
+        if 'Error' in disk and 'Resultado' not in disk:
+            print(f"  {disk.get('Disco', '')}: {Fore.RED}{disk['Error']}{Style.RESET_ALL}")
+            continue
+        color = Fore.GREEN if disk['Resultado'] == 'OK' else Fore.RED
+        if 'Modo de E/S' in disk:
+            detail = (f"({disk['Modo de E/S']}): secuencial lectura/escritura "
+                      f"{disk.get('Lectura secuencial (MB/s)', 'N/A')}/{disk.get('Escritura secuencial (MB/s)', 'N/A')} MB/s, "
+                      f"4K {disk.get('Lectura aleatoria 4K (IOPS)', 'N/A')}/{disk.get('Escritura aleatoria 4K (IOPS)', 'N/A')} IOPS")
+        else:
+            scan = disk.get('Escaneo de superficie', {})
+            detail = f"escaneados {scan.get('Escaneado (MB)', 0)} de {scan.get('Tamaño total (MB)', 0)} MB"
+        print(f"  {Fore.CYAN}{disk['Disco']}{Style.RESET_ALL} {detail} {color}{disk['Resultado']}{Style.RESET_ALL}")
+        for problem in disk['Problemas']:
+            print(f"    {Fore.RED}{problem}{Style.RESET_ALL}")
+
+def print_network_test(result):
+    print(f"  Par: {result['Par']}")
+    for entry in result['Interfaces']:
+        color = Fore.GREEN if entry['Resultado'] == 'OK' else Fore.RED
+        rtt = entry.get('RTT (ms)') or {}
+        print(f"  {Fore.CYAN}{entry['Interfaz']}{Style.RESET_ALL} ({entry['Dirección']}): "
+              f"subida/bajada {entry.get('Subida (Mbps)', 'N/A')}/{entry.get('Bajada (Mbps)', 'N/A')} Mbps, "
+              f"RTT p50/p99 {rtt.get('p50', 'N/A')}/{rtt.get('p99', 'N/A')} ms {color}{entry['Resultado']}{Style.RESET_ALL}")
+        if 'Error' in entry:
+            print(f"    {Fore.RED}{entry['Error']}{Style.RESET_ALL}")
+        for problem in entry['Problemas']:
+            print(f"    {Fore.RED}{problem}{Style.RESET_ALL}")
+
+def run_network_test(args):
+    """Comando test-network: caudal y latencia de cada interfaz contra un par"""
+    from network import run_link_test
+    peer = fleet.parse_address(args.red_par, default_port=9102) if args.red_par else None
+    print(f"===🌐 PRUEBA DE RED ({args.tiempo_red:g} s por interfaz) 🌐===")
+    try:
+        result = run_link_test(peer, args.tiempo_red)
+    except Exception as e:
+        result = {'Error': f"No se pudo probar la red: {str(e)}"}
+        print(f"  {Fore.RED}{result['Error']}{Style.RESET_ALL}")
+    else:
+        print_network_test(result)
+    save_to_file({'Prueba de Red': result}, "network_report.json")
+    return result
+
+def run_network_peer(args):
+    """Comando net-peer: atiende las pruebas de red de otros equipos hasta Ctrl+C"""
+    from network import LinkPeer
+    # El par tiene que ser accesible desde el equipo a probar: por defecto escucha en todas las interfaces
+    peer = LinkPeer(fleet.parse_address(args.red_par or "9102", default_port=9102, default_host="0.0.0.0"))
+    host, port = peer.address
+    print(f"===🌐 PAR DE PRUEBA DE RED en {host}:{port} 🌐===")
+    print(f"  En el equipo a probar: python main.py test-network --red-par <esta-ip>:{port}")
+    print("  Ctrl+C para terminar")
+    try:
+        peer.serve_forever()
+    except KeyboardInterrupt:
+        print("\nPar detenido")
+
+def prueba_microfono_sonido(interactive=True):
+    """Función para probar micrófono y sistema de sonido; devuelve ``(ok, métricas)``"""
     print("\n=== PRUEBA DE MICRÓFONO Y SONIDO ===")
-    print("1. Se grabará audio por 3 segundos")
-    print("2. Se reproducirá lo grabado")
-    print("Preparado? Presione Enter para comenzar...")
-    input()
+    print("1. Se reproducirá una señal de prueba mientras se graba (suba el volumen)")
+    if interactive:
+        print("2. Se grabará su voz por 3 segundos y se reproducirá")
+        print("Preparado? Presione Enter para comenzar...")
+        input()
     
     try:
+        # PortAudio solo se carga si realmente se hace la prueba
+        import sounddevice as sd
+        from audio_test import run_loopback_test
+        
         # Configuración de audio
         fs = 44100  # Frecuencia de muestreo
         duration = 3  # Duración en segundos
         
-        print(f"\nGrabando audio ({duration} segundos)...")
-        recording = sd.rec(int(duration * fs), samplerate=fs, channels=2)
-        sd.wait()  # Espera hasta que termine la grabación
-        print("Grabación completada")
+        print("\nMidiendo parlante -> micrófono...")
+        metrics = run_loopback_test(fs=fs)
+        print(f"  Latencia: {metrics['Latencia entrada-salida (ms)']} ms")
+        for channel in metrics['Canales']:
+            print(f"  Canal {channel['Canal']}: {channel['Estado']}, SNR {channel['SNR (dB)']} dB, "
+                  f"THD {channel['THD (%)']}%")
+        for problem in metrics['Problemas']:
+            print(f"  {Fore.RED}{problem}{Style.RESET_ALL}")
         
-        print("Reproduciendo audio grabado...")
-        sd.play(recording, fs)
-        sd.wait()
-        print("Prueba completada con éxito!")
-        return True
+        if interactive:
+            print(f"\nGrabando audio ({duration} segundos)...")
+            recording = sd.rec(int(duration * fs), samplerate=fs, channels=2)
+            sd.wait()  # Espera hasta que termine la grabación
+            print("Grabación completada")
+            
+            print("Reproduciendo audio grabado...")
+            sd.play(recording, fs)
+            sd.wait()
+        print("Prueba completada")
+        return metrics['Resultado'] == 'OK', metrics
     except Exception as e:
         print(f"\nError en prueba de audio: {str(e)}")
         print("El micrófono o sistema de sonido no funciona correctamente")
-        return False
+        return False, {'Error': str(e)}
 
-def prueba_camara():
-    """Función para probar la cámara web"""
+def prueba_camara(interactive=True, duration=5):
+    """Función para probar la cámara web; devuelve ``(ok, métricas)``"""
     print("\n=== PRUEBA DE CÁMARA ===")
-    print("1. Se abrirá la cámara por 5 segundos")
+    print(f"1. Se abrirá la cámara por {duration} segundos")
     print("2. Mire directamente a la cámara")
-    print("Preparado? Presione Enter para comenzar...")
-    input()
+    if interactive:
+        print("Preparado? Presione Enter para comenzar...")
+        input()
     
-    cap = None
     try:
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
+        # OpenCV tarda segundos en cargar: solo se importa para esta prueba
+        import cv2
+        from camera_bench import OpenCVSource, run_camera_benchmark
+    except ImportError as e:
+        print(f"\nError en prueba de cámara: {str(e)}")
+        return False, {'Error': str(e)}
+    
+    source = None
+    try:
+        source = OpenCVSource(0)
+        if not source.is_opened():
             print("No se pudo abrir la cámara")
-            return False
+            return False, {'Error': 'No se pudo abrir la cámara'}
             
-        print("\nCámara activada - Sonría! (5 segundos)")
-        start_time = time.time()
+        print(f"\nCámara activada - Sonría! ({duration} segundos)")
         
-        while (time.time() - start_time) < 5:
-            ret, frame = cap.read()
-            if not ret:
-                break
+        def preview(frame):
             cv2.imshow('Prueba de Cámara (Presione Q para salir)', frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+            return not (cv2.waitKey(1) & 0xFF == ord('q'))
+        
+        # Sin técnico delante no se muestra ventana (puede no haber pantalla)
+        metrics = run_camera_benchmark(source, duration, on_frame=preview if interactive else None)
                 
         print("Prueba de cámara completada")
-        return True
+        print(f"  FPS efectivos: {metrics['FPS efectivos']} (nominales: {metrics['FPS nominales']})")
+        if 'Jitter (ms)' in metrics:
+            print(f"  Jitter: {metrics['Jitter (ms)']} ms, cuadros perdidos: {metrics['Cuadros perdidos (estimado)']}")
+        for problem in metrics['Problemas']:
+            print(f"  {Fore.RED}{problem}{Style.RESET_ALL}")
+        return metrics['Resultado'] == 'OK', metrics
         
     except Exception as e:
         print(f"\nError en prueba de cámara: {str(e)}")
-        return False
+        return False, {'Error': str(e)}
     finally:
-        if cap is not None:
-            cap.release()
-        cv2.destroyAllWindows()
+        if source is not None:
+            source.release()
+        if interactive:
+            cv2.destroyAllWindows()
 
 def save_to_file(data, filename="notebook_report.json"):
     """Guarda el reporte en un archivo JSON"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        write_file_atomic(filename, data)
         print(f"\nReporte guardado en {filename}")
     except Exception as e:
         print(f"\nError al guardar el reporte: {str(e)}")
 
 def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # Secuencia ANSI en lugar de lanzar un proceso 'cls'/'clear'
+    if sys.stdout.isatty():
+        print("\033[2J\033[H", end="", flush=True)
 
-def main():
-    clear_screen()
-    print("===🔧 INICIANDO REVISIÓN DEL DISPOSITIVO 🔧===")
+def build_collectors(software_limit=20, disk_budget=None, cpu_budget=None, ram_budget=None):
+    """Registra los recolectores que forman las secciones del reporte"""
+    registry = CollectorRegistry()
+    registry.register('Información General', get_system_info)
+    registry.register('Puertos', check_ports)
+    registry.register('Interfaces de Red', check_network_interfaces, timeout=10)
+    registry.register('BIOS', get_bios_info)
+    registry.register('Estado de Salud', check_health)
+    registry.register('Tiempo de Arranque', get_boot_time, timeout=10)
+    registry.register('Activación de Windows', get_windows_activation_status, timeout=30)
+    if software_limit is None:
+        registry.register('Software Instalado', lambda: get_installed_software(None))
+    else:
+        registry.register(f'Software Instalado (primeros {software_limit})',
+                          lambda: get_installed_software(software_limit))
+    if cpu_budget:
+        # Después del estado de salud, para no alterar el muestreo de uso de CPU
+        registry.register('Prueba de Núcleos', lambda deps: check_cpu_stress(cpu_budget),
+                          depends_on=('Estado de Salud',), timeout=cpu_budget + 60)
+    if ram_budget:
+        # Tampoco en paralelo con la prueba de núcleos: falsearía el ancho de banda
+        after = ('Estado de Salud', 'Prueba de Núcleos') if cpu_budget else ('Estado de Salud',)
+        registry.register('Prueba de Memoria RAM', lambda deps: check_memory(ram_budget),
+                          depends_on=after, timeout=ram_budget + 60)
+    if disk_budget:
+        # Al final, sin la carga de CPU y memoria de las otras pruebas; cada partición
+        # respeta su presupuesto y el plazo del recolector deja margen
+        after = ('Estado de Salud',) + (('Prueba de Núcleos',) if cpu_budget else ()) \
+            + (('Prueba de Memoria RAM',) if ram_budget else ())
+        registry.register('Rendimiento de Discos', lambda deps: check_disk_performance(disk_budget), depends_on=after,
+                          timeout=disk_budget * max(len(psutil.disk_partitions()), 1) + 60)
+    return registry
+
+def collect_report(software_limit=20, history_path="notebook_snapshots.db", disk_budget=None, cpu_budget=None,
+                   ram_budget=None, profiler=None, on_section=None):
+    """Ejecuta todos los recolectores y devuelve el reporte (sin interacción).
+
+    Con ``profiler`` (ver ``instrumentation.Profiler``) cada recolector corre
+    además bajo cProfile en su propio hilo. ``on_section(nombre, sección,
+    segundos)`` recibe cada sección apenas termina su recolector.
+    """
+    tracer.reset()
+    cpu_sampler.start()
+    try:
+        return _collect_report(software_limit, history_path, disk_budget, cpu_budget, ram_budget, profiler,
+                               on_section)
+    finally:
+        # El muestreo solo hace falta mientras corren los recolectores
+        cpu_sampler.stop()
+
+def _collect_report(software_limit, history_path, disk_budget, cpu_budget, ram_budget, profiler, on_section):
+    backend.clear()
+    device_inventory.clear()
+    network_snapshot.clear()
     
-    report = {
-        'Información General': get_system_info(),
-        'Puertos': check_ports(),
-        'BIOS': get_bios_info(), 
-        'Estado de Salud': check_health(),
-        'Tiempo de Arranque': get_boot_time(),
-        'Activación de Windows': get_windows_activation_status(),
-        'Software Instalado (primeros 20)': get_installed_software(),
-        'Fecha de Revisión': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
+    start = time.perf_counter()
+    hostname = socket.gethostname()
+    try:
+        machine = backend.machine_id()
+    except Exception:
+        machine = None
+    store = None
+    previous, previous_fingerprints = None, {}
+    if history_path:
+        try:
+            store = SnapshotStore(history_path)
+            # Sin número de serie no se distingue entre equipos con el mismo nombre: no se reutiliza nada
+            if machine is not None:
+                with tracer.span('Revisión anterior', 'historial'):
+                    previous, previous_fingerprints = store.latest(hostname, machine)
+        except Exception as e:
+            print(f"\n{Fore.RED}No se pudo abrir el historial:{Style.RESET_ALL} {str(e)}")
+    section_cache.reset(previous, previous_fingerprints)
+    raw_values.reset()
+
+    registry = build_collectors(software_limit, disk_budget, cpu_budget, ram_budget)
+    if profiler is not None:
+        for collector in registry:
+            collector.func = profiler.wrap(collector.func)
+    report, timings = run_collectors(registry, tracer=tracer, on_result=on_section)
+    report['Fecha de Revisión'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    raw_values.set('checked_at', datetime.datetime.now().isoformat(timespec='seconds'))
+    if previous:
+        raw_values.restore(previous.get('_valores', {}), section_cache.reused)
+    report['_valores'] = NotebookRecord.from_values(raw_values.as_dict()).to_dict()
+    report['Tiempos de Recolección (s)'] = {name: round(t, 3) for name, t in timings.items()}
+    report['Tiempos de Recolección (s)']['Total'] = round(time.perf_counter() - start, 3)
     
+    # Diferencias con la revisión anterior del mismo equipo
+    if store is not None:
+        try:
+            with tracer.span('Guardar revisión', 'historial'):
+                if previous:
+                    report['Cambios desde la última revisión'] = diff_reports(previous, report)
+                store.save(machine, hostname, report, section_cache.fingerprints)
+        except Exception as e:
+            print(f"\nError al usar el historial: {str(e)}")
+        finally:
+            store.close()
+    # Al final, para incluir también la lectura y escritura del historial
+    report['_diagnostics'] = tracer.summary()
+    return report
 
-    # Mostrar resumen en pantalla
-    print(f"\n{Fore.YELLOW}=== RESUMEN ==={Style.RESET_ALL}")
-    # BIOS
+def _print_bios_summary(bios_info):
     print(f"\n{Fore.CYAN}BIOS 🧬:{Style.RESET_ALL}")
-    bios_info = report['BIOS']
     print(f"  {Fore.CYAN}Fabricante:{Style.RESET_ALL} {bios_info.get('Fabricante', 'N/A')}")
     print(f"  {Fore.CYAN}Versión:{Style.RESET_ALL} {bios_info.get('Versión', 'N/A')}")
     print(f"  {Fore.CYAN}Estado:{Style.RESET_ALL} {bios_info.get('Estado_Verificacion', 'N/A')}")
     print(f"  {Fore.CYAN}Secure Boot:{Style.RESET_ALL} {bios_info.get('SecureBoot', 'N/A')}")
 
+def _print_general_summary(info):
     # Sistema operativo
     print ("")
-    print(f"{Fore.CYAN}Sistema Operativo 🖥️ :{Style.RESET_ALL} {report['Información General'].get('Sistema Operativo', 'N/A')}")
+    print(f"{Fore.CYAN}Sistema Operativo 🖥️ :{Style.RESET_ALL} {info.get('Sistema Operativo', 'N/A')}")
     
     # Procesador
-    cpu_info = report['Información General'].get('Procesador', {})
+    cpu_info = info.get('Procesador', {})
     print(f"\n{Fore.CYAN}Procesador 🧠 :{Style.RESET_ALL} {cpu_info.get('Modelo', 'N/A')}")
     print(f"{Fore.CYAN}Núcleos:{Style.RESET_ALL} {cpu_info.get('Núcleos Físicos', 'N/A')} físicos, {cpu_info.get('Núcleos Lógicos', 'N/A')} lógicos")
     
     # Memoria RAM
-    ram_info = report['Información General'].get('Memoria RAM', {})
+    ram_info = info.get('Memoria RAM', {})
     print(f"\n{Fore.CYAN}Memoria RAM 💾:{Style.RESET_ALL}")
     print(f"  {Fore.CYAN}Total:{Style.RESET_ALL} {ram_info.get('Total', 'N/A')}")
     print(f"  {Fore.CYAN}Disponible:{Style.RESET_ALL} {ram_info.get('Disponible', 'N/A')}")
     print(f"  {Fore.CYAN}En uso:{Style.RESET_ALL} {ram_info.get('En uso', 'N/A')} ({ram_info.get('Porcentaje en uso', 'N/A')})")
     
     # Batería
-    battery_info = report['Información General'].get('Batería', {})
+    battery_info = info.get('Batería', {})
     if battery_info:
         print(f"\n{Fore.CYAN}Batería 🗃️:{Style.RESET_ALL}")
         print(f"  {Fore.CYAN}Nivel:{Style.RESET_ALL} {battery_info.get('Porcentaje', 'N/A')}")
@@ -554,9 +883,10 @@ def main():
             print(f"  {Fore.CYAN}Tiempo restante:{Style.RESET_ALL} {battery_info['Tiempo estimado']}")
         if 'Consumo estimado' in battery_info:
             print(f"  {Fore.CYAN}Consumo:{Style.RESET_ALL} {battery_info['Consumo estimado']}")
-    
+
+def _print_ports_summary(ports):
     # Puertos USB
-    usb_info = report['Puertos'].get('Puertos USB', {})
+    usb_info = ports.get('Puertos USB', {})
     print(f"\n{Fore.CYAN}Puertos USB 🔌:{Style.RESET_ALL}")
     print(f"  {Fore.CYAN}Total detectados:{Style.RESET_ALL} {usb_info.get('Total detectados', 'N/A')}")
     for i, device in enumerate(usb_info.get('Dispositivos', [])[:3], 1):
@@ -564,7 +894,7 @@ def main():
         print(f"    {Fore.CYAN}Estado:{Style.RESET_ALL} {device.get('Status', 'N/A')}")
 
     # Puertos audio 
-    jack_info = report['Puertos'].get('Jack_Auriculares', {})
+    jack_info = ports.get('Jack_Auriculares', {})
     print(f"\n{Fore.CYAN}Puerto Auriculares 🎧:{Style.RESET_ALL}")
     print(f"  {Fore.CYAN}Estado:{Style.RESET_ALL} {jack_info.get('Estado', 'N/A')}")
     print(f"  {Fore.CYAN}Detectado:{Style.RESET_ALL} {jack_info.get('Detectado_Logicamente', 'N/A')}")
@@ -572,60 +902,529 @@ def main():
         print(f"  {Fore.CYAN}Prueba de sonido:{Style.RESET_ALL} {jack_info['Prueba_Sonido']}")
     
     # Bluetooth y WiFi
-    print(f"\n{Fore.CYAN}Bluetooth 🛰️:{Style.RESET_ALL} {report['Puertos'].get('Bluetooth', {}).get('Estado', 'N/A')}")
-    print(f"{Fore.CYAN}WiFi 🌐:{Style.RESET_ALL} {report['Puertos'].get('WiFi', {}).get('Estado', 'N/A')}")
-    
-    # Estado de salud
-    health_info = report['Estado de Salud']
+    print(f"\n{Fore.CYAN}Bluetooth 🛰️:{Style.RESET_ALL} {ports.get('Bluetooth', {}).get('Estado', 'N/A')}")
+    print(f"{Fore.CYAN}WiFi 🌐:{Style.RESET_ALL} {ports.get('WiFi', {}).get('Estado', 'N/A')}")
+
+def _print_health_summary(health_info):
     print(f"\n{Fore.CYAN}Estado de salud 🧪:{Style.RESET_ALL}")
     print(f"  {Fore.CYAN}Uso de CPU:{Style.RESET_ALL} {health_info.get('CPU', {}).get('Uso total', 'N/A')}")
     if 'Discos' in health_info and health_info['Discos']:
         print(f"  {Fore.CYAN}Uso de disco principal:{Style.RESET_ALL} {health_info['Discos'][0].get('Uso', 'N/A')}")
+
+# Sección del reporte -> (tipo esperado, función que la resume), en el orden del resumen
+SUMMARY_PRINTERS = {
+    'BIOS': (dict, _print_bios_summary),
+    'Información General': (dict, _print_general_summary),
+    'Puertos': (dict, _print_ports_summary),
+    'Estado de Salud': (dict, _print_health_summary),
+    'Rendimiento de Discos': (list, print_disk_results),
+    'Prueba de Núcleos': (dict, print_cpu_stress),
+    'Prueba de Memoria RAM': (dict, print_memory_test),
+}
+
+def print_section_summary(name, section):
+    """Resumen de una sola sección (nada si la sección no tiene resumen)"""
+    kind, printer = SUMMARY_PRINTERS.get(name, (None, None))
+    if printer is not None and isinstance(section, kind):
+        printer(section)
+
+def print_section_arrival(name, section, elapsed):
+    """Aviso y resumen de una sección apenas termina su recolector"""
+    failed = isinstance(section, dict) and 'Error' in section
+    mark = f"{Fore.RED}✗" if failed else f"{Fore.GREEN}✓"
+    print(f"\n{mark} {name}{Style.RESET_ALL} ({elapsed:.1f} s)"
+          + (f": {section['Error']}" if failed else ''), flush=True)
+    if not failed:
+        print_section_summary(name, section)
+
+def print_changes_summary(report):
+    if 'Cambios desde la última revisión' in report:
+        changes = report['Cambios desde la última revisión']
+        print(f"\n{Fore.CYAN}Cambios desde la última revisión 🔁:{Style.RESET_ALL} "
+              f"{len(changes) if isinstance(changes, list) else changes.get('Error')}")
+        for change in (changes if isinstance(changes, list) else [])[:10]:
+            print(f"  {Fore.CYAN}{change['Ruta']}:{Style.RESET_ALL} {change['Antes']} → {change['Después']}")
+    if section_cache.reused:
+        print(f"  {Fore.CYAN}Reutilizado del historial:{Style.RESET_ALL} {', '.join(section_cache.reused)}")
+
+def print_summary(report):
+    """Muestra en pantalla el resumen del reporte"""
+    print(f"\n{Fore.YELLOW}=== RESUMEN ==={Style.RESET_ALL}")
+    for name in SUMMARY_PRINTERS:
+        print_section_summary(name, report.get(name))
     
-    # Guardar reporte completo
-    save_to_file(report)
+    # Cambios
+    print_changes_summary(report)
     
+
+def print_recommendations():
     print(f"\n{Fore.YELLOW}=== RECOMENDACIONES ==={Style.RESET_ALL}")
     print(f"{Fore.GREEN}1. Verificar físicamente todos los puertos USB conectando dispositivos{Style.RESET_ALL}")
     print(f"{Fore.GREEN}2. Probar el puerto de audio con auriculares y micrófono{Style.RESET_ALL}")
     print(f"{Fore.GREEN}3. Conectar un monitor externo para probar HDMI{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}4. Verificar el estado de la batería (tiempo de duración real){Style.RESET_ALL}")
-    print(f"{Fore.GREEN}5. Probar conexiones Bluetooth y WiFi{Style.RESET_ALL}")
+    print(f"{Fore.GREEN}4. Verificar el estado de la batería (tiempo de duración real: python main.py test-battery){Style.RESET_ALL}")
+    print(f"{Fore.GREEN}5. Probar conexiones Bluetooth y WiFi (caudal y latencia: python main.py test-network){Style.RESET_ALL}")
     print(f"{Fore.GREEN}6. Revisar el estado físico del notebook (teclado, pantalla, bisagras){Style.RESET_ALL}")
-    print(f"{Fore.GREEN}7. Comprobar que no hay sectores dañados en los discos duros{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}8. Verificar que todos los núcleos del procesador funcionan correctamente{Style.RESET_ALL}")
+    print(f"{Fore.GREEN}7. Comprobar que no hay sectores dañados en los discos duros (python main.py test-disk){Style.RESET_ALL}")
+    print(f"{Fore.GREEN}8. Verificar que todos los núcleos del procesador funcionan correctamente (python main.py test-cpu){Style.RESET_ALL}")
 
-    # Después de mostrar el resumen inicial:
+def export_report_records(reports, basename, formats):
+    """Exporta los valores crudos de los reportes en los formatos compactos pedidos"""
+    if not formats:
+        return
+    try:
+        records = [NotebookRecord.from_values(r['_valores']) for r in reports if '_valores' in r]
+        for path in export_records(records, basename, formats):
+            print(f"Valores exportados en {path}")
+    except Exception as e:
+        print(f"\nError al exportar los valores: {str(e)}")
+
+def run_additional_tests(interactive=True):
+    """Pruebas de micrófono/sonido y cámara; devuelve los resultados para el reporte"""
     print(f"\n{Fore.YELLOW}=== PRUEBAS ADICIONALES ==={Style.RESET_ALL}")
     
     # Prueba de audio
-    input(f"\n{Fore.MAGENTA}Presione Enter para iniciar prueba de micrófono y sonido...{Style.RESET_ALL}")
-    audio_ok = prueba_microfono_sonido()
+    if interactive:
+        input(f"\n{Fore.MAGENTA}Presione Enter para iniciar prueba de micrófono y sonido...{Style.RESET_ALL}")
+    audio_ok, audio_info = prueba_microfono_sonido(interactive)
     
     # Prueba de cámara
-    input(f"\n{Fore.MAGENTA}Presione Enter para iniciar prueba de cámara...{Style.RESET_ALL}")
-    camara_ok = prueba_camara()
+    if interactive:
+        input(f"\n{Fore.MAGENTA}Presione Enter para iniciar prueba de cámara...{Style.RESET_ALL}")
+    camara_ok, camara_info = prueba_camara(interactive)
     
     # Resultados finales
     print(f"\n{Fore.YELLOW}=== RESULTADOS PRUEBAS ==={Style.RESET_ALL}")
     print(f"Micrófono/Sonido: {Fore.GREEN if audio_ok else Fore.RED}{'OK' if audio_ok else 'FALLÓ'}{Style.RESET_ALL}")
     print(f"Cámara: {Fore.GREEN if camara_ok else Fore.RED}{'OK' if camara_ok else 'FALLÓ'}{Style.RESET_ALL}")
+    return {
+        'Micrófono/Sonido': audio_info,
+        'Cámara': camara_info,
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Diagnóstico de hardware y software del equipo")
+    parser.add_argument('comando', nargs='?', choices=['collect', 'test-audio', 'test-camera', 'test-disk', 'test-cpu', 'test-ram',
+                                                    'test-battery', 'test-network', 'net-peer', 'monitor', 'index',
+                                                    'query', 'store', 'store-stats', 'restore'],
+                        help="collect: solo recolectar el reporte; test-audio / test-camera / test-disk / test-cpu / "
+                             "test-ram / test-battery / test-network: solo esa prueba; net-peer: par para test-network "
+                             "en otro equipo; monitor: métricas continuas por HTTP; index: indexar reportes guardados; "
+                             "query: consultar el índice de reportes; store: guardar reportes con secciones "
+                             "deduplicadas; store-stats: tamaños y deduplicación del almacén; restore: reconstruir "
+                             "un reporte del almacén. "
+                             "Sin comando se recolecta y luego se ofrecen las pruebas")
+    parser.add_argument('--software-completo', action='store_true',
+                        help="Incluir todo el software instalado en el reporte (no solo los primeros 20)")
+    parser.add_argument('--historial', default="notebook_snapshots.db",
+                        help="Base de datos con las revisiones anteriores (por defecto: %(default)s)")
+    parser.add_argument('--sin-historial', action='store_true',
+                        help="Recolectar todo desde cero y no guardar la revisión en el historial")
+    parser.add_argument('--exportar', nargs='+', choices=sorted(WRITERS), default=[], metavar='FORMATO',
+                        help=f"Exportar además los valores numéricos en formato compacto ({', '.join(sorted(WRITERS))})")
+    parser.add_argument('--prueba-disco', action='store_true',
+                        help="Incluir en el reporte el rendimiento y escaneo de superficie de los discos")
+    parser.add_argument('--tiempo-disco', type=float, default=20.0, metavar='SEGUNDOS',
+                        help="Presupuesto de tiempo de la prueba por partición (por defecto: %(default)s)")
+    parser.add_argument('--escanear', metavar='RUTA',
+                        help="Con test-disk, escanear además un dispositivo o archivo loop (p. ej. /dev/sda)")
+    parser.add_argument('--prueba-cpu', action='store_true',
+                        help="Incluir en el reporte la prueba de esfuerzo y verificación de cada núcleo")
+    parser.add_argument('--tiempo-cpu', type=float, default=10.0, metavar='SEGUNDOS',
+                        help="Duración de la prueba de núcleos (por defecto: %(default)s)")
+    parser.add_argument('--prueba-ram', action='store_true',
+                        help="Incluir en el reporte la prueba de integridad y ancho de banda de la RAM")
+    parser.add_argument('--tiempo-ram', type=float, default=30.0, metavar='SEGUNDOS',
+                        help="Tiempo máximo de la prueba de RAM (por defecto: %(default)s)")
+    parser.add_argument('--tiempo-bateria', type=float, default=600.0, metavar='SEGUNDOS',
+                        help="Duración de la sesión de batería (por defecto: %(default)s)")
+    parser.add_argument('--intervalo-bateria', type=float, default=10.0, metavar='SEGUNDOS',
+                        help="Intervalo entre muestras de la sesión de batería (por defecto: %(default)s)")
+    parser.add_argument('--carga-bateria', type=int, default=0, metavar='NÚCLEOS',
+                        help="Núcleos a cargar durante la sesión de batería (por defecto: sin carga)")
+    parser.add_argument('--red-par', metavar='[HOST:]PUERTO',
+                        help="Par de test-network (otro equipo con net-peer) o dirección de escucha de net-peer; "
+                             "sin él, test-network usa un par local que no mide el enlace físico")
+    parser.add_argument('--tiempo-red', type=float, default=6.0, metavar='SEGUNDOS',
+                        help="Duración de la prueba de red por interfaz (por defecto: %(default)s)")
+    parser.add_argument('--monitor-direccion', default="127.0.0.1:9101", metavar='[HOST:]PUERTO',
+                        help="Dirección del servidor de métricas del monitor (por defecto: %(default)s)")
+    parser.add_argument('--intervalo-monitor', type=float, default=1.0, metavar='SEGUNDOS',
+                        help="Intervalo de muestreo del monitor (por defecto: %(default)s)")
+    parser.add_argument('--historial-monitor', type=int, default=3600, metavar='MUESTRAS',
+                        help="Muestras que guarda el monitor por métrica (por defecto: %(default)s)")
+    parser.add_argument('--traza', metavar='ARCHIVO',
+                        help="Guardar los spans de la revisión como traza de Chrome (chrome://tracing, Perfetto)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Ejecutar la recolección bajo cProfile y mostrar las funciones más costosas")
+    parser.add_argument('--no-interactivo', action='store_true',
+                        help="No pedir confirmaciones; las pruebas de audio y cámara se omiten")
+    parser.add_argument('--auto-pruebas', action='store_true',
+                        help="Con --no-interactivo, ejecutar igualmente las pruebas de audio y cámara")
+    parser.add_argument('--agente', metavar='[HOST:]PUERTO',
+                        help="Atender peticiones de recolección de un coordinador de flota (por defecto en 127.0.0.1)")
+    parser.add_argument('--token-agente', default=os.environ.get('DIAGNOSTICO_TOKEN_AGENTE'), metavar='CLAVE',
+                        help="Clave compartida entre coordinador y agentes; obligatoria para que un agente "
+                             "escuche fuera de 127.0.0.1 (por defecto: variable DIAGNOSTICO_TOKEN_AGENTE)")
+    parser.add_argument('--flota', nargs='+', metavar='OBJETIVO',
+                        help="Diagnosticar varios equipos: 'local', 'host:puerto' de un agente o @archivo")
+    parser.add_argument('--agentes-locales', type=int, default=0, metavar='N',
+                        help="Lanzar N agentes locales como objetivos adicionales de la flota")
+    parser.add_argument('--concurrencia', type=int, default=8,
+                        help="Equipos diagnosticados en paralelo en modo flota (por defecto: %(default)s)")
+    parser.add_argument('--reporte-flota', default="fleet_report.json",
+                        help="Archivo del reporte agregado de la flota (por defecto: %(default)s)")
+    parser.add_argument('--indice', default="report_index.db",
+                        help="Base del índice de reportes de index y query (por defecto: %(default)s)")
+    parser.add_argument('--reportes', nargs='+', default=['.'], metavar='RUTA',
+                        help="Con index y store, archivos o carpetas con reportes JSON (por defecto: la carpeta actual)")
+    parser.add_argument('--procesos', type=int, metavar='N',
+                        help="Con index y store, procesos que interpretan los reportes (por defecto: uno por núcleo)")
+    parser.add_argument('--filtro', action='append', default=[], metavar='CAMPO<OP>VALOR',
+                        help="Con query, condición como battery_percent<60, secure_boot=false, "
+                             "ram_total_bytes>=8GB o cpu_model~i5 (se puede repetir)")
+    parser.add_argument('--cualquiera', action='store_true',
+                        help="Con query, combinar los filtros con O en lugar de Y")
+    parser.add_argument('--campos', nargs='+', metavar='CAMPO', help="Con query, columnas a mostrar")
+    parser.add_argument('--agregado', action='append', default=[], metavar='FUNCIÓN[:CAMPO]',
+                        help="Con query, count, avg:campo, min:campo, max:campo o sum:campo (se puede repetir)")
+    parser.add_argument('--agrupar', metavar='CAMPO', help="Con query y --agregado, agrupar por este campo")
+    parser.add_argument('--orden', metavar='[-]CAMPO', help="Con query, ordenar por este campo (- descendente)")
+    parser.add_argument('--limite', type=int, default=50,
+                        help="Con query, máximo de filas mostradas (por defecto: %(default)s; 0 = todas)")
+    parser.add_argument('--almacen', default="report_store.db",
+                        help="Base del almacén deduplicado de store, store-stats y restore (por defecto: %(default)s)")
+    parser.add_argument('--equipo', metavar='SERIE|HOST',
+                        help="Con restore, equipo cuya última revisión se reconstruye")
+    parser.add_argument('--revision', type=int, metavar='ID',
+                        help="Con restore, número de revisión a reconstruir (ver store-stats)")
+    parser.add_argument('--salida', default="restored_report.json", metavar='ARCHIVO',
+                        help="Con restore, archivo del reporte reconstruido (por defecto: %(default)s)")
+    args = parser.parse_args(argv)
+    args.interactivo = not (args.no_interactivo or args.agente or args.flota or args.agentes_locales
+                            or args.comando in ('monitor', 'net-peer', 'index', 'query', 'store', 'store-stats',
+                                                'restore'))
+    return args
+
+def run_disk_test(args):
+    """Comando test-disk: mide los discos y guarda el resultado aparte"""
+    results = check_disk_performance(args.tiempo_disco)
+    if args.escanear:
+        from disk_bench import surface_scan
+        try:
+            scan = surface_scan(args.escanear, time_budget=args.tiempo_disco)
+            problems = [f"{scan[k]} {k.lower()}" for k in ('Regiones ilegibles', 'Regiones lentas') if scan[k]]
+            results.append({'Disco': args.escanear, 'Escaneo de superficie': scan, 'Problemas': problems,
+                            'Resultado': 'OK' if not problems else 'FALLÓ'})
+        except Exception as e:
+            results.append({'Disco': args.escanear, 'Error': f"No se pudo escanear: {str(e)}"})
+    print_disk_results(results)
+    save_to_file({'Rendimiento de Discos': results}, "disk_report.json")
+    return results
+
+def run_monitor(args):
+    """Comando monitor: métricas continuas por HTTP hasta Ctrl+C"""
+    from monitor import serve_monitor
+    address = fleet.parse_address(args.monitor_direccion, default_port=9101)
+    monitor, server = serve_monitor(address, args.intervalo_monitor, args.historial_monitor)
+    host, port = server.server_address[:2]
+    print(f"===📈 MONITOREO CONTINUO (cada {args.intervalo_monitor:g} s) 📈===")
+    print(f"  Prometheus: http://{host}:{port}/metrics")
+    print(f"  JSON: http://{host}:{port}/json  Historial: http://{host}:{port}/historial")
+    print("  Ctrl+C para terminar")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nMonitoreo detenido")
+    finally:
+        server.server_close()
+        monitor.stop()
+
+def run_fleet_mode(args, software_limit, history_path, disk_budget=None, cpu_budget=None, ram_budget=None):
+    """Coordina la recolección de varios equipos y guarda el reporte agregado"""
+    targets = fleet.load_targets(args.flota or [])
+    agents = []
+    try:
+        for _ in range(args.agentes_locales):
+            proc, address = fleet.spawn_local_agent(['--sin-historial'])
+            agents.append(proc)
+            targets.append(address)
+        print(f"===🔧 DIAGNÓSTICO DE FLOTA: {len(targets)} equipos 🔧===")
+        transport_for = fleet.default_transports(lambda: collect_report(software_limit, history_path, disk_budget, cpu_budget, ram_budget),
+                                                 token=args.token_agente)
+        
+        def progress(entry):
+            status = f"{Fore.RED}FALLÓ: {entry['Error']}" if 'Error' in entry else f"{Fore.GREEN}OK"
+            print(f"  {entry['Equipo']}: {status}{Style.RESET_ALL} ({entry['Duración (s)']} s)")
+        
+        fleet_report = fleet.run_fleet(targets, transport_for, args.concurrencia, on_result=progress)
+    finally:
+        for proc in agents:
+            proc.terminate()
+    summary = fleet_report['Resumen']
+    print(f"\n{Fore.YELLOW}=== RESUMEN DE FLOTA ==={Style.RESET_ALL}")
+    for key, value in summary.items():
+        print(f"  {Fore.CYAN}{key}:{Style.RESET_ALL} {value}")
+    save_to_file(fleet_report, args.reporte_flota)
+    export_report_records([e['Reporte'] for e in fleet_report['Equipos'] if 'Reporte' in e],
+                          os.path.splitext(args.reporte_flota)[0], args.exportar)
+    return fleet_report
+
+def run_index_reports(args):
+    """Comando index: incorpora al índice los reportes nuevos o modificados"""
+    from report_index import ReportIndex
+    print(f"===🗂️ INDEXANDO REPORTES en {args.indice} 🗂️===")
+    index = ReportIndex(args.indice)
+    try:
+        stats = index.ingest(args.reportes, workers=args.procesos)
+    finally:
+        index.close()
+    for key, value in stats.items():
+        print(f"  {Fore.CYAN}{key}:{Style.RESET_ALL} {value}")
+    return stats
+
+def print_query_results(rows):
+    if not rows:
+        print("  Ningún reporte cumple los filtros")
+        return
+    names = list(rows[0])
+    def cell(value):
+        if isinstance(value, float):
+            return str(int(value)) if value.is_integer() else f"{value:.2f}"
+        return '' if value is None else str(value)
+    cells = [[cell(row[n]) for n in names] for row in rows]
+    widths = [max(len(n), *(len(c[i]) for c in cells)) for i, n in enumerate(names)]
+    print("  " + "  ".join(f"{Fore.CYAN}{n:<{w}}{Style.RESET_ALL}" for n, w in zip(names, widths)))
+    for row in cells:
+        print("  " + "  ".join(f"{c:<{w}}" for c, w in zip(row, widths)))
+
+def run_query_reports(args):
+    """Comando query: filtra y agrega los reportes del índice"""
+    from report_index import ReportIndex, parse_aggregate, parse_filter
+    try:
+        filters = [parse_filter(f) for f in args.filtro]
+        aggregates = [parse_aggregate(a) for a in args.agregado]
+    except ValueError as e:
+        print(f"{Fore.RED}{str(e)}{Style.RESET_ALL}")
+        return None
+    # Sin columnas pedidas se muestran las que identifican al equipo y las de los filtros
+    columns = args.campos or list(dict.fromkeys(['hostname', 'bios_serial', 'checked_at', *(f[0] for f in filters)]))
+    index = ReportIndex(args.indice)
+    try:
+        start = time.perf_counter()
+        rows = index.query(filters, args.cualquiera, columns, args.agrupar, aggregates, args.orden, args.limite)
+        elapsed = time.perf_counter() - start
+        total = index.count()
+    except ValueError as e:
+        print(f"{Fore.RED}{str(e)}{Style.RESET_ALL}")
+        return None
+    finally:
+        index.close()
+    print(f"===🔎 CONSULTA sobre {total} reportes ({elapsed * 1000:.1f} ms) 🔎===")
+    print_query_results(rows)
+    return rows
+
+def print_store_stats(stats):
+    for key, value in stats.items():
+        if key != 'Por sección':
+            print(f"  {Fore.CYAN}{key}:{Style.RESET_ALL} {value}")
+    if stats.get('Por sección'):
+        print()
+        print_query_results(stats['Por sección'])
+
+def run_store_reports(args):
+    """Comando store: guarda los reportes nuevos o modificados con sus secciones deduplicadas"""
+    from report_store import ReportStore
+    print(f"===📦 GUARDANDO REPORTES en {args.almacen} 📦===")
+    store = ReportStore(args.almacen)
+    try:
+        stats = store.ingest(args.reportes, workers=args.procesos)
+        for key, value in stats.items():
+            print(f"  {Fore.CYAN}{key}:{Style.RESET_ALL} {value}")
+        print()
+        print_store_stats(store.stats())
+    finally:
+        store.close()
+    return stats
+
+def run_store_stats(args):
+    """Comando store-stats: tamaños, deduplicación y últimas revisiones del almacén"""
+    from report_store import ReportStore
+    store = ReportStore(args.almacen)
+    try:
+        stats = store.stats()
+        revisions = store.revisions(args.equipo, limit=args.limite)
+    finally:
+        store.close()
+    print(f"===📦 ALMACÉN DE REPORTES {args.almacen} 📦===")
+    print_store_stats(stats)
+    print()
+    print_query_results(revisions)
+    return stats
+
+def run_restore_report(args):
+    """Comando restore: reconstruye un reporte del almacén en un archivo JSON"""
+    from report_store import ReportStore
+    store = ReportStore(args.almacen)
+    try:
+        revision = args.revision
+        if revision is None and args.equipo:
+            latest = store.revisions(args.equipo, limit=1)
+            revision = latest[0]['id'] if latest else None
+        if revision is None:
+            print(f"{Fore.RED}Indique --revision o un --equipo con revisiones guardadas{Style.RESET_ALL}")
+            return None
+        start = time.perf_counter()
+        report = store.load(revision)
+        elapsed = time.perf_counter() - start
+    finally:
+        store.close()
+    if report is None:
+        print(f"{Fore.RED}No existe la revisión {revision}{Style.RESET_ALL}")
+        return None
+    print(f"===📦 REVISIÓN {revision} RECONSTRUIDA ({elapsed * 1000:.1f} ms) 📦===")
+    save_to_file(report, args.salida)
+    return report
+
+def main(args=None):
+    if args is None:
+        args = parse_args()
+    software_limit = None if args.software_completo else 20
+    history_path = None if args.sin_historial else args.historial
+    disk_budget = args.tiempo_disco if args.prueba_disco else None
+    cpu_budget = args.tiempo_cpu if args.prueba_cpu else None
+    ram_budget = args.tiempo_ram if args.prueba_ram else None
+    
+    if args.agente:
+        try:
+            fleet.serve_agent(lambda: collect_report(software_limit, history_path, disk_budget, cpu_budget, ram_budget),
+                              args.agente, args.token_agente)
+        except ValueError as e:
+            print(f"{Fore.RED}{str(e)}{Style.RESET_ALL}")
+        return
+    if args.flota or args.agentes_locales:
+        run_fleet_mode(args, software_limit, history_path, disk_budget, cpu_budget, ram_budget)
+        return
+    if args.comando == 'test-audio':
+        prueba_microfono_sonido(args.interactivo)
+        return
+    if args.comando == 'test-camera':
+        prueba_camara(args.interactivo)
+        return
+    if args.comando == 'test-disk':
+        run_disk_test(args)
+        return
+    if args.comando == 'test-cpu':
+        result = check_cpu_stress(args.tiempo_cpu)
+        print_cpu_stress(result)
+        save_to_file({'Prueba de Núcleos': result}, "cpu_report.json")
+        return
+    if args.comando == 'monitor':
+        run_monitor(args)
+        return
+    if args.comando == 'test-battery':
+        run_battery_test(args)
+        return
+    if args.comando == 'test-network':
+        run_network_test(args)
+        return
+    if args.comando == 'net-peer':
+        run_network_peer(args)
+        return
+    if args.comando == 'index':
+        run_index_reports(args)
+        return
+    if args.comando == 'query':
+        run_query_reports(args)
+        return
+    if args.comando == 'store':
+        run_store_reports(args)
+        return
+    if args.comando == 'store-stats':
+        run_store_stats(args)
+        return
+    if args.comando == 'restore':
+        run_restore_report(args)
+        return
+    if args.comando == 'test-ram':
+        result = check_memory(args.tiempo_ram)
+        print_memory_test(result)
+        save_to_file({'Prueba de Memoria RAM': result}, "ram_report.json")
+        return
+    
+    if args.interactivo:
+        clear_screen()
+    print("===🔧 INICIANDO REVISIÓN DEL DISPOSITIVO 🔧===")
+    # Cada sección se muestra y se agrega al reporte en disco apenas termina su recolector
+    writer = ReportWriter("notebook_report.json")
+    if writer.recovered:
+        print(f"{Fore.YELLOW}Reporte incompleto de la ejecución anterior guardado en {writer.recovered}{Style.RESET_ALL}")
+
+    def on_section(name, section, elapsed):
+        writer.append(name, section)
+        print_section_arrival(name, section, elapsed)
+
+    try:
+        if args.profile:
+            profiler = Profiler()
+            report = profiler.run(collect_report, software_limit, history_path, disk_budget, cpu_budget, ram_budget,
+                                  profiler=profiler, on_section=on_section)
+        else:
+            report = collect_report(software_limit, history_path, disk_budget, cpu_budget, ram_budget,
+                                    on_section=on_section)
+    except KeyboardInterrupt:
+        expected = [c.name for c in build_collectors(software_limit, disk_budget, cpu_budget, ram_budget)]
+        try:
+            path = writer.abort('Interrumpida por el usuario', expected)
+            print(f"\n{Fore.YELLOW}Reporte parcial guardado en {path}{Style.RESET_ALL}")
+        except Exception as e:
+            print(f"\nError al guardar el reporte parcial: {str(e)}")
+        raise
+    if args.traza:
+        print(f"\nTraza guardada en: {tracer.write_chrome_trace(args.traza)}")
+    
+    # Las secciones ya se resumieron al llegar; faltan los cambios respecto del historial
+    print_changes_summary(report)
+    
+    # Guardar reporte completo
+    try:
+        writer.finalize(report)
+        print(f"\nReporte guardado en {writer.path}")
+    except Exception as e:
+        print(f"\nError al guardar el reporte: {str(e)}")
+    export_report_records([report], "notebook_report", args.exportar)
+    
+    print_recommendations()
+    if args.profile:
+        print(f"\n{Fore.YELLOW}=== FUNCIONES MÁS COSTOSAS (cProfile) ==={Style.RESET_ALL}")
+        profiler.print_stats(top=25, stream=sys.stdout)
+    
+    # Después de mostrar el resumen inicial:
+    if args.comando != 'collect' and (args.interactivo or args.auto_pruebas):
+        report['Pruebas Adicionales'] = run_additional_tests(args.interactivo)
+        save_to_file(report)
 
 if __name__ == "__main__":
+    # Los procesos de carga (cpu_stress) arrancan con spawn; en el ejecutable congelado lo necesitan
+    multiprocessing.freeze_support()
+    interactive = sys.stdin.isatty()
     try:
         if sys.stdout.encoding != 'UTF-8':
             sys.stdout.reconfigure(encoding='utf-8', errors='replace')
         if sys.stderr.encoding != 'UTF-8':
             sys.stderr.reconfigure(encoding='utf-8', errors='replace')
         
-        clear_screen()
-        main()
-        input(f"\n{Fore.GREEN}Presione Enter para salir...{Style.RESET_ALL}")
+        args = parse_args()
+        interactive = args.interactivo
+        main(args)
+        if interactive:
+            input(f"\n{Fore.GREEN}Presione Enter para salir...{Style.RESET_ALL}")
         
     except KeyboardInterrupt:
         print(f"\n{Fore.RED}Ejecución cancelada por el usuario{Style.RESET_ALL}")
         sys.exit(0)
     except Exception as e:
         print(f"\n{Fore.RED}Error crítico:{Style.RESET_ALL} {str(e)}", file=sys.stderr)
-        input("\nPresione Enter para salir...")
-        sys.exit(1)
\ No newline at end of file
+        if interactive:
+            input("\nPresione Enter para salir...")
+        sys.exit(1)
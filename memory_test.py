@@ -0,0 +1,202 @@
+"""Prueba de integridad y ancho de banda de la memoria RAM.
+
+Se reserva una fracción de la memoria disponible como matriz NumPy de
+palabras de 64 bits, repartida en tramos (uno por hilo; las operaciones
+vectorizadas de NumPy liberan el GIL y corren en paralelo). Sobre cada tramo
+se escriben y verifican, por bloques:
+
+* unos caminantes: la palabra ``i`` vale ``1 << ((i + k) % 64)``,
+* datos aleatorios con semilla (se regeneran para verificar),
+* dirección en dirección: cada palabra guarda su propio índice, y luego su
+  complemento.
+
+Se informan las direcciones con diferencias y el ancho de banda de
+escritura, lectura y copia en GB/s. La memoria usada y el tiempo tienen topes
+firmes, y la prueba se detiene si la memoria disponible baja del margen de
+reserva, para no empujar al equipo a usar el archivo de paginación.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import psutil
+
+GB = 1024 ** 3
+BLOCK_WORDS = 1 << 20  # 8 MiB por bloque
+MAX_REPORTED = 100
+
+
+class _Budget:
+    """Tope de tiempo y margen de memoria compartidos por todos los hilos"""
+
+    def __init__(self, time_budget, reserve_bytes, ps):
+        self.deadline = time.perf_counter() + time_budget
+        self.reserve = reserve_bytes
+        self._ps = ps
+        self.reason = None
+
+    def exhausted(self):
+        if self.reason:
+            return True
+        if time.perf_counter() >= self.deadline:
+            self.reason = 'tiempo'
+        elif self._ps.virtual_memory().available < self.reserve:
+            self.reason = 'memoria disponible baja'
+        return self.reason is not None
+
+
+def _walking_ones(start, count, k):
+    shifts = (np.arange(start, start + count, dtype=np.uint64) + np.uint64(k)) % np.uint64(64)
+    return np.left_shift(np.uint64(1), shifts)
+
+
+def _random(start, count, seed):
+    rng = np.random.default_rng((seed, start))
+    return rng.integers(0, np.iinfo(np.uint64).max, count, dtype=np.uint64, endpoint=True)
+
+
+def _address(start, count, invert):
+    words = np.arange(start, start + count, dtype=np.uint64)
+    return np.invert(words) if invert else words
+
+
+def _patterns(seed):
+    return [
+        ('Unos caminantes', lambda s, n: _walking_ones(s, n, 0)),
+        ('Unos caminantes (desplazados)', lambda s, n: _walking_ones(s, n, 32)),
+        ('Aleatorio con semilla', lambda s, n: _random(s, n, seed)),
+        ('Dirección en dirección', lambda s, n: _address(s, n, False)),
+        ('Dirección en dirección (complemento)', lambda s, n: _address(s, n, True)),
+    ]
+
+
+def _write_pattern(buffer, lo, hi, generate, budget):
+    """Escribe el patrón en ``buffer[lo:hi]``; devuelve los bloques escritos"""
+    written = []
+    for start in range(lo, hi, BLOCK_WORDS):
+        if budget.exhausted():
+            break
+        end = min(start + BLOCK_WORDS, hi)
+        buffer[start:end] = generate(start, end - start)
+        written.append((start, end))
+    return written
+
+
+def _verify_pattern(buffer, base, written, generate):
+    """Relee los bloques escritos; devuelve (palabras verificadas, diferencias, muestras)"""
+    checked = bad_count = 0
+    samples = []
+    for start, end in written:
+        expected = generate(start, end - start)
+        bad = np.flatnonzero(buffer[start:end] != expected)
+        checked += end - start
+        bad_count += len(bad)
+        for i in bad[:max(MAX_REPORTED - len(samples), 0)]:
+            samples.append({
+                'Dirección': hex(base + (start + int(i)) * 8),
+                'Esperado': hex(int(expected[i])),
+                'Leído': hex(int(buffer[start + int(i)])),
+            })
+    return checked, bad_count, samples
+
+
+def _bandwidth(buffer, slices, budget):
+    """Escritura, lectura y copia en paralelo sobre todo el búfer"""
+    def write(lo, hi):
+        for start in range(lo, hi, BLOCK_WORDS):
+            buffer[start:min(start + BLOCK_WORDS, hi)].fill(0x5A5A5A5A5A5A5A5A)
+        return (hi - lo) * 8
+
+    def read(lo, hi):
+        acc = np.uint64(0)
+        for start in range(lo, hi, BLOCK_WORDS):
+            acc ^= np.bitwise_xor.reduce(buffer[start:min(start + BLOCK_WORDS, hi)])
+        return (hi - lo) * 8
+
+    def copy(lo, hi):
+        # Mitad inferior del tramo sobre la superior; se cuentan lectura y escritura
+        half = (hi - lo) // 2
+        for start in range(lo, lo + half, BLOCK_WORDS):
+            end = min(start + BLOCK_WORDS, lo + half)
+            np.copyto(buffer[start + half:end + half], buffer[start:end])
+        return half * 8 * 2
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(slices)) as pool:
+        for name, op in (('Escritura (GB/s)', write), ('Lectura (GB/s)', read), ('Copia (GB/s)', copy)):
+            if budget.exhausted():
+                break
+            t0 = time.perf_counter()
+            moved = sum(pool.map(lambda s: op(*s), slices))
+            results[name] = round(moved / GB / (time.perf_counter() - t0), 2)
+    return results
+
+
+def run_memory_test(fraction=0.25, max_bytes=2 * GB, time_budget=30.0, workers=None, seed=0,
+                    reserve_bytes=None, psutil_module=None, after_write=None):
+    """Prueba ``fraction`` de la memoria disponible (sin superar ``max_bytes``).
+
+    ``after_write(buffer)`` se llama entre la escritura y la verificación de
+    cada patrón (permite simular fallas).
+    """
+    ps = psutil_module or psutil
+    mem = ps.virtual_memory()
+    # Margen que nunca se toca: 512 MB o el 10% de la memoria total
+    reserve = reserve_bytes if reserve_bytes is not None else max(512 * 1024 ** 2, mem.total // 10)
+    size = min(int(mem.available * fraction), max_bytes, mem.available - reserve)
+    workers = workers or ps.cpu_count() or 1
+    words = size // 8 // (workers * BLOCK_WORDS) * (workers * BLOCK_WORDS)
+    if words < BLOCK_WORDS * workers:
+        words = size // 8 // BLOCK_WORDS * BLOCK_WORDS
+        workers = max(min(workers, words // BLOCK_WORDS), 1)
+    if words < BLOCK_WORDS:
+        return {'Error': f"Memoria disponible insuficiente para la prueba ({round(mem.available / GB, 2)} GB)"}
+
+    budget = _Budget(time_budget, reserve, ps)
+    t0 = time.perf_counter()
+    buffer = np.empty(words, dtype=np.uint64)
+    base = buffer.ctypes.data
+    per_worker = words // workers
+    slices = [(i * per_worker, words if i == workers - 1 else (i + 1) * per_worker) for i in range(workers)]
+
+    # El ancho de banda va primero: es breve y además asigna las páginas del búfer
+    bandwidth = _bandwidth(buffer, slices, budget)
+    patterns = {}
+    mismatches = []
+    total_bad = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name, generate in _patterns(seed):
+            if budget.exhausted():
+                break
+            write = partial(_write_pattern, buffer, generate=generate, budget=budget)
+            written = list(pool.map(write, *zip(*slices)))
+            if after_write is not None:
+                after_write(buffer)
+            # Lo escrito se verifica aunque se acabe el tiempo
+            outcome = list(pool.map(partial(_verify_pattern, buffer, base, generate=generate), written))
+            bad = sum(b for _, b, _ in outcome)
+            total_bad += bad
+            for _, _, found in outcome:
+                mismatches.extend(found)
+            patterns[name] = {
+                'Cobertura (%)': round(sum(c for c, _, _ in outcome) / words * 100, 1),
+                'Diferencias': bad,
+            }
+
+    problems = []
+    if total_bad:
+        problems.append(f"{total_bad} palabras con diferencias: posible módulo de RAM defectuoso")
+    if budget.reason == 'memoria disponible baja':
+        problems.append("Prueba detenida: la memoria disponible bajó del margen de reserva")
+    return {
+        'Memoria probada': f"{round(words * 8 / GB, 2)} GB",
+        'Hilos': workers,
+        'Duración (s)': round(time.perf_counter() - t0, 2),
+        'Detenida por': budget.reason,
+        'Patrones': patterns,
+        **bandwidth,
+        'Direcciones con diferencias': mismatches[:MAX_REPORTED],
+        'Problemas': problems,
+        'Resultado': 'OK' if not problems else 'FALLÓ',
+    }
@@ -0,0 +1,255 @@
+"""Monitoreo continuo para pruebas de quemado (burn-in).
+
+Un hilo ejecuta a intervalo fijo solo los recolectores baratos de ``psutil``
+(CPU, frecuencia, temperaturas, memoria, E/S de disco, uso de disco, batería y
+red) y guarda cada métrica en un búfer circular de tamaño fijo respaldado por
+matrices NumPy.
+
+Después de cada muestra se vuelven a generar las respuestas (texto de
+Prometheus y JSON con los últimos valores), de modo que un ``scrape`` solo
+copia bytes ya listos y nunca dispara una recolección. El historial completo
+se genera al pedirlo y queda en caché hasta la siguiente muestra.
+
+Rutas del servidor HTTP local: ``/metrics`` (Prometheus), ``/json`` (últimos
+valores) e ``/historial`` (todas las series; ``?metrica=`` filtra por nombre).
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import psutil
+
+PREFIX = 'diagnostico_'
+
+
+class MetricRing:
+    """Últimas ``capacity`` muestras (tiempo, valor) de una métrica"""
+
+    def __init__(self, capacity):
+        self.times = np.full(capacity, np.nan)
+        self.values = np.full(capacity, np.nan)
+        self.next = 0
+        self.count = 0
+
+    def append(self, t, value):
+        self.times[self.next] = t
+        self.values[self.next] = value
+        self.next = (self.next + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+
+    def latest(self):
+        return self.values[self.next - 1] if self.count else np.nan
+
+    def series(self):
+        """Copias en orden cronológico"""
+        if self.count < len(self.values):
+            return self.times[:self.count].copy(), self.values[:self.count].copy()
+        return (np.concatenate((self.times[self.next:], self.times[:self.next])),
+                np.concatenate((self.values[self.next:], self.values[:self.next])))
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_value(value):
+    value = float(value)
+    return 'NaN' if value != value else repr(value)
+
+
+def _format_labels(labels):
+    return ','.join('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in labels)
+
+
+class MetricsCollector:
+    """Lecturas de ``psutil``; las de disco se toman cada ``slow_every`` muestras"""
+
+    def __init__(self, psutil_module=None, slow_every=30):
+        self._psutil = psutil_module or psutil
+        self.slow_every = slow_every
+        self._tick = 0
+        self._prev_disk = None
+        self._prev_net = None
+        self._prev_time = None
+        self._slow = []
+        self._psutil.cpu_percent(interval=None, percpu=True)
+
+    def collect(self):
+        """Devuelve una lista de (nombre, etiquetas, valor)"""
+        ps = self._psutil
+        now = time.monotonic()
+        out = []
+        for core, value in enumerate(ps.cpu_percent(interval=None, percpu=True)):
+            out.append(('cpu_uso_porcentaje', {'nucleo': str(core)}, value))
+        freq = ps.cpu_freq()
+        if freq:
+            out.append(('cpu_freq_mhz', {}, freq.current))
+        if hasattr(ps, 'sensors_temperatures'):
+            for sensor, entries in (ps.sensors_temperatures() or {}).items():
+                for i, entry in enumerate(entries):
+                    out.append(('temperatura_celsius', {'sensor': sensor, 'indice': entry.label or str(i)}, entry.current))
+        mem = ps.virtual_memory()
+        out.append(('memoria_usada_porcentaje', {}, mem.percent))
+        out.append(('memoria_disponible_bytes', {}, mem.available))
+
+        disk = ps.disk_io_counters()
+        net = ps.net_io_counters()
+        if self._prev_time is not None:
+            dt = now - self._prev_time
+            if disk and self._prev_disk:
+                out.append(('disco_lectura_bytes_por_segundo', {}, (disk.read_bytes - self._prev_disk.read_bytes) / dt))
+                out.append(('disco_escritura_bytes_por_segundo', {}, (disk.write_bytes - self._prev_disk.write_bytes) / dt))
+            if net and self._prev_net:
+                out.append(('red_recibidos_bytes_por_segundo', {}, (net.bytes_recv - self._prev_net.bytes_recv) / dt))
+                out.append(('red_enviados_bytes_por_segundo', {}, (net.bytes_sent - self._prev_net.bytes_sent) / dt))
+        self._prev_disk, self._prev_net, self._prev_time = disk, net, now
+
+        battery = ps.sensors_battery()
+        if battery:
+            out.append(('bateria_porcentaje', {}, battery.percent))
+            out.append(('bateria_cargador_conectado', {}, float(bool(battery.power_plugged))))
+
+        # El uso de disco cambia despacio y recorrer particiones es lo más caro
+        if self._tick % self.slow_every == 0:
+            self._slow = []
+            for partition in ps.disk_partitions():
+                try:
+                    usage = ps.disk_usage(partition.mountpoint)
+                except OSError:
+                    continue
+                self._slow.append(('disco_uso_porcentaje', {'disco': partition.device}, usage.percent))
+        out.extend(self._slow)
+        self._tick += 1
+        return out
+
+
+class Monitor:
+    """Recolecta en segundo plano y mantiene las respuestas HTTP prearmadas"""
+
+    def __init__(self, interval=1.0, capacity=3600, collector=None):
+        self.interval = interval
+        self.capacity = capacity
+        self.collector = collector or MetricsCollector()
+        self.rings = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._version = 0
+        self._rendered = {'metrics': b'', 'json': b'{}'}
+        self._history = (None, b'{}')
+        self._process = psutil.Process()
+        self._overhead = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        cpu_start, wall_start = sum(self._process.cpu_times()[:2]), time.monotonic()
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            self.sample()
+            # Uso de CPU propio desde el arranque, para vigilar el objetivo de < 1 %
+            wall = time.monotonic() - wall_start
+            if wall > 0:
+                self._overhead = (sum(self._process.cpu_times()[:2]) - cpu_start) / wall * 100
+            # Plazos absolutos: el intervalo no se desplaza con el tiempo de recolección
+            next_tick += self.interval
+            self._stop.wait(max(next_tick - time.monotonic(), 0))
+
+    def sample(self):
+        t = time.time()
+        readings = self.collector.collect()
+        if self._overhead is not None:
+            readings.append(('monitor_cpu_porcentaje', {}, self._overhead))
+        with self._lock:
+            for name, labels, value in readings:
+                key = _key(name, labels)
+                ring = self.rings.get(key)
+                if ring is None:
+                    ring = self.rings[key] = MetricRing(self.capacity)
+                ring.append(t, value)
+            self._version += 1
+            self._rendered = {'metrics': self._render_prometheus(), 'json': self._render_latest(t)}
+
+    def _render_prometheus(self):
+        lines = []
+        current = None
+        for (name, labels), ring in sorted(self.rings.items()):
+            if name != current:
+                lines.append(f"# TYPE {PREFIX}{name} gauge")
+                current = name
+            label_text = _format_labels(labels)
+            value = _format_value(ring.latest())
+            lines.append(f"{PREFIX}{name}{{{label_text}}} {value}" if label_text else f"{PREFIX}{name} {value}")
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    def _render_latest(self, t):
+        latest = [{'metrica': name, 'etiquetas': dict(labels), 'valor': float(ring.latest())}
+                  for (name, labels), ring in sorted(self.rings.items())]
+        return json.dumps({'tiempo': t, 'metricas': latest}, ensure_ascii=False).encode('utf-8')
+
+    def rendered(self, kind):
+        with self._lock:
+            return self._rendered[kind]
+
+    def history(self, metric=None):
+        """Series completas; se arma una vez por muestra y por filtro"""
+        with self._lock:
+            cache_key = (self._version, metric)
+            if self._history[0] == cache_key:
+                return self._history[1]
+            series = []
+            for (name, labels), ring in sorted(self.rings.items()):
+                if metric and name != metric:
+                    continue
+                times, values = ring.series()
+                series.append({'metrica': name, 'etiquetas': dict(labels),
+                               'tiempos': np.round(times, 3).tolist(), 'valores': values.tolist()})
+            body = json.dumps({'series': series}, ensure_ascii=False).encode('utf-8')
+            self._history = (cache_key, body)
+            return body
+
+
+def make_handler(monitor):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/metrics':
+                body, ctype = monitor.rendered('metrics'), 'text/plain; version=0.0.4; charset=utf-8'
+            elif url.path == '/json':
+                body, ctype = monitor.rendered('json'), 'application/json'
+            elif url.path == '/historial':
+                metric = parse_qs(url.query).get('metrica', [None])[0]
+                body, ctype = monitor.history(metric), 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', ctype)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve_monitor(address=('127.0.0.1', 9101), interval=1.0, capacity=3600, monitor=None):
+    """Arranca el monitor y el servidor HTTP; devuelve ambos (el servidor sin iniciar)"""
+    monitor = monitor or Monitor(interval, capacity)
+    monitor.start()
+    server = ThreadingHTTPServer(address, make_handler(monitor))
+    server.daemon_threads = True
+    return monitor, server
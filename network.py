@@ -0,0 +1,383 @@
+"""Interfaces de red: instantánea única y prueba activa de enlace.
+
+``NetworkSnapshot`` lee ``net_if_addrs``, ``net_if_stats`` y
+``net_io_counters(pernic=True)`` una sola vez por revisión; las secciones del
+reporte se arman a partir de esa instantánea en lugar de reconstruir la tabla
+de interfaces por cada dirección.
+
+``run_link_test`` mide, para cada interfaz activa con IPv4, el caudal de
+subida y de bajada (Mbps) y la latencia de ida y vuelta (percentiles) contra
+un par que atiende el protocolo de ``LinkPeer``:
+
+* ``E``: eco, devuelve cada byte recibido (latencia),
+* ``S``: sumidero, descarta lo recibido y al final informa cuántos bytes
+  llegaron (subida),
+* ``G``: generador, envía la cantidad de bytes pedida (bajada).
+
+``LinkPeer`` atiende todas las conexiones en un hilo con sockets no
+bloqueantes y ``selectors``, leyendo y enviando desde búferes fijos con
+``memoryview`` (sin copias por bloque). El cliente envía la subida con
+``socket.sendfile`` (``sendfile`` del sistema, sin copias en espacio de
+usuario, donde existe). El par puede ser otro equipo (``main.py net-peer``) o
+uno local en el propio proceso; en ese caso el tráfico no sale del equipo y
+la prueba mide la pila de red, no el enlace físico.
+"""
+import selectors
+import socket
+import struct
+import tempfile
+import threading
+import time
+
+import psutil
+
+HEADER = struct.Struct('>cQ')
+COUNT = struct.Struct('>Q')
+CHUNK = 256 * 1024
+PING_SIZE = 64
+
+
+class NetworkSnapshot:
+    """Tablas de interfaces de la revisión en curso, leídas una sola vez"""
+
+    def __init__(self, psutil_module=None):
+        self._psutil = psutil_module or psutil
+        self._lock = threading.Lock()
+        self._data = None
+
+    def _take(self):
+        with self._lock:
+            if self._data is None:
+                ps = self._psutil
+                self._data = (ps.net_if_addrs(), ps.net_if_stats(), ps.net_io_counters(pernic=True))
+            return self._data
+
+    def clear(self):
+        with self._lock:
+            self._data = None
+
+    def addresses(self):
+        """Una entrada por dirección IPv4 (sección ``Red``)"""
+        addrs, stats, _ = self._take()
+        return [{
+            'Interfaz': interface,
+            'Dirección IP': addr.address,
+            'Máscara de Red': addr.netmask,
+            'Estado': "Conectado" if interface in stats and stats[interface].isup else "Desconectado",
+        } for interface, entries in addrs.items() for addr in entries if addr.family == socket.AF_INET]
+
+    def interfaces(self):
+        """Estado, velocidad y contadores de cada interfaz"""
+        addrs, stats, counters = self._take()
+        result = []
+        for interface in sorted(set(addrs) | set(stats) | set(counters)):
+            entry = {'Interfaz': interface}
+            st = stats.get(interface)
+            if st is not None:
+                entry.update({
+                    'Estado': "Conectado" if st.isup else "Desconectado",
+                    'Velocidad (Mbps)': st.speed or None,
+                    'MTU': st.mtu,
+                    'Dúplex': {psutil.NIC_DUPLEX_FULL: 'Completo', psutil.NIC_DUPLEX_HALF: 'Medio'}.get(st.duplex, 'Desconocido'),
+                })
+            entry['Direcciones'] = [a.address for a in addrs.get(interface, ())
+                                    if a.family in (socket.AF_INET, socket.AF_INET6)]
+            io = counters.get(interface)
+            if io is not None:
+                entry.update({
+                    'Bytes enviados': io.bytes_sent,
+                    'Bytes recibidos': io.bytes_recv,
+                    'Errores (entrada/salida)': [io.errin, io.errout],
+                    'Descartados (entrada/salida)': [io.dropin, io.dropout],
+                })
+            result.append(entry)
+        return result
+
+
+class _Connection:
+    __slots__ = ('sock', 'header', 'mode', 'received', 'remaining', 'out')
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.header = b''
+        self.mode = None
+        self.received = 0
+        self.remaining = 0
+        self.out = b''
+
+
+class LinkPeer:
+    """Par de eco, sumidero y generador para ``run_link_test``"""
+
+    def __init__(self, address=('127.0.0.1', 0), chunk=CHUNK):
+        self._listener = socket.create_server(address, reuse_port=False)
+        self._listener.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        # Búferes fijos: se recibe y se envía siempre sobre las mismas vistas
+        self._recv_view = memoryview(bytearray(chunk))
+        self._send_view = memoryview(bytes(chunk))
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def address(self):
+        return self._listener.getsockname()[:2]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="link-peer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self):
+        try:
+            while not self._stop.is_set():
+                for key, events in self._selector.select(timeout=0.2):
+                    if key.fileobj is self._listener:
+                        self._accept()
+                        continue
+                    conn = key.data
+                    try:
+                        if events & selectors.EVENT_READ:
+                            self._read(conn)
+                        if events & selectors.EVENT_WRITE and conn.sock.fileno() != -1:
+                            self._write(conn)
+                    except BlockingIOError:
+                        pass
+                    except OSError:
+                        self._close(conn)
+        finally:
+            for key in list(self._selector.get_map().values()):
+                key.fileobj.close()
+            self._selector.close()
+
+    def _accept(self):
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._selector.register(sock, selectors.EVENT_READ, _Connection(sock))
+
+    def _close(self, conn):
+        if conn.sock.fileno() != -1:
+            self._selector.unregister(conn.sock)
+            conn.sock.close()
+
+    def _want_write(self, conn, write):
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if write else 0)
+        self._selector.modify(conn.sock, events, conn)
+
+    def _read(self, conn):
+        n = conn.sock.recv_into(self._recv_view)
+        if n == 0:
+            if conn.mode == b'S':
+                # Fin de la subida: se informa lo recibido y se cierra tras enviarlo
+                conn.out = COUNT.pack(conn.received)
+                conn.mode = b'X'
+                # Solo escritura: el fin de archivo seguiría marcando el socket como legible
+                self._selector.modify(conn.sock, selectors.EVENT_WRITE, conn)
+            else:
+                self._close(conn)
+            return
+        data = self._recv_view[:n]
+        if conn.mode is None:
+            need = HEADER.size - len(conn.header)
+            conn.header += bytes(data[:need])
+            if len(conn.header) < HEADER.size:
+                return
+            conn.mode, count = HEADER.unpack(conn.header)
+            data = data[need:]
+            if conn.mode == b'G':
+                conn.remaining = count
+                self._want_write(conn, True)
+        if conn.mode == b'E' and len(data):
+            conn.out += bytes(data)
+            self._want_write(conn, True)
+        elif conn.mode == b'S':
+            conn.received += len(data)
+
+    def _write(self, conn):
+        if conn.out:
+            sent = conn.sock.send(conn.out)
+            conn.out = conn.out[sent:]
+            if not conn.out:
+                if conn.mode == b'X':
+                    self._close(conn)
+                else:
+                    self._want_write(conn, False)
+        elif conn.mode == b'G':
+            if conn.remaining <= 0:
+                conn.sock.shutdown(socket.SHUT_WR)
+                self._want_write(conn, False)
+                return
+            try:
+                sent = conn.sock.send(self._send_view[:min(conn.remaining, len(self._send_view))])
+            except BlockingIOError:
+                return
+            conn.remaining -= sent
+
+
+def _connect(peer, source, timeout):
+    sock = socket.create_connection(peer, timeout=timeout, source_address=(source, 0) if source else None)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _percentiles(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    pick = lambda q: round(ordered[min(int(q * len(ordered)), len(ordered) - 1)], 3)
+    return {'Mínimo': round(ordered[0], 3), 'p50': pick(0.5), 'p90': pick(0.9), 'p99': pick(0.99),
+            'Máximo': round(ordered[-1], 3)}
+
+
+def measure_rtt(peer, source=None, count=200, time_budget=2.0, timeout=1.0):
+    """Latencias (ms) de mensajes de ``PING_SIZE`` bytes con eco; devuelve (latencias, perdidos)"""
+    message = bytes(PING_SIZE)
+    view = memoryview(bytearray(PING_SIZE))
+    rtts = []
+    lost = 0
+    with _connect(peer, source, timeout) as sock:
+        sock.sendall(HEADER.pack(b'E', 0))
+        deadline = time.perf_counter() + time_budget
+        while len(rtts) + lost < count and time.perf_counter() < deadline:
+            start = time.perf_counter()
+            sock.sendall(message)
+            got = 0
+            try:
+                while got < PING_SIZE:
+                    n = sock.recv_into(view[got:])
+                    if n == 0:
+                        raise ConnectionError("El par cerró la conexión")
+                    got += n
+            except socket.timeout:
+                # La respuesta tardía desordenaría las siguientes: se corta la medición
+                lost += 1
+                break
+            rtts.append((time.perf_counter() - start) * 1000)
+    return rtts, lost
+
+
+def measure_upload(peer, source=None, time_budget=2.0, file_size=1024 * 1024, timeout=5.0):
+    """Mbps de subida: el archivo se envía con ``sendfile`` hasta agotar el tiempo"""
+    with tempfile.TemporaryFile() as f:
+        f.truncate(file_size)
+        with _connect(peer, source, timeout) as sock:
+            sock.sendall(HEADER.pack(b'S', 0))
+            start = time.perf_counter()
+            deadline = start + time_budget
+            while time.perf_counter() < deadline:
+                sock.sendfile(f, 0, file_size)
+            sock.shutdown(socket.SHUT_WR)
+            # El par informa cuánto llegó realmente; se espera su respuesta para contar todo
+            reply = b''
+            while len(reply) < COUNT.size:
+                chunk = sock.recv(COUNT.size - len(reply))
+                if not chunk:
+                    raise ConnectionError("El par no informó los bytes recibidos")
+                reply += chunk
+            elapsed = time.perf_counter() - start
+    received, = COUNT.unpack(reply)
+    return received * 8 / elapsed / 1e6, received
+
+
+def measure_download(peer, source=None, time_budget=2.0, max_bytes=1 << 40, timeout=5.0):
+    """Mbps de bajada: se pide un flujo al par y se corta al agotar el tiempo"""
+    view = memoryview(bytearray(CHUNK))
+    received = 0
+    with _connect(peer, source, timeout) as sock:
+        sock.sendall(HEADER.pack(b'G', max_bytes))
+        start = time.perf_counter()
+        deadline = start + time_budget
+        while time.perf_counter() < deadline:
+            n = sock.recv_into(view)
+            if n == 0:
+                break
+            received += n
+        elapsed = time.perf_counter() - start
+    return received * 8 / elapsed / 1e6, received
+
+
+def _targets(ps, peer):
+    """(interfaz, dirección IPv4) de las interfaces activas que pueden llegar al par"""
+    stats = ps.net_if_stats()
+    remote = peer is not None and not peer[0].startswith('127.')
+    for interface, addrs in ps.net_if_addrs().items():
+        if interface not in stats or not stats[interface].isup:
+            continue
+        for addr in addrs:
+            if addr.family != socket.AF_INET:
+                continue
+            # Con un par en otro equipo el lazo local no sirve
+            if remote and addr.address.startswith('127.'):
+                continue
+            yield interface, addr.address
+            break
+
+
+def _counter_delta(before, after):
+    if before is None or after is None:
+        return None, None
+    return ([after.errin - before.errin, after.errout - before.errout],
+            [after.dropin - before.dropin, after.dropout - before.dropout])
+
+
+def run_link_test(peer=None, time_budget=6.0, interfaces=None, psutil_module=None):
+    """Prueba cada interfaz contra ``peer`` (``(host, puerto)``) o contra un par local.
+
+    ``time_budget`` se reparte entre latencia, subida y bajada de cada
+    interfaz. Con el par local cada interfaz se prueba contra su propia
+    dirección: el par escucha solo en ella y únicamente durante su prueba.
+    """
+    ps = psutil_module or psutil
+    phase = time_budget / 3
+    results = []
+    for interface, address in _targets(ps, peer):
+        if interfaces and interface not in interfaces:
+            continue
+        local = LinkPeer((address, 0)).start() if peer is None else None
+        try:
+            target = local.address if local else peer
+            entry = {'Interfaz': interface, 'Dirección': address, 'Par': f"{target[0]}:{target[1]}"}
+            before = ps.net_io_counters(pernic=True).get(interface)
+            problems = []
+            try:
+                rtts, lost = measure_rtt(target, address, time_budget=phase)
+                entry['RTT (ms)'] = _percentiles(rtts)
+                entry['Mensajes sin respuesta'] = lost
+                if lost:
+                    problems.append("mensajes de eco sin respuesta")
+                up, sent = measure_upload(target, address, time_budget=phase)
+                entry['Subida (Mbps)'] = round(up, 1)
+                down, got = measure_download(target, address, time_budget=phase)
+                entry['Bajada (Mbps)'] = round(down, 1)
+                entry['Bytes transferidos'] = sent + got
+            except OSError as e:
+                entry['Error'] = f"No se pudo probar: {str(e)}"
+                problems.append("sin conexión con el par")
+            errors, drops = _counter_delta(before, ps.net_io_counters(pernic=True).get(interface))
+            entry['Errores durante la prueba (entrada/salida)'] = errors
+            entry['Descartados durante la prueba (entrada/salida)'] = drops
+            if errors and any(errors):
+                problems.append("errores de transmisión")
+            if drops and any(drops):
+                problems.append("paquetes descartados")
+            entry['Problemas'] = problems
+            entry['Resultado'] = 'OK' if not problems else 'FALLÓ'
+            results.append(entry)
+        finally:
+            if local is not None:
+                local.stop()
+    return {
+        'Par': 'local (no mide el enlace físico)' if peer is None else f"{peer[0]}:{peer[1]}",
+        'Interfaces': results,
+        'Resultado': 'OK' if results and all(r['Resultado'] == 'OK' for r in results) else 'FALLÓ',
+    }
@@ -0,0 +1,169 @@
+"""Backends de plataforma detrás de los recolectores del reporte.
+
+``get_system_info``, ``get_bios_info``, ``check_ports`` y
+``get_installed_software`` piden los datos del equipo a un backend en lugar
+de llamar directamente a WMI, al registro o a PowerShell. Un backend expone:
+
+* ``os_name()``, ``processor()``, ``gpus()``, ``bios()`` (filas con las
+  propiedades de las clases WMI correspondientes), ``secure_boot()``,
+  ``battery_capacity()`` (mWh), ``activation()`` y ``beep()``,
+* ``device_rows()``: filas de ``Win32_PnPEntity`` para ``device_inventory``,
+* ``wifi_adapters()``: filas de ``Win32_NetworkAdapter`` con
+  ``NetEnabled`` y ``NetConnectionStatus``,
+* ``iter_software()`` y ``top_software(n)``,
+* ``machine_id()``: identificador único del equipo para el historial
+  (``None`` si no hay uno confiable),
+* ``machine_fingerprint()``, ``gpu_fingerprint()`` y
+  ``software_fingerprint()`` para reutilizar secciones del historial
+  (``None`` sin identificador: la sección se recolecta siempre),
+* ``clear()`` al comenzar cada revisión.
+
+``WindowsBackend`` usa WMI, el registro y el host de PowerShell;
+``linux_backend.LinuxBackend`` lee sysfs y procfs. ``default_backend`` elige
+según el sistema.
+"""
+import platform
+import sys
+
+from device_inventory import query_devices
+from snapshot_store import combine_fingerprints, registry_fingerprint, usable_serial
+from software_inventory import UNINSTALL_KEYS, iter_installed_software, top_software
+from wmi_session import like
+
+BIOS_REGISTRY_KEY = r"HARDWARE\DESCRIPTION\System\BIOS"
+DISPLAY_CLASS_KEY = r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}"
+
+SECURE_BOOT_SCRIPT = "Confirm-SecureBootUEFI"
+# Producto de Windows con clave instalada; LicenseStatus es numérico y no depende del idioma
+ACTIVATION_SCRIPT = ("Get-CimInstance SoftwareLicensingProduct -Filter \"ApplicationID='55c92734-d682-4d71-983e-d6ec3f16059f' "
+                     "AND PartialProductKey IS NOT NULL\" | Select-Object Name, Description, LicenseStatus")
+LICENSE_STATUS = {
+    0: 'Sin licencia',
+    1: 'Con licencia',
+    2: 'Período de gracia inicial',
+    3: 'Período de gracia adicional',
+    4: 'Período de gracia por copia no original',
+    5: 'Notificación',
+    6: 'Período de gracia extendido',
+}
+
+PROCESSOR_COLUMNS = ["Name", "NumberOfCores", "NumberOfLogicalProcessors", "MaxClockSpeed"]
+GPU_COLUMNS = ["Name", "AdapterRAM", "CurrentHorizontalResolution", "CurrentVerticalResolution", "DriverVersion"]
+NETWORK_ADAPTER_COLUMNS = ["Name", "PNPDeviceID", "NetEnabled", "NetConnectionStatus"]
+WIFI_NAME_PATTERNS = ("%wireless%", "%wi-fi%", "%wifi%", "%wlan%", "%802.11%")
+# NetConnectionStatus 2: conectado (numérico, no depende del idioma)
+NET_CONNECTED = 2
+BIOS_COLUMNS = ["Manufacturer", "Name", "Version", "ReleaseDate", "SerialNumber", "SMBIOSBIOSVersion",
+                "SMBIOSMajorVersion", "SMBIOSMinorVersion", "Status"]
+
+
+class WindowsBackend:
+    """WMI, registro y PowerShell (el comportamiento original de la herramienta)"""
+
+    name = 'Windows'
+
+    def __init__(self, session, battery_session, powershell, tracer=None):
+        self.session = session
+        self.battery_session = battery_session
+        self.powershell = powershell
+        self.tracer = tracer
+
+    def clear(self):
+        self.session.clear()
+        self.battery_session.clear()
+
+    def os_name(self):
+        return f"{platform.system()} {platform.release()} {platform.version()}"
+
+    def processor(self):
+        return self.session.query("Win32_Processor", PROCESSOR_COLUMNS)[0]
+
+    def gpus(self):
+        return self.session.query("Win32_VideoController", GPU_COLUMNS)
+
+    def bios(self):
+        return self.session.query("Win32_BIOS", BIOS_COLUMNS)[0]
+
+    def secure_boot(self):
+        return self.powershell.run(SECURE_BOOT_SCRIPT) is True
+
+    def battery_capacity(self):
+        try:
+            design = self.battery_session.query("BatteryStaticData", ["DesignedCapacity"])
+            full = self.battery_session.query("BatteryFullChargedCapacity", ["FullChargedCapacity"])
+            return int(design[0]['DesignedCapacity']), int(full[0]['FullChargedCapacity'])
+        except Exception:
+            return None, None
+
+    def activation(self):
+        products = self.powershell.run(ACTIVATION_SCRIPT, timeout=30)
+        if isinstance(products, dict):
+            products = [products]
+        if not products:
+            return {'Estado': 'Sin clave de producto instalada'}
+        product = products[0]
+        return {
+            'Nombre': product.get('Name', 'N/A'),
+            'Descripción': product.get('Description', 'N/A'),
+            'Estado': LICENSE_STATUS.get(product.get('LicenseStatus'), f"Desconocido ({product.get('LicenseStatus')})"),
+        }
+
+    def beep(self, frequency, duration):
+        import winsound
+        winsound.Beep(frequency, duration)
+        return True
+
+    def device_rows(self):
+        return query_devices(self.session)
+
+    def wifi_adapters(self):
+        return self.session.query("Win32_NetworkAdapter", NETWORK_ADAPTER_COLUMNS,
+                                  like("Name", *WIFI_NAME_PATTERNS))
+
+    def iter_software(self):
+        return iter_installed_software()
+
+    def top_software(self, n):
+        return top_software(n)
+
+    def _registry_fingerprint(self, name, paths, **options):
+        if self.tracer is None:
+            return registry_fingerprint(paths, **options)
+        with self.tracer.span(name, 'registro'):
+            return registry_fingerprint(paths, **options)
+
+    def machine_id(self):
+        """Número de serie de ``Win32_BIOS`` (la consulta queda en la caché de la revisión)"""
+        return usable_serial(self.bios().get('SerialNumber'))
+
+    def machine_fingerprint(self):
+        """Huella del equipo: número de serie y valores de la BIOS publicados en el registro"""
+        machine = self.machine_id()
+        if machine is None:
+            return None
+        return combine_fingerprints(machine, self._registry_fingerprint('Huella BIOS', [BIOS_REGISTRY_KEY],
+                                                                        values=True, last_write=False))
+
+    def gpu_fingerprint(self):
+        """Cambia si se instala o actualiza un controlador de video"""
+        machine = self.machine_fingerprint()
+        if machine is None:
+            return None
+        return combine_fingerprints(machine,
+                                    self._registry_fingerprint('Huella video', [DISPLAY_CLASS_KEY], subkeys=True))
+
+    def software_fingerprint(self):
+        """Cambia si se instala, actualiza o desinstala un programa"""
+        machine = self.machine_fingerprint()
+        if machine is None:
+            return None
+        return combine_fingerprints(machine,
+                                    self._registry_fingerprint('Huella software', UNINSTALL_KEYS, subkeys=True))
+
+
+def default_backend(session, battery_session, powershell, tracer=None):
+    """``LinuxBackend`` en Linux; en cualquier otro sistema, ``WindowsBackend``"""
+    if sys.platform.startswith('linux'):
+        from linux_backend import LinuxBackend
+        return LinuxBackend()
+    return WindowsBackend(session, battery_session, powershell, tracer)
@@ -0,0 +1,232 @@
+"""Proceso de PowerShell persistente para las comprobaciones del sistema.
+
+Lanzar ``powershell`` o ``cscript`` por cada comprobación cuesta 1–3 s de
+arranque. ``PowerShellHost`` mantiene un único proceso abierto y le envía los
+comandos por stdin, uno por línea en JSON; el proceso responde cada uno con
+una línea JSON (``ConvertTo-Json``) precedida de un marcador, así que la
+salida suelta de los comandos se descarta.
+
+* Las respuestas son datos (booleanos, números, objetos), no texto traducido:
+  además el host corre con la cultura invariante, de modo que la salida no
+  depende del idioma de Windows.
+* ``batch`` envía varios comandos de una vez y lee las respuestas en orden.
+* Cada comando tiene un tiempo máximo; si se agota, o si el proceso termina
+  inesperadamente, se descarta el proceso y los comandos restantes se
+  reenvían a uno nuevo (hasta ``max_restarts`` reinicios dentro de
+  ``restart_window`` segundos, así un agente o monitor de larga duración no
+  pierde PowerShell para siempre por fallas aisladas).
+
+El comando que lanza el proceso es configurable: cualquier programa que hable
+el mismo protocolo sirve (``benchmarks/fake_powershell.py`` lo imita en Linux).
+"""
+import atexit
+import base64
+import collections
+import contextlib
+import json
+import queue
+import subprocess
+import threading
+import time
+
+MARKER = '##DIAG##'
+
+HOST_SCRIPT = r"""
+$ErrorActionPreference = 'Stop'
+$ProgressPreference = 'SilentlyContinue'
+[Threading.Thread]::CurrentThread.CurrentCulture = [Globalization.CultureInfo]::InvariantCulture
+[Threading.Thread]::CurrentThread.CurrentUICulture = [Globalization.CultureInfo]::InvariantCulture
+[Console]::InputEncoding = New-Object Text.UTF8Encoding $false
+[Console]::OutputEncoding = New-Object Text.UTF8Encoding $false
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    if (-not $line.Trim()) { continue }
+    $request = ConvertFrom-Json $line
+    $response = @{ id = $request.id }
+    try {
+        $out = @(& ([ScriptBlock]::Create($request.script)))
+        $response.ok = $true
+        $response.result = if ($out.Count -eq 0) { $null } elseif ($out.Count -eq 1) { $out[0] } else { $out }
+    } catch {
+        $response.ok = $false
+        $response.error = $_.Exception.Message
+        $response.type = $_.Exception.GetType().FullName
+    }
+    [Console]::Out.WriteLine('##DIAG##' + (ConvertTo-Json -InputObject $response -Depth 6 -Compress))
+    [Console]::Out.Flush()
+}
+"""
+
+
+def powershell_command(executable='powershell.exe'):
+    """Línea de comandos que arranca ``HOST_SCRIPT`` sin perfil ni ventana"""
+    encoded = base64.b64encode(HOST_SCRIPT.encode('utf-16-le')).decode('ascii')
+    return [executable, '-NoLogo', '-NoProfile', '-NonInteractive', '-ExecutionPolicy', 'Bypass',
+            '-EncodedCommand', encoded]
+
+
+class CommandError(RuntimeError):
+    """El comando falló dentro de PowerShell; ``type`` es el tipo .NET de la excepción"""
+
+    def __init__(self, message, type=None):
+        super().__init__(message)
+        self.type = type
+
+
+class HostError(RuntimeError):
+    """El proceso no respondió: no arrancó, terminó o se agotó el tiempo"""
+
+
+class PowerShellHost:
+    """Un proceso de PowerShell compartido; los comandos se atienden de a uno"""
+
+    def __init__(self, command=None, timeout=15.0, start_timeout=30.0, max_restarts=3, restart_window=600.0,
+                 tracer=None):
+        self.command = command or powershell_command()
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.tracer = tracer
+        self.starts = 0
+        # Momentos de los arranques dentro de la ventana de reinicios
+        self._recent_starts = collections.deque()
+        self.commands_run = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+        self._proc = None
+        self._responses = None
+        self._fresh = False
+        self._next_id = 0
+        self._unavailable = None
+        atexit.register(self.close)
+
+    def _start(self):
+        now = time.monotonic()
+        while self._recent_starts and now - self._recent_starts[0] > self.restart_window:
+            self._recent_starts.popleft()
+        if len(self._recent_starts) > self.max_restarts:
+            raise HostError(f"PowerShell se reinició {self.max_restarts} veces en {self.restart_window:g} s; "
+                            "no se vuelve a lanzar por ahora")
+        if self._unavailable:
+            raise HostError(self._unavailable)
+        try:
+            proc = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    stderr=subprocess.DEVNULL, encoding='utf-8', errors='replace', bufsize=1,
+                                    creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        except OSError as e:
+            # Sin PowerShell en el sistema no tiene sentido reintentar
+            self._unavailable = f"No se pudo iniciar PowerShell: {str(e)}"
+            raise HostError(self._unavailable)
+        self.starts += 1
+        self._recent_starts.append(now)
+        # Cola propia de cada proceso: las respuestas tardías de uno anterior no se mezclan
+        responses = queue.Queue()
+        threading.Thread(target=self._read_loop, args=(proc, responses), name="powershell-host",
+                         daemon=True).start()
+        self._proc, self._responses, self._fresh = proc, responses, True
+
+    @staticmethod
+    def _read_loop(proc, responses):
+        for line in proc.stdout:
+            if line.startswith(MARKER):
+                try:
+                    responses.put(json.loads(line[len(MARKER):]))
+                except ValueError:
+                    pass
+        responses.put(None)
+
+    def _discard(self):
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+    def _wait_for(self, request_id, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            response = self._responses.get(timeout=max(deadline - time.monotonic(), 0))
+            # Una respuesta con otro id es de un comando anterior ya dado por perdido
+            if response is None or response.get('id') == request_id:
+                return response
+
+    def batch(self, scripts, timeout=None):
+        """Ejecuta los comandos en orden y devuelve sus resultados.
+
+        Un comando fallido no interrumpe a los demás: en su posición queda la
+        excepción (``CommandError`` o ``HostError``) en lugar del resultado.
+        """
+        timeout = timeout or self.timeout
+        results = [None] * len(scripts)
+        pending = list(range(len(scripts)))
+        with self._lock, (self.tracer.span(f"PowerShell ({len(scripts)} comandos)", 'subproceso')
+                          if self.tracer else contextlib.nullcontext()) as span:
+            timeouts = self.timeouts
+            while pending:
+                pending = self._send(scripts, pending, results, timeout)
+            if span is not None:
+                span.set(comandos=len(scripts), procesos_lanzados=self.starts)
+                span.timeout = self.timeouts > timeouts
+        return results
+
+    def _send(self, scripts, pending, results, timeout):
+        """Envía los comandos pendientes; devuelve los que hay que reenviar"""
+        try:
+            if self._proc is None or self._proc.poll() is not None:
+                self._discard()
+                self._start()
+            requests = []
+            for i in pending:
+                self._next_id += 1
+                requests.append((self._next_id, i))
+            self._proc.stdin.write(''.join(json.dumps({'id': request_id, 'script': scripts[i]}) + '\n'
+                                           for request_id, i in requests))
+            self._proc.stdin.flush()
+        except (OSError, HostError) as e:
+            self._discard()
+            error = e if isinstance(e, HostError) else HostError(f"No se pudo comunicar con PowerShell: {str(e)}")
+            for i in pending:
+                results[i] = error
+            return []
+
+        for position, (request_id, i) in enumerate(requests):
+            # El primer comando de un proceso nuevo espera además su arranque
+            wait = timeout + (self.start_timeout if self._fresh else 0)
+            try:
+                response = self._wait_for(request_id, wait)
+            except queue.Empty:
+                self.timeouts += 1
+                results[i] = HostError(f"Tiempo de espera agotado ({timeout:g} s)")
+            else:
+                self._fresh = False
+                if response is not None:
+                    self.commands_run += 1
+                    results[i] = (response.get('result') if response.get('ok')
+                                  else CommandError(response.get('error') or "Error desconocido", response.get('type')))
+                    continue
+                results[i] = HostError("PowerShell terminó inesperadamente")
+            # Proceso colgado o caído: se descarta y los siguientes van a uno nuevo
+            self._discard()
+            return [j for _, j in requests[position + 1:]]
+        return []
+
+    def run(self, script, timeout=None):
+        """Ejecuta un comando y devuelve su resultado; lanza la excepción si falló"""
+        result = self.batch([script], timeout)[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def close(self):
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            # Al cerrar stdin el bucle del host termina por sí solo
+            proc.stdin.close()
+            proc.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait()
@@ -0,0 +1,73 @@
+"""Exportadores del reporte en formatos compactos.
+
+Complementan a ``notebook_report.json`` (legible para el técnico) con formatos
+pensados para ingesta masiva a partir de ``NotebookRecord``:
+
+* ``jsonl``: una línea JSON compacta por revisión.
+* ``npz``: columnar (una matriz NumPy por campo, comprimida), para agregar
+  miles de equipos de una vez.
+
+``WRITERS`` es el registro de formatos; cada escritor expone ``write(records,
+path)`` y ``load(path)``.
+"""
+import dataclasses
+import json
+from typing import Optional
+
+from report_schema import NotebookRecord
+
+
+class JsonLinesWriter:
+    extension = 'jsonl'
+
+    def write(self, records, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False, separators=(',', ':')))
+                f.write('\n')
+
+    def load(self, path):
+        with open(path, encoding='utf-8') as f:
+            return [NotebookRecord(**json.loads(line)) for line in f if line.strip()]
+
+
+class NpzWriter:
+    """Formato columnar con NumPy: números como float64 (NaN si falta), textos como str"""
+    extension = 'npz'
+
+    def write(self, records, path):
+        import numpy as np
+        columns = {}
+        for field in dataclasses.fields(NotebookRecord):
+            values = [getattr(r, field.name) for r in records]
+            if field.type == Optional[str]:
+                columns[field.name] = np.array(['' if v is None else v for v in values], dtype=str)
+            else:
+                columns[field.name] = np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, **columns)
+
+    def load(self, path):
+        """Devuelve las columnas como diccionario de matrices"""
+        import numpy as np
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+
+WRITERS = {
+    'jsonl': JsonLinesWriter(),
+    'npz': NpzWriter(),
+}
+
+
+def export_records(records, basename, formats):
+    """Escribe ``records`` en cada formato pedido; devuelve las rutas generadas"""
+    paths = []
+    for name in formats:
+        writer = WRITERS.get(name)
+        if writer is None:
+            raise ValueError(f"Formato de exportación desconocido: {name}")
+        path = f"{basename}.{writer.extension}"
+        writer.write(records, path)
+        paths.append(path)
+    return paths
@@ -0,0 +1,370 @@
+"""Índice local de reportes guardados para consultar la flota.
+
+``ReportIndex`` ingiere archivos ``notebook_report.json`` (y reportes de
+flota, con un reporte por equipo) en una base SQLite con una fila por
+revisión y los valores numéricos normalizados: los campos de
+``NotebookRecord`` (bytes, porcentajes, MHz, booleanos) más algunos derivados
+del estado de salud. Se toman de ``_valores`` cuando el reporte los trae y,
+para reportes anteriores, se interpretan los textos de las secciones
+``Procesador``, ``Memoria RAM``, ``Discos``, ``Batería``, ``BIOS`` y
+``Estado de Salud``.
+
+* La ingesta es incremental: un archivo con la misma fecha de modificación y
+  tamaño no se vuelve a leer, y uno tocado pero con el mismo contenido
+  (SHA-1) no se vuelve a interpretar.
+* Los archivos nuevos se interpretan en varios procesos; las filas se
+  escriben desde el proceso principal en una sola transacción.
+* Las consultas se traducen a SQL con parámetros sobre columnas indexadas,
+  así que responden en milisegundos aun con cientos de miles de reportes.
+"""
+import concurrent.futures
+import dataclasses
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+
+from report_schema import NotebookRecord
+
+RECORD_FIELDS = [f.name for f in dataclasses.fields(NotebookRecord)]
+# Derivados que no están en NotebookRecord
+EXTRA_FIELDS = ['disk_alerts', 'battery_wear_percent']
+FIELDS = RECORD_FIELDS + EXTRA_FIELDS
+TEXT_FIELDS = {f.name for f in dataclasses.fields(NotebookRecord) if f.type.__args__[0] is str}
+INDEXED_FIELDS = ('hostname', 'bios_serial', 'checked_at', 'cpu_model', 'ram_total_bytes', 'disk_max_percent',
+                  'battery_percent', 'battery_wear_percent', 'secure_boot', 'disk_alerts')
+
+OPERATORS = {'=': '=', '!=': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>=', '~': 'LIKE'}
+AGGREGATES = ('count', 'avg', 'min', 'max', 'sum')
+UNITS = {'kb': 1024, 'mb': 1024 ** 2, 'gb': 1024 ** 3, 'tb': 1024 ** 4}
+
+# Por debajo de esta cantidad de archivos lanzar procesos cuesta más que interpretarlos
+PARALLEL_MIN_FILES = 64
+
+_FILTER_RE = re.compile(r"^\s*(\w+)\s*(!=|<=|>=|=|<|>|~)\s*(.*?)\s*$")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+_SIZE_RE = re.compile(r"^(-?\d+(?:\.\d+)?)\s*([kmgt]b)$", re.IGNORECASE)
+
+
+def _number(text):
+    """Primer número de un texto del reporte ("16.0 GB", "43.8%", "2803 MHz")"""
+    if isinstance(text, bool):
+        return None
+    if isinstance(text, (int, float)):
+        return text
+    match = _NUMBER_RE.search(text) if isinstance(text, str) else None
+    return float(match.group()) if match else None
+
+
+def _gb(text):
+    value = _number(text)
+    return int(value * 1024 ** 3) if value is not None else None
+
+
+def _section(data, key):
+    value = data.get(key) if isinstance(data, dict) else None
+    return value if isinstance(value, (dict, list)) and 'Error' not in value else None
+
+
+def extract_record(report):
+    """Fila normalizada de un reporte: ``_valores`` primero y, si faltan, los textos"""
+    # vars() en lugar de asdict(): no hace falta la copia profunda de cada campo
+    values = dict(vars(NotebookRecord.from_values(report.get('_valores') or {})))
+
+    def fill(key, value):
+        if values.get(key) is None and value is not None:
+            values[key] = value
+
+    general = report.get('Información General') or {}
+    fill('hostname', general.get('Nombre del Host'))
+    fill('os', general.get('Sistema Operativo'))
+    fill('checked_at', report.get('Fecha de Revisión'))
+
+    cpu = _section(general, 'Procesador') or {}
+    fill('cpu_model', cpu.get('Modelo') if cpu.get('Modelo') != 'N/A' else None)
+    fill('cpu_physical_cores', _number(cpu.get('Núcleos Físicos')))
+    fill('cpu_logical_cores', _number(cpu.get('Núcleos Lógicos')))
+    fill('cpu_max_mhz', _number(cpu.get('Frecuencia Máxima')))
+
+    ram = _section(general, 'Memoria RAM') or {}
+    fill('ram_total_bytes', _gb(ram.get('Total')))
+    fill('ram_available_bytes', _gb(ram.get('Disponible')))
+    fill('ram_used_bytes', _gb(ram.get('En uso')))
+    fill('ram_percent', _number(ram.get('Porcentaje en uso')))
+
+    disks = [d for d in (_section(general, 'Discos') or []) if isinstance(d, dict) and 'Error' not in d]
+    if disks:
+        fill('disk_count', len(disks))
+        fill('disk_total_bytes', sum(_gb(d.get('Espacio Total')) or 0 for d in disks))
+        fill('disk_used_bytes', sum(_gb(d.get('Espacio Usado')) or 0 for d in disks))
+        fill('disk_max_percent', max((_number(d.get('Porcentaje Usado')) for d in disks
+                                      if _number(d.get('Porcentaje Usado')) is not None), default=None))
+
+    battery = _section(general, 'Batería') or {}
+    fill('battery_percent', _number(battery.get('Porcentaje')))
+    if battery.get('Estado') in ('Cargando', 'Descargando'):
+        fill('battery_plugged', battery['Estado'] == 'Cargando')
+    values['battery_wear_percent'] = _number(battery.get('Desgaste (%)'))
+
+    bios = _section(report, 'BIOS') or {}
+    fill('bios_serial', bios.get('Número de Serie') if bios.get('Número de Serie') != 'N/A' else None)
+    fill('bios_manufacturer', bios.get('Fabricante') if bios.get('Fabricante') != 'N/A' else None)
+    fill('bios_version', bios.get('Versión') if bios.get('Versión') != 'N/A' else None)
+    if bios.get('Estado') not in (None, 'N/A'):
+        fill('bios_ok', bios['Estado'] == 'OK')
+    if bios.get('SecureBoot') in ('Activado', 'Desactivado'):
+        fill('secure_boot', bios['SecureBoot'] == 'Activado')
+
+    health = report.get('Estado de Salud') or {}
+    fill('cpu_usage_percent', _number((_section(health, 'CPU') or {}).get('Uso total')))
+    temps = _section(health, 'Temperaturas') or {}
+    fill('cpu_temp_max_c', max((_number(s.get('Actual')) for sensors in temps.values() if isinstance(sensors, list)
+                                for s in sensors if _number(s.get('Actual')) is not None), default=None))
+    health_disks = _section(health, 'Discos')
+    values['disk_alerts'] = (sum(1 for d in health_disks if isinstance(d, dict) and d.get('Estado') == 'ALTO USO')
+                             if health_disks is not None else None)
+
+    for key in ('bios_ok', 'secure_boot', 'battery_plugged', 'bluetooth_available', 'wifi_available'):
+        if values.get(key) is not None:
+            values[key] = int(values[key])
+    return values
+
+
+def reports_in(data):
+    """Reportes de un archivo: uno (``notebook_report.json``) o varios (reporte de flota)"""
+    if isinstance(data, dict) and isinstance(data.get('Equipos'), list):
+        return [e['Reporte'] for e in data['Equipos'] if isinstance(e, dict) and isinstance(e.get('Reporte'), dict)]
+    if isinstance(data, dict) and ('Información General' in data or '_valores' in data):
+        return [data]
+    # Otros JSON (resultados de pruebas sueltas) no tienen datos del equipo
+    return []
+
+
+def parse_file(path, known_hash=None):
+    """Interpreta un archivo; corre en los procesos de la ingesta.
+
+    Devuelve ``(sha1, filas, error)``; ``filas`` es None si el contenido no
+    cambió respecto de ``known_hash``.
+    """
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError as e:
+        return None, [], f"No se pudo leer: {str(e)}"
+    digest = hashlib.sha1(content).hexdigest()
+    if digest == known_hash:
+        return digest, None, None
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        return digest, [], f"JSON inválido: {str(e)}"
+    try:
+        return digest, [extract_record(report) for report in reports_in(data)], None
+    except Exception as e:
+        return digest, [], f"No se pudo interpretar: {str(e)}"
+
+
+def _parse_chunk(tasks):
+    return [parse_file(path, known_hash) for path, known_hash in tasks]
+
+
+def iter_json_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in files:
+                    if name.endswith('.json'):
+                        yield os.path.abspath(os.path.join(root, name))
+        elif os.path.isfile(path):
+            yield os.path.abspath(path)
+
+
+def parse_filter(text):
+    """``"battery_percent<60"`` -> ``('battery_percent', '<', 60.0)``"""
+    match = _FILTER_RE.match(text)
+    if not match:
+        raise ValueError(f"Filtro inválido: {text!r} (se espera campo, operador y valor, p. ej. battery_percent<60)")
+    field, op, raw = match.groups()
+    return field, op, _parse_value(field, raw)
+
+
+def _parse_value(field, raw):
+    if field in TEXT_FIELDS:
+        return raw
+    lowered = raw.lower()
+    if lowered in ('true', 'sí', 'si', 'verdadero'):
+        return 1
+    if lowered in ('false', 'no', 'falso'):
+        return 0
+    if lowered in ('null', 'none', 'nulo'):
+        return None
+    size = _SIZE_RE.match(raw)
+    if size:
+        return float(size.group(1)) * UNITS[size.group(2).lower()]
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"Valor no numérico para {field}: {raw!r}")
+
+
+def _check_field(field):
+    if field not in FIELDS:
+        raise ValueError(f"Campo desconocido: {field} (disponibles: {', '.join(FIELDS)})")
+    return field
+
+
+def parse_aggregate(text):
+    """``"avg:battery_percent"`` -> ``('avg', 'battery_percent')``; ``"count"`` -> ``('count', None)``"""
+    func, _, field = text.partition(':')
+    func = func.lower()
+    if func not in AGGREGATES:
+        raise ValueError(f"Agregado desconocido: {func} (disponibles: {', '.join(AGGREGATES)})")
+    if func != 'count' and not field:
+        raise ValueError(f"El agregado {func} necesita un campo, p. ej. {func}:battery_percent")
+    return func, _check_field(field) if field else None
+
+
+class ReportIndex:
+    """Base SQLite con una fila por revisión ingerida"""
+
+    def __init__(self, path="report_index.db"):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = ', '.join(f"{name} {'TEXT' if name in TEXT_FIELDS else 'REAL'}" for name in FIELDS)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER,
+                    size INTEGER,
+                    sha1 TEXT,
+                    reports INTEGER,
+                    error TEXT
+                )""")
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS reports (id INTEGER PRIMARY KEY, path TEXT, {columns})")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_reports_path ON reports (path)")
+            for name in INDEXED_FIELDS:
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_reports_{name} ON reports ({name})")
+
+    def ingest(self, paths, workers=None, prune=True):
+        """Incorpora los ``.json`` de ``paths`` (archivos o carpetas); devuelve estadísticas.
+
+        Con ``prune`` se quitan del índice los archivos de las carpetas
+        recorridas que ya no existen.
+        """
+        start = time.perf_counter()
+        known = {row[0]: row[1:] for row in self._conn.execute("SELECT path, mtime_ns, size, sha1 FROM files")}
+        seen = set()
+        pending = []
+        for path in iter_json_files(paths):
+            seen.add(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            previous = known.get(path)
+            if previous is not None and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+                continue
+            pending.append((path, st.st_mtime_ns, st.st_size, previous[2] if previous else None))
+
+        results = self._parse(pending, workers)
+        stats = {'Archivos': len(seen), 'Sin cambios': len(seen) - len(pending), 'Contenido repetido': 0,
+                 'Interpretados': 0, 'Reportes agregados': 0, 'Errores': 0, 'Eliminados': 0}
+        touched, replaced, files, report_rows = [], [], [], []
+        for (path, mtime_ns, size, _), (digest, rows, error) in zip(pending, results):
+            if rows is None:
+                # Misma suma: solo cambió la fecha del archivo
+                stats['Contenido repetido'] += 1
+                touched.append((mtime_ns, size, path))
+                continue
+            stats['Interpretados'] += 1
+            stats['Errores'] += error is not None
+            stats['Reportes agregados'] += len(rows)
+            if path in known:
+                replaced.append((path,))
+            files.append((path, mtime_ns, size, digest, len(rows), error))
+            report_rows.extend((path, *(row.get(name) for name in FIELDS)) for row in rows)
+        placeholders = ', '.join('?' * (len(FIELDS) + 1))
+        with self._conn:
+            self._conn.executemany("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", touched)
+            self._conn.executemany("DELETE FROM reports WHERE path = ?", replaced)
+            self._conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", files)
+            self._conn.executemany(f"INSERT INTO reports (path, {', '.join(FIELDS)}) VALUES ({placeholders})",
+                                   report_rows)
+            if prune:
+                roots = [os.path.join(os.path.abspath(p), '') for p in paths if os.path.isdir(p)]
+                gone = [p for p in known if p not in seen and any(p.startswith(root) for root in roots)]
+                for path in gone:
+                    self._conn.execute("DELETE FROM reports WHERE path = ?", (path,))
+                    self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                stats['Eliminados'] = len(gone)
+        stats['Reportes en el índice'] = self.count()
+        stats['Tiempo (s)'] = round(time.perf_counter() - start, 3)
+        return stats
+
+    @staticmethod
+    def _parse(pending, workers):
+        tasks = [(path, known_hash) for path, _, _, known_hash in pending]
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(tasks) < PARALLEL_MIN_FILES:
+            return _parse_chunk(tasks)
+        # Bloques grandes: cada envío entre procesos lleva cientos de archivos
+        size = max(16, min(512, len(tasks) // (workers * 4) or 1))
+        chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            return [result for chunk in executor.map(_parse_chunk, chunks) for result in chunk]
+
+    def count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def query(self, filters=(), any_of=False, columns=None, group_by=None, aggregates=None, order_by=None,
+              limit=None):
+        """Filas que cumplen ``filters`` (tuplas ``(campo, operador, valor)``).
+
+        Los filtros se combinan con AND (con ``any_of``, con OR). Con
+        ``aggregates`` (tuplas ``(función, campo)``) se devuelven agregados,
+        por grupo si se indica ``group_by``. ``order_by`` admite ``-campo``
+        para orden descendente.
+        """
+        where, params = [], []
+        for field, op, value in filters:
+            _check_field(field)
+            if op not in OPERATORS:
+                raise ValueError(f"Operador desconocido: {op}")
+            if value is None:
+                where.append(f"{field} IS {'NOT ' if op == '!=' else ''}NULL")
+            elif op == '~':
+                where.append(f"{field} LIKE ?")
+                params.append(f"%{value}%")
+            else:
+                where.append(f"{field} {OPERATORS[op]} ?")
+                params.append(value)
+        if aggregates:
+            select = [_check_field(group_by)] if group_by else []
+            select += ["COUNT(*) AS count" if func == 'count' else f"{func.upper()}({field}) AS {func}_{field}"
+                       for func, field in aggregates]
+        else:
+            select = [_check_field(c) for c in columns] if columns else ['path'] + FIELDS
+        sql = f"SELECT {', '.join(select)} FROM reports"
+        if where:
+            sql += " WHERE " + (" OR " if any_of else " AND ").join(f"({w})" for w in where)
+        if aggregates and group_by:
+            sql += f" GROUP BY {group_by}"
+        if order_by:
+            descending = order_by.startswith('-')
+            name = order_by.lstrip('-')
+            if name not in select and name not in [s.rsplit(' AS ', 1)[-1] for s in select]:
+                _check_field(name)
+            sql += f" ORDER BY {name}{' DESC' if descending else ''}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        cursor = self._conn.execute(sql, params)
+        names = [d[0] for d in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def close(self):
+        self._conn.close()
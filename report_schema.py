@@ -0,0 +1,122 @@
+"""Esquema tipado del reporte con valores numéricos crudos.
+
+Las secciones de ``notebook_report.json`` son texto para el técnico ("12.5 GB",
+"43%"). Los recolectores registran además los valores crudos (bytes,
+porcentajes, MHz) en ``RawValues``; con ellos se construye un ``NotebookRecord``
+plano y tipado que se puede exportar sin volver a interpretar cadenas. El
+formato de presentación vive aparte, en las funciones ``format_*``.
+"""
+import dataclasses
+import threading
+from typing import Optional
+
+
+def format_gb(n_bytes):
+    """Bytes a texto en GB, como se muestra en el reporte"""
+    return f"{round(n_bytes / (1024**3), 2)} GB"
+
+
+def format_percent(value):
+    return f"{value}%"
+
+
+def format_mhz(value):
+    return f"{value:.1f} MHz"
+
+
+@dataclasses.dataclass
+class NotebookRecord:
+    """Una fila por revisión: valores crudos en unidades base"""
+    hostname: Optional[str] = None
+    checked_at: Optional[str] = None
+    os: Optional[str] = None
+    bios_serial: Optional[str] = None
+    bios_manufacturer: Optional[str] = None
+    bios_version: Optional[str] = None
+    bios_ok: Optional[bool] = None
+    secure_boot: Optional[bool] = None
+    cpu_model: Optional[str] = None
+    cpu_physical_cores: Optional[int] = None
+    cpu_logical_cores: Optional[int] = None
+    cpu_max_mhz: Optional[float] = None
+    cpu_usage_percent: Optional[float] = None
+    cpu_freq_mhz: Optional[float] = None
+    cpu_temp_max_c: Optional[float] = None
+    ram_total_bytes: Optional[int] = None
+    ram_available_bytes: Optional[int] = None
+    ram_used_bytes: Optional[int] = None
+    ram_percent: Optional[float] = None
+    disk_count: Optional[int] = None
+    disk_total_bytes: Optional[int] = None
+    disk_used_bytes: Optional[int] = None
+    disk_max_percent: Optional[float] = None
+    battery_percent: Optional[float] = None
+    battery_plugged: Optional[bool] = None
+    battery_secs_left: Optional[float] = None
+    gpu_count: Optional[int] = None
+    gpu_ram_bytes: Optional[int] = None
+    usb_devices: Optional[int] = None
+    bluetooth_available: Optional[bool] = None
+    wifi_available: Optional[bool] = None
+    uptime_seconds: Optional[float] = None
+
+    @classmethod
+    def from_values(cls, values):
+        """Construye el registro desde ``report['_valores']``, convirtiendo tipos"""
+        kwargs = {}
+        for field in dataclasses.fields(cls):
+            value = values.get(field.name)
+            if value is not None:
+                base = field.type.__args__[0] if hasattr(field.type, '__args__') else field.type
+                try:
+                    value = base(value)
+                except (TypeError, ValueError):
+                    value = None
+            kwargs[field.name] = value
+        return cls(**kwargs)
+
+    def to_dict(self):
+        return dataclasses.asdict(self)
+
+
+# Valores crudos que aporta cada sección reutilizable del historial
+RAW_KEYS_BY_SECTION = {
+    'Procesador': ('cpu_model', 'cpu_physical_cores', 'cpu_logical_cores', 'cpu_max_mhz'),
+    'GPU': ('gpu_count', 'gpu_ram_bytes'),
+    'BIOS': ('bios_serial', 'bios_manufacturer', 'bios_version'),
+}
+
+
+class RawValues:
+    """Valores crudos registrados por los recolectores durante una revisión"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def set(self, key, value):
+        # Los marcadores de WMI ('N/A', 'Error') no son valores
+        if value in ('N/A', 'Error'):
+            value = None
+        with self._lock:
+            self._values[key] = value
+
+    def update(self, **values):
+        for key, value in values.items():
+            self.set(key, value)
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._values)
+
+    def restore(self, previous, sections):
+        """Recupera los valores de secciones reutilizadas de la revisión anterior"""
+        with self._lock:
+            for section in sections:
+                for key in RAW_KEYS_BY_SECTION.get(section, ()):
+                    if key in previous:
+                        self._values.setdefault(key, previous[key])
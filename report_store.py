@@ -0,0 +1,376 @@
+"""Almacén de reportes con las secciones deduplicadas por contenido.
+
+Los equipos de la flota salen de unas pocas imágenes, así que secciones como
+``Software Instalado``, ``GPU``, ``BIOS`` o ``Procesador`` se repiten byte a
+byte en cientos de reportes. ``ReportStore`` guarda cada sección una sola
+vez:
+
+* cada sección se identifica por el SHA-1 de su forma canónica (JSON
+  compacto con las claves ordenadas); ``Información General`` y
+  ``Estado de Salud`` se guardan por partes (``Procesador``, ``GPU``,
+  ``Discos``...) para que lo estable no quede atado a lo que cambia en cada
+  revisión,
+* las secciones nuevas se guardan comprimidas con zlib, tal como aparecieron
+  la primera vez; los valores muy cortos (la fecha de revisión) van
+  directamente en el manifiesto,
+* cada revisión es un manifiesto del equipo (número de serie o, si no hay,
+  nombre del host) con el orden de las secciones y sus sumas,
+* cada sección cuenta sus referencias: al reingerir un archivo modificado se
+  liberan las que ya nadie usa.
+
+La ingesta es incremental como la de ``report_index`` (mismo archivo, misma
+fecha y tamaño: no se vuelve a leer) y solo comprime las secciones que la
+base no tiene. Para reconstruir un reporte se leen sus secciones en una sola
+consulta; las descomprimidas quedan en memoria, así que reconstruir muchas
+revisiones de la misma imagen descomprime cada sección común una sola vez.
+"""
+import concurrent.futures
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections import Counter, OrderedDict
+
+from report_index import PARALLEL_MIN_FILES, iter_json_files, reports_in
+
+# Secciones contenedoras que se guardan por partes
+SPLIT_SECTIONS = ('Información General', 'Estado de Salud')
+# Valores cuyo JSON ocupa menos que esto van en el manifiesto
+INLINE_MAX_BYTES = 64
+COMPRESSION_LEVEL = 6
+# Archivos por transacción durante la ingesta
+INGEST_BATCH = 500
+# Sumas por consulta IN (las versiones antiguas de SQLite admiten 999 parámetros)
+QUERY_CHUNK = 500
+# Secciones descomprimidas que se conservan entre reconstrucciones
+CACHE_SECTIONS = 4096
+
+
+def canonical(value):
+    """Forma canónica de una sección: JSON compacto con las claves ordenadas"""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def _entry(name, value, sections, label=None):
+    data = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if len(data) < INLINE_MAX_BYTES:
+        return {'n': name, 'v': value}, len(data)
+    # Las secciones sin diccionarios ya están en forma canónica
+    digest = hashlib.sha1(canonical(value) if isinstance(value, (dict, list)) else data).hexdigest()
+    sections.setdefault(digest, (label or name, data))
+    return {'n': name, 'h': digest}, len(data)
+
+
+def split_report(report):
+    """Manifiesto de un reporte y sus secciones: ``(entradas, {suma: (nombre, JSON)}, tamaño)``.
+
+    Las partes se registran como ``sección/parte``. Cada entrada del
+    manifiesto es ``{'n': nombre, 'h': suma}``, ``{'n': nombre, 'v': valor}``
+    si el valor va en el manifiesto o ``{'n': nombre, 'p': entradas}`` para
+    las secciones guardadas por partes. ``tamaño`` es el total en bytes de
+    las secciones en JSON compacto.
+    """
+    sections = {}
+    entries = []
+    size = 0
+    for name, value in report.items():
+        if name in SPLIT_SECTIONS and isinstance(value, dict):
+            parts = []
+            for part_name, part in value.items():
+                entry, n = _entry(part_name, part, sections, f"{name}/{part_name}")
+                parts.append(entry)
+                size += n
+            entries.append({'n': name, 'p': parts})
+        else:
+            entry, n = _entry(name, value, sections)
+            entries.append(entry)
+            size += n
+    return entries, sections, size
+
+
+def _hashes(entries):
+    for entry in entries:
+        if 'h' in entry:
+            yield entry['h']
+        elif 'p' in entry:
+            yield from _hashes(entry['p'])
+
+
+def describe(report):
+    """Equipo, nombre del host y fecha de una revisión"""
+    values = report.get('_valores') if isinstance(report.get('_valores'), dict) else {}
+    info = report.get('Información General') if isinstance(report.get('Información General'), dict) else {}
+    bios = report.get('BIOS') if isinstance(report.get('BIOS'), dict) else {}
+    hostname = values.get('hostname') or info.get('Nombre del Host')
+    serial = values.get('bios_serial') or bios.get('Número de Serie')
+    if not isinstance(serial, str) or serial.strip() in ('', 'N/A'):
+        serial = None
+    return {'machine': serial or hostname, 'hostname': hostname,
+            'checked_at': report.get('Fecha de Revisión') or values.get('checked_at')}
+
+
+def parse_file(path):
+    """Divide los reportes de un archivo; corre en los procesos de la ingesta.
+
+    Devuelve ``(reportes, error)`` con ``(descripción, entradas, secciones,
+    tamaño)`` por reporte.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = json.loads(f.read())
+    except OSError as e:
+        return [], f"No se pudo leer: {str(e)}"
+    except ValueError as e:
+        return [], f"JSON inválido: {str(e)}"
+    try:
+        return [(describe(report), *split_report(report)) for report in reports_in(data)], None
+    except Exception as e:
+        return [], f"No se pudo interpretar: {str(e)}"
+
+
+def _parse_chunk(paths):
+    return [parse_file(path) for path in paths]
+
+
+def _chunks(items, size):
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class ReportStore:
+    """Base SQLite con las secciones únicas y un manifiesto por revisión"""
+
+    def __init__(self, path="report_store.db"):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER,
+                    size INTEGER,
+                    reports INTEGER,
+                    error TEXT
+                )""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sections (
+                    hash TEXT PRIMARY KEY,
+                    name TEXT,
+                    size INTEGER,
+                    stored INTEGER,
+                    refs INTEGER,
+                    data BLOB
+                )""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS manifests (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT,
+                    machine TEXT,
+                    hostname TEXT,
+                    checked_at TEXT,
+                    size INTEGER,
+                    stored INTEGER,
+                    manifest BLOB
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_manifests_path ON manifests (path)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_manifests_machine ON manifests (machine, checked_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_manifests_hostname ON manifests (hostname)")
+        self._cache = OrderedDict()
+        self.decompressed = 0
+
+    # --- Ingesta -------------------------------------------------------------
+
+    def ingest(self, paths, workers=None):
+        """Incorpora los ``.json`` de ``paths`` (archivos o carpetas); devuelve estadísticas"""
+        start = time.perf_counter()
+        known = {row[0]: row[1:] for row in self._conn.execute("SELECT path, mtime_ns, size FROM files")}
+        total = 0
+        pending = []
+        for path in iter_json_files(paths):
+            total += 1
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            previous = known.get(path)
+            if previous is not None and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+                continue
+            pending.append((path, st.st_mtime_ns, st.st_size))
+
+        stats = {'Archivos': total, 'Sin cambios': total - len(pending), 'Reportes agregados': 0,
+                 'Secciones nuevas': 0, 'Secciones repetidas': 0, 'Secciones liberadas': 0, 'Errores': 0}
+        batch = []
+        for item, result in zip(pending, self._parse([path for path, _, _ in pending], workers)):
+            batch.append((item, result))
+            if len(batch) >= INGEST_BATCH:
+                self._store_batch(batch, known, stats)
+                batch = []
+        if batch:
+            self._store_batch(batch, known, stats)
+        stats['Reportes en el almacén'] = self.count()
+        stats['Tiempo (s)'] = round(time.perf_counter() - start, 3)
+        return stats
+
+    @staticmethod
+    def _parse(paths, workers):
+        """Resultados de ``parse_file`` en orden, a medida que terminan los procesos"""
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(paths) < PARALLEL_MIN_FILES:
+            yield from map(parse_file, paths)
+            return
+        size = max(16, min(256, len(paths) // (workers * 4) or 1))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in executor.map(_parse_chunk, _chunks(paths, size)):
+                yield from chunk
+
+    def _store_batch(self, batch, known, stats):
+        with self._conn:
+            # Primero se liberan las revisiones de los archivos que cambiaron
+            stats['Secciones liberadas'] += self._release([path for (path, _, _), _ in batch if path in known])
+
+            wanted = {digest for _, (reports, _) in batch for _, _, sections, _ in reports for digest in sections}
+            existing = set()
+            for chunk in _chunks(wanted, QUERY_CHUNK):
+                existing.update(row[0] for row in self._conn.execute(
+                    f"SELECT hash FROM sections WHERE hash IN ({', '.join('?' * len(chunk))})", chunk))
+
+            new_sections, manifests, files = {}, [], []
+            refs = Counter()
+            for (path, mtime_ns, size), (reports, error) in batch:
+                stats['Errores'] += error is not None
+                stats['Reportes agregados'] += len(reports)
+                files.append((path, mtime_ns, size, len(reports), error))
+                for meta, entries, sections, report_size in reports:
+                    for digest, (name, data) in sections.items():
+                        if digest in existing or digest in new_sections:
+                            stats['Secciones repetidas'] += 1
+                        else:
+                            stats['Secciones nuevas'] += 1
+                            compressed = zlib.compress(data, COMPRESSION_LEVEL)
+                            new_sections[digest] = (digest, name, len(data), len(compressed), 0, compressed)
+                    refs.update(_hashes(entries))
+                    manifest = zlib.compress(json.dumps(entries, ensure_ascii=False, separators=(',', ':'))
+                                             .encode('utf-8'), COMPRESSION_LEVEL)
+                    manifests.append((path, meta['machine'], meta['hostname'], meta['checked_at'], report_size,
+                                      len(manifest), manifest))
+
+            self._conn.executemany("INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?)", new_sections.values())
+            self._conn.executemany("UPDATE sections SET refs = refs + ? WHERE hash = ?",
+                                   [(count, digest) for digest, count in refs.items()])
+            self._conn.executemany("INSERT INTO manifests (path, machine, hostname, checked_at, size, stored, "
+                                   "manifest) VALUES (?, ?, ?, ?, ?, ?, ?)", manifests)
+            self._conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", files)
+
+    def _release(self, paths):
+        """Quita las revisiones de ``paths``; devuelve las secciones que quedaron sin uso"""
+        if not paths:
+            return 0
+        refs = Counter()
+        for path in paths:
+            for (blob,) in self._conn.execute("SELECT manifest FROM manifests WHERE path = ?", (path,)):
+                refs.update(_hashes(json.loads(zlib.decompress(blob))))
+            self._conn.execute("DELETE FROM manifests WHERE path = ?", (path,))
+        self._conn.executemany("UPDATE sections SET refs = refs - ? WHERE hash = ?",
+                               [(count, digest) for digest, count in refs.items()])
+        return self._conn.execute("DELETE FROM sections WHERE refs <= 0").rowcount
+
+    # --- Reconstrucción ------------------------------------------------------
+
+    def _sections(self, hashes):
+        """JSON descomprimido de cada suma, desde la caché o en una consulta por bloque"""
+        found = {}
+        missing = []
+        for digest in hashes:
+            data = self._cache.get(digest)
+            if data is None:
+                missing.append(digest)
+            else:
+                self._cache.move_to_end(digest)
+                found[digest] = data
+        for chunk in _chunks(missing, QUERY_CHUNK):
+            for digest, blob in self._conn.execute(
+                    f"SELECT hash, data FROM sections WHERE hash IN ({', '.join('?' * len(chunk))})", chunk):
+                data = zlib.decompress(blob)
+                self.decompressed += 1
+                found[digest] = self._cache[digest] = data
+        while len(self._cache) > CACHE_SECTIONS:
+            self._cache.popitem(last=False)
+        return found
+
+    def _build(self, entries, sections):
+        report = {}
+        for entry in entries:
+            if 'h' in entry:
+                report[entry['n']] = json.loads(sections[entry['h']])
+            elif 'p' in entry:
+                report[entry['n']] = self._build(entry['p'], sections)
+            else:
+                report[entry['n']] = entry['v']
+        return report
+
+    def load(self, revision):
+        """Reporte completo de una revisión (None si no existe)"""
+        row = self._conn.execute("SELECT manifest FROM manifests WHERE id = ?", (revision,)).fetchone()
+        if row is None:
+            return None
+        entries = json.loads(zlib.decompress(row[0]))
+        return self._build(entries, self._sections(set(_hashes(entries))))
+
+    def revisions(self, machine=None, limit=None):
+        """Revisiones guardadas, la más reciente primero; ``machine`` es la serie o el nombre del host"""
+        sql = "SELECT id, machine, hostname, checked_at, path FROM manifests"
+        params = []
+        if machine is not None:
+            sql += " WHERE machine = ? OR hostname = ?"
+            params += [machine, machine]
+        sql += " ORDER BY checked_at DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        names = ('id', 'machine', 'hostname', 'checked_at', 'path')
+        return [dict(zip(names, row)) for row in self._conn.execute(sql, params)]
+
+    def count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM manifests").fetchone()[0]
+
+    # --- Estadísticas --------------------------------------------------------
+
+    def stats(self):
+        """Tamaños y razones de deduplicación y compresión del almacén"""
+        reports, machines, logical, manifest_bytes = self._conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT machine), COALESCE(SUM(size), 0), COALESCE(SUM(stored), 0) "
+            "FROM manifests").fetchone()
+        unique, references, referenced_bytes, unique_bytes, section_bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(refs), 0), COALESCE(SUM(size * refs), 0), COALESCE(SUM(size), 0), "
+            "COALESCE(SUM(stored), 0) FROM sections").fetchone()
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        stored = section_bytes + manifest_bytes
+        mb = 1024 ** 2
+        by_name = [{'sección': name, 'referencias': refs, 'únicas': count,
+                    'lógico_kib': round(total / 1024), 'guardado_kib': round(packed / 1024),
+                    'deduplicación': round(total / size, 1) if size else None}
+                   for name, count, refs, total, size, packed in self._conn.execute(
+                       "SELECT name, COUNT(*), SUM(refs), SUM(size * refs), SUM(size), SUM(stored) FROM sections "
+                       "GROUP BY name ORDER BY SUM(size * refs) DESC")]
+        return {
+            'Reportes': reports,
+            'Equipos': machines,
+            'Secciones referenciadas': references,
+            'Secciones únicas': unique,
+            'Tamaño lógico (MB)': round(logical / mb, 2),
+            'Secciones únicas sin comprimir (MB)': round(unique_bytes / mb, 2),
+            'Guardado (MB)': round(stored / mb, 2),
+            'Archivo de la base (MB)': round(page_count * page_size / mb, 2),
+            'Deduplicación': f"{referenced_bytes / unique_bytes:.1f}x" if unique_bytes else 'N/A',
+            'Compresión': f"{unique_bytes / section_bytes:.1f}x" if section_bytes else 'N/A',
+            'Reducción total': f"{logical / stored:.1f}x" if stored else 'N/A',
+            'Por sección': by_name,
+        }
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,210 @@
+"""Escritura incremental y atómica del reporte.
+
+Mientras corren los recolectores, ``ReportWriter`` agrega cada sección
+terminada a un diario (``notebook_report.json.parcial``, una línea JSON por
+sección, con flush y fsync), así que un corte a mitad de la revisión no
+pierde lo ya recolectado. Al terminar, ``finalize`` escribe el reporte
+completo en un archivo temporal y lo reemplaza con ``os.replace``: quien lea
+``notebook_report.json`` ve el reporte anterior o el nuevo, nunca uno a
+medias.
+
+* Si la revisión se interrumpe (``KeyboardInterrupt``), ``abort`` arma un
+  reporte con las secciones del diario y la lista de las que faltaron.
+* Si el proceso muere sin llegar a eso, el diario queda en disco y la
+  siguiente ejecución lo recupera como ``notebook_report.incompleto.json``.
+* Las secciones que llegan como ``StreamedSection`` (el software completo)
+  no pasan por el diario: se escriben elemento a elemento en el archivo final.
+
+Si el diario no se puede escribir (carpeta de solo lectura, disco lleno) la
+revisión sigue sin él; solo se pierde la recuperación de secciones.
+"""
+import datetime
+import json
+import os
+import tempfile
+import threading
+import weakref
+
+JOURNAL_SUFFIX = '.parcial'
+INCOMPLETE_SECTION = 'Revisión incompleta'
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class StreamedSection:
+    """Sección producida por un generador que se recorre una sola vez.
+
+    La primera lectura consume ``source`` y deja cada elemento en un archivo
+    temporal (una línea JSON); el historial, el reporte y el transporte de la
+    flota leen luego ese archivo, sin volver a recorrer el origen ni tener la
+    lista entera en memoria.
+    """
+
+    def __init__(self, source):
+        self._source = source
+        self._path = None
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _spool(self):
+        with self._lock:
+            if self._path is not None:
+                return self._path
+            fd, path = tempfile.mkstemp(prefix='seccion-', suffix='.jsonl')
+            weakref.finalize(self, _remove_quietly, path)
+            with open(fd, 'w', encoding='utf-8') as f:
+                for item in self._source:
+                    f.write(json.dumps(item, ensure_ascii=False, default=str) + '\n')
+                    self._count += 1
+            self._source = None
+            self._path = path
+            return path
+
+    def __iter__(self):
+        with open(self._spool(), encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def __len__(self):
+        self._spool()
+        return self._count
+
+
+class _Elements(list):
+    # Lista vacía para el codificador de json: al recorrerla entrega los elementos de la sección
+    def __init__(self, section):
+        super().__init__()
+        self._section = section
+
+    def __iter__(self):
+        return iter(self._section)
+
+    def __bool__(self):
+        return len(self._section) > 0
+
+
+def json_default(o):
+    """``default`` de json: las secciones transmitidas como lista, lo demás como texto"""
+    if isinstance(o, StreamedSection):
+        return _Elements(o)
+    return str(o)
+
+
+def dumps(value):
+    """``json.dumps`` compacto que escribe las secciones transmitidas sin cargarlas"""
+    # iterencode sin _one_shot usa el codificador de Python, que respeta el __iter__ de _Elements
+    return ''.join(iter_json(value))
+
+
+def iter_json(value):
+    """Fragmentos JSON compactos de ``value``, para escribirlos a medida que se generan"""
+    return json.JSONEncoder(ensure_ascii=False, default=json_default).iterencode(value)
+
+
+def write_file_atomic(path, data):
+    """Escribe ``data`` en un temporal junto a ``path`` y lo reemplaza de una vez"""
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            # json.dump (con sangría usa el codificador de Python) escribe por fragmentos
+            json.dump(data, f, indent=4, ensure_ascii=False, default=json_default)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def read_journal(path):
+    """Secciones de un diario en orden de llegada; ignora una última línea cortada"""
+    sections = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            sections[entry['seccion']] = entry['valor']
+    return sections
+
+
+def _incomplete_path(path):
+    base, ext = os.path.splitext(path)
+    return f"{base}.incompleto{ext}"
+
+
+class ReportWriter:
+    """Diario de secciones de una revisión y escritura final del reporte"""
+
+    def __init__(self, path="notebook_report.json"):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        # Diario de una ejecución anterior que terminó sin cerrarlo
+        self.recovered = self._recover_stale()
+        try:
+            self._journal = open(self.journal_path, 'w', encoding='utf-8')
+        except OSError:
+            self._journal = None
+
+    def _recover_stale(self):
+        if not os.path.exists(self.journal_path):
+            return None
+        try:
+            sections = read_journal(self.journal_path)
+            sections[INCOMPLETE_SECTION] = {'Motivo': 'La ejecución anterior terminó sin cerrar el reporte'}
+            target = _incomplete_path(self.path)
+            write_file_atomic(target, sections)
+            os.remove(self.journal_path)
+            return target
+        except (OSError, ValueError):
+            return None
+
+    def append(self, name, value):
+        """Agrega una sección terminada al diario (las transmitidas se escriben al final)"""
+        if self._journal is None or isinstance(value, StreamedSection):
+            return
+        try:
+            self._journal.write(json.dumps({'seccion': name, 'valor': value}, ensure_ascii=False, default=str) + '\n')
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        except (OSError, ValueError):
+            self._journal.close()
+            self._journal = None
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
+
+    def finalize(self, report):
+        """Escribe el reporte completo y descarta el diario"""
+        write_file_atomic(self.path, report)
+        self._close_journal()
+        return self.path
+
+    def abort(self, reason, expected=()):
+        """Reporte con las secciones que alcanzaron a terminar; devuelve su ruta"""
+        if self._journal is not None:
+            self._journal.flush()
+        sections = read_journal(self.journal_path) if os.path.exists(self.journal_path) else {}
+        sections['Fecha de Revisión'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        sections[INCOMPLETE_SECTION] = {
+            'Motivo': reason,
+            'Secciones faltantes': [name for name in expected if name not in sections],
+        }
+        write_file_atomic(self.path, sections)
+        self._close_journal()
+        return self.path
@@ -0,0 +1,161 @@
+"""Registro de recolectores y planificador concurrente.
+
+Cada recolector produce una sección del reporte. Los recolectores
+independientes se ejecutan en paralelo en un pool de hilos (la mayoría espera
+por WMI, el registro o subprocesos), respetando dependencias y un tiempo
+máximo por recolector. El resultado mantiene el orden de registro, de modo que
+el reporte tiene la misma forma que antes; quien quiera mostrar o guardar cada
+sección apenas termina recibe un aviso por recolector (``on_result``).
+
+Cada recolector corre en un hilo daemon propio: un hilo colgado (WMI,
+``slmgr``) no se puede interrumpir, pero tampoco impide que el proceso
+termine, como sí ocurre con los hilos de ``ThreadPoolExecutor``.
+"""
+import concurrent.futures
+import threading
+import time
+
+# Espera máxima entre revisiones de plazos: en Windows Ctrl+C no interrumpe una espera sin plazo
+POLL_INTERVAL = 0.5
+
+
+class Collector:
+    """Recolector registrado: produce la sección ``name`` del reporte"""
+
+    def __init__(self, name, func, depends_on=(), timeout=60.0):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+
+    def run(self, results):
+        # Los recolectores con dependencias reciben los resultados de estas
+        if self.depends_on:
+            return self.func({dep: results[dep] for dep in self.depends_on})
+        return self.func()
+
+
+def _start_daemon(name, func, *args):
+    """Ejecuta ``func(*args)`` en un hilo daemon y devuelve su ``Future``"""
+    future = concurrent.futures.Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name=f"recolector-{name}", daemon=True).start()
+    return future
+
+
+class CollectorRegistry:
+    """Conjunto ordenado de recolectores"""
+
+    def __init__(self):
+        self._collectors = {}
+
+    def register(self, name, func, depends_on=(), timeout=60.0):
+        for dep in depends_on:
+            if dep not in self._collectors:
+                raise ValueError(f"El recolector '{name}' depende de '{dep}', que no está registrado")
+        self._collectors[name] = Collector(name, func, depends_on, timeout)
+        return func
+
+    def __iter__(self):
+        return iter(self._collectors.values())
+
+    def __len__(self):
+        return len(self._collectors)
+
+    def __contains__(self, name):
+        return name in self._collectors
+
+    def get(self, name):
+        return self._collectors[name]
+
+
+def run_collectors(registry, max_workers=None, tracer=None, on_result=None):
+    """Ejecuta los recolectores en paralelo.
+
+    Devuelve ``(resultados, tiempos)``: las secciones en el orden de registro y
+    la duración de cada recolector en segundos. Un recolector que falla o
+    supera su tiempo máximo deja una sección ``{'Error': ...}`` en su lugar;
+    sus dependientes reciben ese mismo resultado. Con ``tracer`` cada
+    recolector queda medido como un span de categoría ``recolector``.
+
+    ``on_result(nombre, resultado, segundos)`` se llama en el hilo que invocó
+    a ``run_collectors`` en cuanto cada recolector termina (o agota su
+    plazo), en orden de llegada.
+    """
+    collectors = list(registry)
+    results = {}
+    timings = {}
+    started = {}
+    lock = threading.Lock()
+    waiting = {c.name: c for c in collectors}
+    running = {}
+
+    def execute(collector, dep_results):
+        with lock:
+            started[collector.name] = time.perf_counter()
+        if tracer is None:
+            return collector.run(dep_results)
+        with tracer.span(collector.name, 'recolector'):
+            return collector.run(dep_results)
+
+    while waiting or running:
+        # Lanzar los recolectores cuyas dependencias ya terminaron
+        for name, collector in list(waiting.items()):
+            if max_workers and len(running) >= max_workers:
+                break
+            if all(dep in results for dep in collector.depends_on):
+                del waiting[name]
+                future = _start_daemon(name, execute, collector, dict(results))
+                running[future] = collector
+
+        now = time.perf_counter()
+        with lock:
+            deadlines = [started[c.name] + c.timeout for c in running.values()
+                         if c.timeout and c.name in started]
+        wait_for = max(min(deadlines) - now, 0) if deadlines else None
+        # Sin plazos activos aún (ningún hilo arrancó): reintentar pronto
+        if wait_for is None and any(c.timeout for c in running.values()):
+            wait_for = 0.05
+        wait_for = POLL_INTERVAL if wait_for is None else min(wait_for, POLL_INTERVAL)
+        done, _ = concurrent.futures.wait(list(running), timeout=wait_for,
+                                          return_when=concurrent.futures.FIRST_COMPLETED)
+
+        for future in done:
+            collector = running.pop(future)
+            with lock:
+                start = started.get(collector.name, time.perf_counter())
+            timings[collector.name] = time.perf_counter() - start
+            try:
+                results[collector.name] = future.result()
+            except Exception as e:
+                results[collector.name] = {'Error': f"Recolector falló: {str(e)}"}
+            if on_result is not None:
+                on_result(collector.name, results[collector.name], timings[collector.name])
+
+        now = time.perf_counter()
+        for future, collector in list(running.items()):
+            with lock:
+                start = started.get(collector.name)
+            if collector.timeout and start is not None and now - start >= collector.timeout:
+                # El hilo no se puede interrumpir; se abandona su resultado
+                running.pop(future)
+                future.cancel()
+                timings[collector.name] = now - start
+                results[collector.name] = {'Error': f"Tiempo de espera agotado ({collector.timeout:g} s)"}
+                if tracer is not None:
+                    tracer.record(collector.name, 'recolector', start, now - start, timeout=True)
+                if on_result is not None:
+                    on_result(collector.name, results[collector.name], timings[collector.name])
+
+    ordered = {c.name: results[c.name] for c in collectors}
+    return ordered, {c.name: timings.get(c.name, 0.0) for c in collectors}
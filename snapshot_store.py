@@ -0,0 +1,196 @@
+"""Historial local de revisiones y reutilización de secciones estables.
+
+Cada revisión se guarda en SQLite (solo se agregan filas), identificada por el
+número de serie de la BIOS y el nombre del host; sin un número de serie
+confiable no se reutiliza nada. Las secciones que cambian poco
+(BIOS, procesador, GPU, software instalado) se reutilizan de la revisión
+anterior cuando su huella barata (fechas de última escritura de claves del
+registro, valores de la BIOS) no ha cambiado; las secciones volátiles se
+recolectan siempre. También se calcula la diferencia con la revisión anterior.
+"""
+import datetime
+import hashlib
+import json
+import sqlite3
+import threading
+
+from report_writer import StreamedSection, dumps
+
+# Claves del reporte que cambian en cada ejecución y no cuentan como diferencia
+# (las que empiezan con '_' son datos para máquinas y también se ignoran)
+VOLATILE_KEYS = ('Fecha de Revisión', 'Tiempos de Recolección (s)', 'Cambios desde la última revisión',
+                 'Rendimiento de Discos', 'Prueba de Núcleos', 'Prueba de Memoria RAM', 'Interfaces de Red')
+
+
+# Números de serie de relleno que dejan muchos fabricantes: no identifican al equipo
+PLACEHOLDER_SERIALS = {'', 'n/a', 'none', 'default string', 'to be filled by o.e.m.', 'system serial number',
+                       '0', '00000000', '0123456789'}
+
+
+def usable_serial(serial):
+    """``serial`` sin espacios si identifica al equipo; ``None`` si falta o es de relleno"""
+    serial = str(serial or '').strip()
+    return serial if serial.lower() not in PLACEHOLDER_SERIALS else None
+
+
+def _digest(parts):
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def combine_fingerprints(*parts):
+    """Combina varias huellas (o valores) en una sola"""
+    return _digest(parts)
+
+
+def registry_fingerprint(paths, values=False, last_write=True, subkeys=False, backend=None):
+    """Huella barata de claves del registro.
+
+    Usa la fecha de última escritura de cada clave (y de sus subclaves
+    directas si ``subkeys``) y, si ``values``, sus valores. Las claves de
+    ``HARDWARE`` se regeneran en cada arranque, así que para ellas conviene
+    ``values=True, last_write=False``.
+    """
+    if backend is None:
+        from software_inventory import WinregBackend
+        backend = WinregBackend()
+    parts = []
+    for path in paths:
+        try:
+            with backend.open_key(None, path) as key:
+                part = [path, backend.last_write(key) if last_write else None,
+                        sorted(backend.iter_values(key), key=lambda v: v[0]) if values else None]
+                if subkeys:
+                    for name in backend.iter_subkeys(key):
+                        try:
+                            with backend.open_key(key, name) as subkey:
+                                part.append([name, backend.last_write(subkey)])
+                        except OSError:
+                            part.append([name, None])
+                parts.append(part)
+        except OSError:
+            parts.append([path, None])
+    return _digest(parts)
+
+
+class SnapshotStore:
+    """Revisiones guardadas en una base SQLite"""
+
+    def __init__(self, path="notebook_snapshots.db"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    serial TEXT,
+                    hostname TEXT,
+                    created TEXT,
+                    fingerprints TEXT,
+                    report TEXT
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_machine ON snapshots (hostname, serial, id)")
+
+    def latest(self, hostname, serial=None):
+        """Última revisión del equipo: ``(reporte, huellas)`` o ``(None, {})``"""
+        query = "SELECT report, fingerprints FROM snapshots WHERE hostname = ?"
+        params = [hostname]
+        if serial is not None:
+            query += " AND serial = ?"
+            params.append(serial)
+        with self._lock:
+            row = self._conn.execute(query + " ORDER BY id DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None, {}
+        return json.loads(row[0]), json.loads(row[1])
+
+    def save(self, serial, hostname, report, fingerprints):
+        # Las secciones transmitidas se leen de su archivo temporal, no del origen
+        data = dumps(report)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO snapshots (serial, hostname, created, fingerprints, report) VALUES (?, ?, ?, ?, ?)",
+                (serial, hostname, datetime.datetime.now().isoformat(timespec='seconds'),
+                 json.dumps(fingerprints), data))
+
+    def close(self):
+        self._conn.close()
+
+
+class SectionCache:
+    """Reutiliza secciones de la revisión anterior si su huella coincide.
+
+    Sin revisión anterior simplemente recolecta todo; en ambos casos registra
+    las huellas calculadas para guardarlas junto con la revisión.
+    """
+
+    def __init__(self, previous=None, fingerprints=None):
+        self._lock = threading.Lock()
+        self.reset(previous, fingerprints)
+
+    def reset(self, previous=None, fingerprints=None):
+        """Prepara una nueva revisión a partir del reporte anterior y sus huellas"""
+        with self._lock:
+            self.previous = previous or {}
+            self.previous_fingerprints = fingerprints or {}
+            self.fingerprints = {}
+            self.reused = []
+
+    def get(self, name, fingerprint, collect):
+        """Devuelve la sección ``name``: la guardada si ``fingerprint()`` no cambió, o ``collect()``"""
+        try:
+            current = fingerprint()
+        except Exception:
+            current = None
+        if current is not None:
+            cached = _find(self.previous, name)
+            if self.previous_fingerprints.get(name) == current and cached is not None and not _has_error(cached):
+                with self._lock:
+                    self.fingerprints[name] = current
+                    self.reused.append(name)
+                return cached
+        data = collect()
+        if current is not None and not _has_error(data):
+            # Una sección con error no debe reutilizarse la próxima vez
+            with self._lock:
+                self.fingerprints[name] = current
+        return data
+
+
+def _has_error(data):
+    if isinstance(data, dict):
+        return 'Error' in data
+    if isinstance(data, list):
+        return bool(data) and isinstance(data[0], dict) and 'Error' in data[0]
+    return False
+
+
+def _find(report, name):
+    # Las secciones pueden estar en el primer nivel o dentro de otra sección
+    if name in report:
+        return report[name]
+    for value in report.values():
+        if isinstance(value, dict) and name in value:
+            return value[name]
+    return None
+
+
+def diff_reports(old, new, path=()):
+    """Lista de cambios entre dos reportes: ``{'Ruta', 'Antes', 'Después'}``"""
+    changes = []
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in list(old) + [k for k in new if k not in old]:
+            if not path and (key in VOLATILE_KEYS or key.startswith('_')):
+                continue
+            if key not in new:
+                changes.append({'Ruta': ' > '.join(path + (key,)), 'Antes': old[key], 'Después': None})
+            elif key not in old:
+                changes.append({'Ruta': ' > '.join(path + (key,)), 'Antes': None, 'Después': new[key]})
+            else:
+                changes.extend(diff_reports(old[key], new[key], path + (key,)))
+    elif isinstance(old, list) and isinstance(new, (list, StreamedSection)) and len(old) == len(new):
+        for i, (a, b) in enumerate(zip(old, new)):
+            changes.extend(diff_reports(a, b, path + (f"[{i}]",)))
+    elif old != new:
+        changes.append({'Ruta': ' > '.join(path), 'Antes': old, 'Después': new})
+    return changes
@@ -0,0 +1,88 @@
+"""Enumeración del software instalado a partir de las claves Uninstall.
+
+Cada subclave se abre una sola vez, sus valores se leen en una pasada con
+``EnumValue`` y el handle se cierra al terminar. Las entradas se producen con
+un generador, así que se puede quedar con los primeros N (selección por
+montículo) o volcar la lista completa al reporte sin tenerla entera en memoria.
+
+El acceso al registro es intercambiable: cualquier objeto con la interfaz de
+``WinregBackend`` sirve, por ejemplo una colmena falsa en Linux.
+"""
+import heapq
+
+UNINSTALL_KEYS = (
+    r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"SOFTWARE\Wow6432Node\Microsoft\Windows\CurrentVersion\Uninstall",
+)
+
+# Valor del registro -> campo del reporte
+FIELDS = {
+    'DisplayName': 'Nombre',
+    'DisplayVersion': 'Versión',
+    'Publisher': 'Publicador',
+    'InstallDate': 'Fecha de Instalación',
+}
+
+
+class WinregBackend:
+    """Acceso al registro de Windows mediante ``winreg``"""
+
+    def __init__(self):
+        import winreg
+        self._winreg = winreg
+        self.root = winreg.HKEY_LOCAL_MACHINE
+
+    def open_key(self, parent, path):
+        """Abre ``path`` bajo ``parent`` (o bajo HKLM si es None); usable con ``with``"""
+        return self._winreg.OpenKey(self.root if parent is None else parent, path)
+
+    def iter_subkeys(self, key):
+        for i in range(self._winreg.QueryInfoKey(key)[0]):
+            yield self._winreg.EnumKey(key, i)
+
+    def last_write(self, key):
+        """Fecha de última escritura de la clave (en unidades de 100 ns)"""
+        return self._winreg.QueryInfoKey(key)[2]
+
+    def iter_values(self, key):
+        for i in range(self._winreg.QueryInfoKey(key)[1]):
+            name, data, _ = self._winreg.EnumValue(key, i)
+            yield name, data
+
+
+def _read_entry(backend, parent, name):
+    with backend.open_key(parent, name) as subkey:
+        values = {}
+        for value_name, data in backend.iter_values(subkey):
+            if value_name in FIELDS:
+                values[value_name] = data
+    if not values.get('DisplayName'):
+        return None
+    return {label: values.get(value_name) or 'N/A' for value_name, label in FIELDS.items()}
+
+
+def iter_installed_software(backend=None):
+    """Genera una entrada por programa instalado, en el orden del registro"""
+    backend = backend or WinregBackend()
+    opened = False
+    for path in UNINSTALL_KEYS:
+        try:
+            root = backend.open_key(None, path)
+        except OSError:
+            continue
+        opened = True
+        with root:
+            for subkey_name in backend.iter_subkeys(root):
+                try:
+                    entry = _read_entry(backend, root, subkey_name)
+                except OSError:
+                    continue
+                if entry is not None:
+                    yield entry
+    if not opened:
+        raise OSError("No se encontraron las claves Uninstall del registro")
+
+
+def top_software(n, backend=None):
+    """Primeros ``n`` programas por nombre, sin ordenar la lista completa"""
+    return heapq.nsmallest(n, iter_installed_software(backend), key=lambda s: s['Nombre'])
@@ -0,0 +1,45 @@
+"""Pruebas de la clasificación de ``audio_test`` sobre ``SyntheticLoopback``."""
+import pytest
+
+from audio_test import SyntheticLoopback, run_loopback_test
+
+
+def states(result):
+    return [c['Estado'] for c in result['Canales']]
+
+
+def test_clean_loop_passes_with_latency():
+    result = run_loopback_test(SyntheticLoopback(latency=0.03))
+    assert result['Resultado'] == 'OK'
+    assert states(result) == ['OK', 'OK']
+    assert result['Problemas'] == []
+    assert result['Latencia entrada-salida (ms)'] == pytest.approx(30.0, abs=1.0)
+
+
+@pytest.mark.parametrize('dead', [0, 1])
+def test_one_dead_channel_fails(dead):
+    result = run_loopback_test(SyntheticLoopback(dead_channels=[dead]))
+    assert states(result)[dead] == 'Muerto'
+    assert states(result)[1 - dead] == 'OK'
+    assert result['Resultado'] == 'FALLÓ'
+    assert f"Canal {dead + 1}: muerto" in result['Problemas']
+
+
+def test_saturated_input_fails():
+    result = run_loopback_test(SyntheticLoopback(overdrive=6))
+    assert set(states(result)) == {'Saturado'}
+    assert result['Resultado'] == 'FALLÓ'
+
+
+def test_no_signal_fails_without_latency():
+    result = run_loopback_test(SyntheticLoopback(gain=0.0))
+    assert states(result) == ['Muerto', 'Muerto']
+    assert result['Latencia entrada-salida (ms)'] is None
+    assert result['Resultado'] == 'FALLÓ'
+
+
+def test_distortion_raises_thd_but_passes():
+    clean = run_loopback_test(SyntheticLoopback())
+    distorted = run_loopback_test(SyntheticLoopback(distortion=0.5))
+    assert distorted['Resultado'] == 'OK'
+    assert distorted['Canales'][0]['THD (%)'] > clean['Canales'][0]['THD (%)'] * 5
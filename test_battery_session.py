@@ -0,0 +1,76 @@
+"""Pruebas de ``battery_session`` con la batería y el reloj simulados."""
+import numpy as np
+import pytest
+
+from battery_session import (PERCENT, BatterySession, RingBuffer, SimulatedBattery, SimulatedLoad,
+                             VirtualClock, battery_wear, fit_discharge)
+
+
+def session_for(hours, **battery_options):
+    clock = VirtualClock()
+    battery = SimulatedBattery(clock, **battery_options)
+    return battery, BatterySession(battery, interval=10, clock=clock.now, sleep=clock.sleep), hours * 3600
+
+
+def test_ring_buffer_keeps_latest_rows_in_order():
+    buffer = RingBuffer(3, columns=1)
+    for value in range(5):
+        buffer.append((value,))
+    assert len(buffer) == 3
+    assert buffer.array()[:, 0].tolist() == [2, 3, 4]
+
+
+def test_idle_session_recovers_power_draw():
+    battery, session, duration = session_for(2, capacity_wh=50.0, percent=95, idle_w=8.0)
+    result = session.run(duration, capacity_wh=battery.capacity_wh, wear=battery_wear(50000, 50000))
+    fit = result['Ajuste de descarga']
+    assert result['Muestras'] == 721
+    assert fit['Consumo medio (W)'] == pytest.approx(8.0, rel=0.05)
+    assert fit['Autonomía con carga completa (h)'] == pytest.approx(50 / 8, rel=0.05)
+    assert fit['R² del ajuste'] > 0.99
+    assert result['Resultado'] == 'OK'
+
+
+def test_load_raises_drain_and_worn_battery_is_flagged():
+    battery, session, duration = session_for(1, capacity_wh=27.0, percent=95, idle_w=8.0, load_w=20.0)
+    result = session.run(duration, SimulatedLoad(battery), battery.capacity_wh, battery_wear(50000, 27000))
+    assert result['Carga controlada'] is True
+    assert result['Ajuste de descarga']['Consumo medio (W)'] == pytest.approx(28.0, rel=0.05)
+    assert result['Capacidad']['Desgaste (%)'] == 46.0
+    assert result['Resultado'] == 'REVISAR'
+
+
+def test_plugged_in_session_cannot_fit():
+    _, session, duration = session_for(1, plugged=True)
+    result = session.run(duration)
+    assert 'Ajuste de descarga' not in result
+    assert result['Cargador conectado en algún momento'] is True
+    assert result['Resultado'] == 'REVISAR'
+
+
+def test_no_battery():
+    class Missing:
+        def read(self):
+            return None
+    assert BatterySession(Missing()).run(10) == {'Error': 'No se detectó batería'}
+
+
+def test_fit_ignores_samples_at_zero_percent():
+    t = np.arange(0, 3600, 60.0)
+    samples = np.column_stack([t, np.maximum(50 - t / 36, 0), np.full_like(t, np.nan), np.zeros_like(t)])
+    assert (samples[:, PERCENT] == 0).any()
+    assert fit_discharge(samples)['Descarga (%/h)'] == pytest.approx(100.0, rel=0.01)
+
+
+def test_fit_uses_the_longest_unplugged_stretch():
+    # 30 min descargando, 20 min cargando y 10 min descargando otra vez
+    t = np.arange(0, 3600, 60.0)
+    plugged = ((t >= 1800) & (t < 3000)).astype(float)
+    percent = np.where(t < 1800, 90 - t / 90, np.where(t < 3000, 70 + (t - 1800) / 60, 90 - (t - 3000) / 90))
+    samples = np.column_stack([t, percent, np.full_like(t, np.nan), plugged])
+    assert fit_discharge(samples)['Descarga (%/h)'] == pytest.approx(40.0, rel=0.01)
+
+
+def test_wear_needs_both_capacities():
+    assert battery_wear(None, 40000) is None
+    assert battery_wear(50000, 55000)['Desgaste (%)'] == 0.0
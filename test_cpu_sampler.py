@@ -0,0 +1,62 @@
+"""Pruebas de ``CpuSampler`` con el ``psutil`` falso de ``benchmarks/fake_system.py``."""
+import time
+
+import pytest
+
+from cpu_sampler import CpuSampler
+from fake_system import FakePsutil
+
+
+@pytest.fixture
+def sampler():
+    sampler = CpuSampler(interval=0.01, psutil_module=FakePsutil(cores=4))
+    yield sampler
+    sampler.stop()
+
+
+def test_summary_starts_sampling_and_covers_every_core(sampler):
+    summary = sampler.summary(min_samples=3, timeout=2.0)
+    assert sampler.running
+    assert summary['samples'] >= 3
+    assert len(summary['cores']) == 4
+    assert all(5 <= c['min'] <= c['avg'] <= c['max'] <= 40 for c in summary['cores'])
+    assert summary['freq_current'] == 2400.0
+    assert len(summary['temps']['coretemp']) == 4
+
+
+def test_window_is_bounded():
+    sampler = CpuSampler(interval=0.005, window=5, psutil_module=FakePsutil())
+    try:
+        sampler.start()
+        time.sleep(0.1)
+        assert len(sampler.samples()) == 5
+    finally:
+        sampler.stop()
+
+
+def test_stop_ends_sensor_reads(sampler):
+    sampler.summary(timeout=2.0)
+    sampler.stop()
+    assert not sampler.running
+    calls = sampler._psutil.calls
+    time.sleep(0.05)
+    assert sampler._psutil.calls == calls
+    sampler.stop()
+
+
+def test_restart_drops_previous_samples(sampler):
+    sampler.summary(min_samples=3, timeout=2.0)
+    sampler.stop()
+    sampler.start()
+    assert len(sampler.samples(min_samples=0)) < 3
+
+
+def test_collect_report_stops_sampler(tmp_path):
+    import main
+    from fake_system import simulated_machine
+    with simulated_machine(devices=50, programs=20, latency_scale=0) as machine:
+        main.collect_report(history_path=str(tmp_path / 'historial.db'))
+        assert not main.cpu_sampler.running
+        calls = machine.psutil.calls
+        time.sleep(0.6)
+        assert machine.psutil.calls == calls
@@ -0,0 +1,23 @@
+"""Pruebas de ``device_inventory`` contra el proveedor WMI falso."""
+from device_inventory import DeviceIndex, query_devices
+from fake_wmi import FakeWMIProvider, synthetic_device_inventory
+from wmi_session import WMISession
+
+
+def test_query_works_without_pnpclass():
+    rows = synthetic_device_inventory(2000)
+    # Windows 7: Win32_PnPEntity no tiene PNPClass
+    windows7 = [{k: v for k, v in row.items() if k != 'PNPClass'} for row in rows]
+    provider = FakeWMIProvider({'Win32_PnPEntity': windows7})
+    index = DeviceIndex(query_devices(WMISession(connect=provider.connect)))
+    assert 'PNPClass' not in provider.queries[0]
+    expected = DeviceIndex(rows).counts()
+    # Del audio solo se piden los dispositivos con etiqueta (jack, HDMI)
+    del expected['Audio']
+    assert {k: v for k, v in index.counts().items() if k != 'Audio'} == expected
+
+
+def test_linux_rows_classify_by_pnpclass():
+    rows = [{'Name': 'Integrated Webcam', 'PNPDeviceID': 'LINUX\\VIDEO\\video0', 'PNPClass': 'Camera',
+             'ClassGuid': None}]
+    assert DeviceIndex(rows).counts() == {'Cámara': 1}
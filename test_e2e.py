@@ -0,0 +1,61 @@
+"""Revisión completa sobre el equipo simulado de ``benchmarks/fake_system.py``."""
+import copy
+import json
+
+import pytest
+
+import bench_e2e
+import main as app
+from fake_system import simulated_machine
+
+SIZES = {'devices': 150, 'programs': 100, 'partitions': 2, 'nics': 3}
+
+
+@pytest.fixture(scope='module')
+def run():
+    return bench_e2e.run_once(SIZES, latency_scale=0, camera_seconds=0.2)
+
+
+def test_every_stage_runs(run):
+    stages, collectors, _ = run
+    assert [name for name, _ in bench_e2e.pipeline('.', 0)[1]] == list(stages)
+    expected = [c.name for c in app.build_collectors(20)]
+    assert sorted(collectors) == sorted(expected)
+
+
+def test_provider_counters(run):
+    _, _, counters = run
+    # Un solo proceso de PowerShell para toda la ejecución
+    assert counters['procesos_powershell'] == 1
+    assert counters['comandos_powershell'] >= 1
+    assert 0 < counters['consultas_wmi'] < 40
+    assert counters['claves_registro_abiertas'] > 0
+    assert counters['llamadas_psutil'] > 0
+
+
+def test_report_sections_without_errors(tmp_path):
+    with simulated_machine(latency_scale=0, **SIZES):
+        report = app.collect_report(20, history_path=str(tmp_path / 'historial.db'))
+        again = app.collect_report(20, history_path=str(tmp_path / 'historial.db'))
+        reused = list(app.section_cache.reused)
+    for collector in app.build_collectors(20):
+        assert collector.name in report
+        assert '"Error":' not in json.dumps(report[collector.name], ensure_ascii=False), collector.name
+    assert len(report['Software Instalado (primeros 20)']) == 20
+    assert report['_valores']['usb_devices'] > 0
+    # La segunda revisión del mismo equipo reutiliza lo que no cambió y solo difiere en valores volátiles
+    assert {'BIOS', 'Procesador', 'GPU', 'Software Instalado (primeros 20)'} <= set(reused)
+    changed = {change['Ruta'].split(' > ')[0] for change in again['Cambios desde la última revisión']}
+    assert not changed & {'BIOS', 'Puertos', 'Software Instalado (primeros 20)'}
+
+
+def test_compare_flags_regressions_above_threshold_and_floor():
+    baseline = {'escalas': {'pequeño': {'tamaños': SIZES, 'etapas_s': {'revisión': 1.0, 'resumen': 0.001},
+                                        'recolectores_s': {}, 'memoria_pico_kib': {'revisión': 1000}}}}
+    result = {'escalas': copy.deepcopy(baseline['escalas'])}
+    current = result['escalas']['pequeño']
+    current['etapas_s'].update({'revisión': 1.5, 'resumen': 0.002})
+    current['memoria_pico_kib']['revisión'] = 1100
+    regressions = bench_e2e.compare(result, baseline, threshold=0.2)
+    # 'resumen' se duplica pero queda por debajo del mínimo absoluto; la memoria sube solo 10 %
+    assert regressions == [('pequeño', 'etapas_s', 'revisión', 1.0, 1.5)]
@@ -0,0 +1,28 @@
+"""Pruebas de ``fleet``: direcciones y arranque de agentes locales."""
+import time
+
+import pytest
+
+import fleet
+
+
+def test_parse_address():
+    assert fleet.parse_address('8765') == ('127.0.0.1', 8765)
+    assert fleet.parse_address('equipo1') == ('equipo1', 8765)
+    assert fleet.parse_address('0.0.0.0:9000') == ('0.0.0.0', 9000)
+
+
+def test_silent_agent_times_out_and_is_killed(tmp_path):
+    script = tmp_path / 'agente_mudo.py'
+    script.write_text('import time\ntime.sleep(60)\n')
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        fleet.spawn_local_agent(script=str(script), timeout=0.5)
+    assert time.monotonic() - start < 5
+
+
+def test_agent_that_exits_early(tmp_path):
+    script = tmp_path / 'agente_roto.py'
+    script.write_text('import sys\nprint("sin marcador")\nsys.exit(3)\n')
+    with pytest.raises(RuntimeError, match='código 3'):
+        fleet.spawn_local_agent(script=str(script), timeout=10)
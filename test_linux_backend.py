@@ -0,0 +1,84 @@
+"""Pruebas de ``LinuxBackend`` sobre el árbol falso de ``benchmarks/fake_linux_root.py``."""
+import os
+
+import pytest
+
+from device_inventory import DeviceIndex
+from fake_linux_root import write_linux_root
+from linux_backend import LinuxBackend
+from platform_backend import NET_CONNECTED
+
+
+@pytest.fixture
+def root(tmp_path):
+    return write_linux_root(str(tmp_path), usb_devices=3, cameras=1, packages=5, rpm_packages=3)
+
+
+@pytest.fixture
+def backend(root):
+    return LinuxBackend(root)
+
+
+def test_system_rows(backend):
+    assert backend.os_name() == 'Debian GNU/Linux 12 (bookworm) (kernel 6.1.0-26-amd64)'
+    cpu = backend.processor()
+    assert (cpu['NumberOfCores'], cpu['NumberOfLogicalProcessors'], cpu['MaxClockSpeed']) == (4, 8, 4400)
+    bios = backend.bios()
+    assert (bios['Manufacturer'], bios['SerialNumber'], bios['ReleaseDate']) == ('Dell Inc.', 'BANCO01', '20230315')
+    assert backend.secure_boot() is True
+    assert backend.battery_capacity() == (54000, 47000)
+
+
+def test_gpu_resolution_is_preferred_mode_of_a_connected_connector(backend):
+    (gpu,) = backend.gpus()
+    assert gpu['Name'].startswith('Intel') and 'i915' in gpu['Name']
+    # card0-HDMI-A-1 (conectado) se lista antes que card0-eDP-1; DP-1 está desconectado
+    assert (gpu['CurrentHorizontalResolution'], gpu['CurrentVerticalResolution']) == (2560, 1440)
+
+
+def test_devices_classify_like_windows(backend):
+    counts = DeviceIndex(backend.device_rows()).counts()
+    assert counts['Bluetooth'] == 2
+    assert counts['HDMI'] == 2
+    assert counts['Jack'] == 1
+    assert counts['Cámara'] == 1
+    assert counts['Conectado por USB'] == 5
+
+
+def test_wifi_adapter_state_follows_flags_and_rfkill(root, backend):
+    (adapter,) = backend.wifi_adapters()
+    assert adapter['NetEnabled'] is True
+    assert adapter['NetConnectionStatus'] == NET_CONNECTED
+    with open(os.path.join(root, 'sys/class/net/wlp0s20f3/phy80211/rfkill1/soft'), 'w') as f:
+        f.write('1\n')
+    backend.clear()
+    assert backend.wifi_adapters()[0]['NetEnabled'] is False
+
+
+def test_software_from_dpkg_and_rpm(backend):
+    names = [s['Nombre'] for s in backend.iter_software()]
+    assert len(names) == 8
+    assert 'quitado' not in names and 'gpg-pubkey' not in names
+    rpm = next(s for s in backend.iter_software() if s['Nombre'] == 'rpm-00001')
+    assert (rpm['Versión'], rpm['Publicador']) == ('2.1-1.fc40', 'Fedora Project')
+    assert [s['Nombre'] for s in backend.top_software(2)] == ['paquete-00000', 'paquete-00001']
+
+
+def test_no_package_database(tmp_path):
+    with pytest.raises(OSError):
+        list(LinuxBackend(write_linux_root(str(tmp_path), packages=0)).iter_software())
+
+
+def test_machine_id_falls_back_to_machine_id_file(root, backend):
+    assert backend.machine_id() == 'BANCO01'
+    fingerprint = backend.software_fingerprint()
+    # Sin root, product_serial no se puede leer
+    os.remove(os.path.join(root, 'sys/class/dmi/id/product_serial'))
+    backend.clear()
+    assert backend.machine_id() is None
+    assert backend.software_fingerprint() is None
+    with open(os.path.join(root, 'etc/machine-id'), 'w') as f:
+        f.write('0123456789abcdef0123456789abcdef\n')
+    backend.clear()
+    assert backend.machine_id() == 'machine-id:0123456789abcdef0123456789abcdef'
+    assert backend.software_fingerprint() not in (None, fingerprint)
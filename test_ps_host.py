@@ -0,0 +1,80 @@
+"""Pruebas de ``PowerShellHost`` contra ``benchmarks/fake_powershell.py``."""
+import os
+import sys
+import time
+
+import pytest
+
+from ps_host import CommandError, HostError, PowerShellHost
+
+FAKE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fake_powershell.py')
+
+
+@pytest.fixture
+def host():
+    host = PowerShellHost([sys.executable, FAKE], timeout=5.0, start_timeout=10.0)
+    yield host
+    host.close()
+
+
+def test_batch_returns_results_in_order_and_drops_loose_output(host):
+    results = host.batch(['Write-Host ruido sin marcador', 'Confirm-SecureBootUEFI',
+                          'Get-CimInstance SoftwareLicensingProduct'])
+    assert results[0] is None
+    assert results[1] is True
+    assert results[2][0]['LicenseStatus'] == 1
+    assert host.starts == 1
+    assert host.commands_run == 3
+
+
+def test_command_error_keeps_process(host):
+    results = host.batch(["throw 'falló'", 'Confirm-SecureBootUEFI'])
+    assert isinstance(results[0], CommandError)
+    assert str(results[0]) == 'falló'
+    assert results[0].type == 'RuntimeError'
+    assert results[1] is True
+    with pytest.raises(CommandError):
+        host.run('Comando-Inexistente')
+    assert host.starts == 1
+
+
+def test_timeout_discards_process_and_resends_the_rest(host):
+    host.run('Confirm-SecureBootUEFI')
+    results = host.batch(['Start-Sleep -Seconds 30', 'Confirm-SecureBootUEFI'], timeout=0.5)
+    assert isinstance(results[0], HostError)
+    assert results[1] is True
+    assert host.timeouts == 1
+    assert host.starts == 2
+
+
+def test_crash_restarts_and_resends_the_rest(host):
+    results = host.batch(['[Environment]::Exit(3)', 'Confirm-SecureBootUEFI'])
+    assert isinstance(results[0], HostError)
+    assert results[1] is True
+    assert host.starts == 2
+
+
+def test_restart_budget_applies_per_window():
+    host = PowerShellHost([sys.executable, FAKE], timeout=5.0, max_restarts=1, restart_window=1.0)
+    try:
+        for _ in range(2):
+            with pytest.raises(HostError):
+                host.run('[Environment]::Exit(1)')
+        # Tercer arranque dentro de la ventana: se rechaza sin lanzar un proceso
+        with pytest.raises(HostError, match='reinició'):
+            host.run('Confirm-SecureBootUEFI')
+        assert host.starts == 2
+        # Pasada la ventana, el host vuelve a lanzar PowerShell
+        time.sleep(1.1)
+        assert host.run('Confirm-SecureBootUEFI') is True
+        assert host.starts == 3
+    finally:
+        host.close()
+
+
+def test_missing_executable_is_not_retried():
+    host = PowerShellHost(['/no/existe/powershell'])
+    for _ in range(2):
+        with pytest.raises(HostError, match='No se pudo iniciar'):
+            host.run('Confirm-SecureBootUEFI')
+    assert host.starts == 0
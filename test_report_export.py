@@ -0,0 +1,49 @@
+"""Ida y vuelta de los exportadores de ``report_export``."""
+import dataclasses
+import math
+from typing import Optional
+
+import pytest
+
+from report_export import WRITERS, export_records
+from report_schema import NotebookRecord
+
+SAMPLE_VALUES = {Optional[str]: 'Texto ñ', Optional[int]: 17179869184, Optional[float]: 43.5, Optional[bool]: True}
+
+
+def sample_records():
+    full = NotebookRecord(**{f.name: SAMPLE_VALUES[f.type] for f in dataclasses.fields(NotebookRecord)})
+    partial = NotebookRecord(hostname='EQUIPO-02', battery_percent=76.0, secure_boot=False)
+    return [full, partial]
+
+
+def test_jsonl_round_trip_keeps_types_and_missing_values(tmp_path):
+    records = sample_records()
+    path = tmp_path / 'reportes.jsonl'
+    WRITERS['jsonl'].write(records, path)
+    assert WRITERS['jsonl'].load(path) == records
+    # Compacto: una línea por revisión, sin espacios de sangría
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 2 and ': ' not in lines[0]
+
+
+def test_npz_round_trip_by_column(tmp_path):
+    records = sample_records()
+    path = tmp_path / 'reportes.npz'
+    WRITERS['npz'].write(records, path)
+    columns = WRITERS['npz'].load(path)
+    assert set(columns) == {f.name for f in dataclasses.fields(NotebookRecord)}
+    assert columns['hostname'].tolist() == ['Texto ñ', 'EQUIPO-02']
+    assert columns['os'].tolist() == ['Texto ñ', '']
+    assert columns['ram_total_bytes'][0] == 17179869184
+    assert columns['battery_percent'].tolist() == [43.5, 76.0]
+    assert columns['secure_boot'].tolist() == [1.0, 0.0]
+    assert math.isnan(columns['cpu_max_mhz'][1])
+
+
+def test_export_records_writes_each_format(tmp_path):
+    basename = str(tmp_path / 'flota')
+    paths = export_records(sample_records(), basename, ['jsonl', 'npz'])
+    assert paths == [f"{basename}.jsonl", f"{basename}.npz"]
+    with pytest.raises(ValueError):
+        export_records(sample_records(), basename, ['xml'])
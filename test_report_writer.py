@@ -0,0 +1,36 @@
+"""Pruebas de ``report_writer``: secciones transmitidas y escritura del reporte."""
+import datetime
+import json
+
+from report_writer import ReportWriter, StreamedSection, dumps
+
+
+def counted(items, calls):
+    calls.append(1)
+    yield from items
+
+
+def test_streamed_section_walks_its_source_once(tmp_path):
+    calls = []
+    section = StreamedSection(counted([{'Nombre': 'A'}, {'Nombre': 'B'}], calls))
+    report = {'Software Instalado': section, 'Otro': 1}
+    assert json.loads(dumps(report))['Software Instalado'] == [{'Nombre': 'A'}, {'Nombre': 'B'}]
+    writer = ReportWriter(str(tmp_path / 'reporte.json'))
+    writer.append('Software Instalado', section)
+    writer.finalize(report)
+    with open(tmp_path / 'reporte.json', encoding='utf-8') as f:
+        assert json.load(f)['Software Instalado'] == [{'Nombre': 'A'}, {'Nombre': 'B'}]
+    assert len(section) == 2
+    assert calls == [1]
+
+
+def test_empty_streamed_section():
+    assert dumps({'x': StreamedSection(iter([]))}) == '{"x": []}'
+
+
+def test_finalize_writes_values_json_does_not_know(tmp_path):
+    writer = ReportWriter(str(tmp_path / 'reporte.json'))
+    when = datetime.datetime(2024, 5, 1, 12, 30)
+    writer.finalize({'Fecha': when, 'Vacía': StreamedSection(iter([]))})
+    with open(tmp_path / 'reporte.json', encoding='utf-8') as f:
+        assert json.load(f) == {'Fecha': str(when), 'Vacía': []}
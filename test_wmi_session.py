@@ -0,0 +1,98 @@
+"""Pruebas del constructor de WQL y de la sesión WMI compartida."""
+import threading
+
+import pytest
+
+from fake_wmi import FakeWMIProvider, synthetic_pnp_entities
+from wmi_session import AnyOf, Like, WMISession, build_wql, contains, like
+
+ROWS = [{'Name': "Intel(R) Wireless Bluetooth(R)", 'Status': 'OK', 'PNPDeviceID': 'USB\\VID_8087\\1'},
+        {'Name': "Monitor HDMI", 'Status': 'OK', 'PNPDeviceID': 'DISPLAY\\DEL\\1'},
+        {'Name': "Teclado O'Brien", 'Status': 'Error', 'PNPDeviceID': 'ACPI\\PNP0303\\0'}]
+
+
+def test_build_wql_projects_columns_and_filters():
+    assert build_wql('Win32_BIOS', ['Name', 'Status']) == "SELECT Name,Status FROM Win32_BIOS"
+    assert build_wql('Win32_BIOS', []) == "SELECT * FROM Win32_BIOS"
+    wql = build_wql('Win32_PnPEntity', ['Name'], contains(['Name', 'PNPDeviceID'], 'HDMI'))
+    assert wql == "SELECT Name FROM Win32_PnPEntity WHERE (Name LIKE '%HDMI%') OR (PNPDeviceID LIKE '%HDMI%')"
+
+
+def test_like_escapes_quotes_and_backslashes():
+    assert Like('PNPDeviceID', "USB\\%").wql() == "PNPDeviceID LIKE 'USB\\\\%'"
+    assert Like('Name', "%O'Brien%").wql() == "Name LIKE '%O\\'Brien%'"
+
+
+def test_like_matches_like_wmi():
+    assert Like('Name', '%bluetooth%').matches(ROWS[0])
+    assert Like('PNPDeviceID', 'USB\\%').matches(ROWS[0])
+    assert not Like('PNPDeviceID', 'USB\\%').matches(ROWS[1])
+    assert Like('Status', 'O_').matches(ROWS[0])
+    assert not Like('Missing', '%').matches(ROWS[0])
+    assert AnyOf(Like('Name', '%hdmi%'), Like('Status', 'Error')).matches(ROWS[2])
+    assert isinstance(like('Name', '%a%', '%b%'), AnyOf)
+
+
+def test_fake_provider_applies_the_generated_where():
+    provider = FakeWMIProvider({'Win32_PnPEntity': ROWS})
+    session = WMISession(connect=provider.connect)
+    rows = session.query('Win32_PnPEntity', ['Name'], like('Name', '%hdmi%', "%o'brien%"))
+    assert [r['Name'] for r in rows] == ["Monitor HDMI", "Teclado O'Brien"]
+    assert provider.rows_materialized == 2
+
+
+def test_query_is_cached_per_run_and_returns_copies():
+    provider = FakeWMIProvider({'Win32_PnPEntity': ROWS})
+    session = WMISession(connect=provider.connect)
+    first = session.query('Win32_PnPEntity', ['Name', 'Status'])
+    first[0]['Name'] = 'modificado'
+    second = session.query('Win32_PnPEntity', ['Name', 'Status'])
+    assert second[0]['Name'] == ROWS[0]['Name']
+    assert len(provider.queries) == 1
+    # Otras columnas u otro filtro son otra consulta
+    session.query('Win32_PnPEntity', ['Name'])
+    assert len(provider.queries) == 2
+    session.clear()
+    session.query('Win32_PnPEntity', ['Name', 'Status'])
+    assert len(provider.queries) == 3
+
+
+def test_one_connection_used_from_a_single_thread():
+    provider = FakeWMIProvider({'Win32_PnPEntity': synthetic_pnp_entities(200)}, latency=0.01)
+    threads_seen = set()
+    original = provider.query
+
+    def query(wql):
+        threads_seen.add(threading.get_ident())
+        return original(wql)
+
+    provider.query = query
+    session = WMISession(connect=provider.connect)
+    workers = [threading.Thread(target=session.query, args=('Win32_PnPEntity', ['Name'], contains('Name', str(i))))
+               for i in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert provider.connections == 1
+    assert session.connections_opened == 1
+    assert len(provider.queries) == 8
+    assert len(threads_seen) == 1
+    assert threading.get_ident() not in threads_seen
+
+
+def test_failed_connection_is_retried():
+    provider = FakeWMIProvider({'Win32_BIOS': [{'Name': 'BIOS'}]})
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("RPC no disponible")
+        return provider.connect()
+
+    session = WMISession(connect=connect)
+    with pytest.raises(OSError):
+        session.query('Win32_BIOS', ['Name'])
+    assert session.query('Win32_BIOS', ['Name']) == [{'Name': 'BIOS'}]
+    assert session.connections_opened == 1
@@ -0,0 +1,200 @@
+"""Sesión WMI compartida por todos los recolectores.
+
+Abrir una conexión ``wmi.WMI()`` cuesta cientos de milisegundos, así que la
+sesión abre una sola conexión y la usa siempre desde el mismo hilo propio
+(COM no permite compartir una conexión entre hilos): los recolectores le
+encargan las consultas y esperan el resultado. Además hay una caché por
+ejecución indexada por clase, columnas y filtro: cada consulta se ejecuta una
+única vez por revisión.
+
+Las consultas piden solo las columnas necesarias y envían el filtro como
+cláusula WHERE, de modo que el proveedor WMI filtra en lugar de materializar
+miles de filas de ``Win32_PnPEntity`` en Python.
+
+El backend es inyectable: ``connect`` es cualquier función que devuelva un
+objeto con un método ``query(wql)``, por lo que se puede usar un proveedor
+falso en Linux para contar conexiones y consultas. Con un ``tracer`` (ver
+``instrumentation``) cada consulta queda medida como un span ``wmi``.
+"""
+import concurrent.futures
+import queue
+import re
+import threading
+
+
+class Like:
+    """Condición ``columna LIKE patrón`` (sin distinguir mayúsculas)"""
+
+    def __init__(self, column, pattern):
+        self.column = column
+        self.pattern = pattern
+        regex = ''.join('.*' if ch == '%' else '.' if ch == '_' else re.escape(ch)
+                        for ch in pattern)
+        self._regex = re.compile(f"^{regex}$", re.IGNORECASE | re.DOTALL)
+        # '%texto%' es el caso habitual y se resuelve con una búsqueda simple
+        inner = pattern[1:-1]
+        self._substring = (inner.lower() if len(pattern) >= 2 and pattern[0] == pattern[-1] == '%'
+                           and '%' not in inner and '_' not in inner else None)
+
+    def wql(self):
+        escaped = self.pattern.replace("\\", "\\\\").replace("'", "\\'")
+        return f"{self.column} LIKE '{escaped}'"
+
+    def matches(self, row):
+        value = row.get(self.column) if isinstance(row, dict) else getattr(row, self.column, None)
+        if value is None:
+            return False
+        if self._substring is not None:
+            return self._substring in str(value).lower()
+        return self._regex.match(str(value)) is not None
+
+
+class AnyOf:
+    """Disyunción (OR) de varias condiciones"""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def wql(self):
+        return " OR ".join(f"({c.wql()})" for c in self.conditions)
+
+    def matches(self, row):
+        return any(c.matches(row) for c in self.conditions)
+
+
+def like(column, *patterns):
+    """Filtro que acepta filas cuyo ``column`` coincide con algún patrón"""
+    conditions = [Like(column, p) for p in patterns]
+    return conditions[0] if len(conditions) == 1 else AnyOf(*conditions)
+
+
+def contains(columns, text):
+    """Filtro que busca ``text`` dentro de cualquiera de las columnas dadas"""
+    if isinstance(columns, str):
+        columns = [columns]
+    conditions = [Like(col, f"%{text}%") for col in columns]
+    return conditions[0] if len(conditions) == 1 else AnyOf(*conditions)
+
+
+def build_wql(wmi_class, columns, where=None):
+    """Construye la consulta WQL con proyección de columnas y filtro"""
+    wql = f"SELECT {','.join(columns) if columns else '*'} FROM {wmi_class}"
+    if where is not None:
+        wql += f" WHERE {where.wql()}"
+    return wql
+
+
+def default_connect(namespace=None):
+    """Abre una conexión WMI real (solo Windows); por defecto en ``root\\cimv2``"""
+    try:
+        # Cada hilo que usa COM debe inicializarlo antes de conectarse
+        import pythoncom
+        pythoncom.CoInitialize()
+    except ImportError:
+        pass
+    import wmi
+    return wmi.WMI(namespace=namespace) if namespace else wmi.WMI()
+
+
+class WMISession:
+    """Una conexión WMI atendida por un hilo COM propio y caché de consultas para una ejecución"""
+
+    def __init__(self, connect=None, tracer=None):
+        self._connect = connect or default_connect
+        self.tracer = tracer
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._key_locks = {}
+        self._conn = None
+        self._requests = queue.Queue()
+        self._thread = None
+        self.connections_opened = 0
+        self.queries_run = 0
+
+    def _call(self, func, *args):
+        """Ejecuta ``func(*args)`` en el hilo COM de la sesión y devuelve su resultado"""
+        future = concurrent.futures.Future()
+        with self._lock:
+            if self._thread is None:
+                # Daemon: una consulta colgada no impide que el proceso termine
+                self._thread = threading.Thread(target=self._serve, name="wmi-com", daemon=True)
+                self._thread.start()
+        self._requests.put((func, args, future))
+        return future.result()
+
+    def _serve(self):
+        while True:
+            func, args, future = self._requests.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _connection(self):
+        # Solo desde el hilo COM; si la conexión falla se reintenta en la próxima consulta
+        if self._conn is None:
+            self._conn = self._connect()
+            with self._lock:
+                self.connections_opened += 1
+        return self._conn
+
+    def query(self, wmi_class, columns, where=None):
+        """Consulta una clase WMI y devuelve una lista de diccionarios.
+
+        ``where`` es una condición construida con ``like``/``contains``. El
+        resultado se guarda en caché por (clase, columnas, filtro); se devuelve
+        una copia para que los recolectores puedan modificar las filas.
+        """
+        if self.tracer is None:
+            return self._query(wmi_class, columns, where)
+        with self.tracer.span(wmi_class, 'wmi') as span:
+            rows = self._query(wmi_class, columns, where, span)
+            span.set(filas=len(rows))
+            return rows
+
+    def _query(self, wmi_class, columns, where, span=None):
+        key = (wmi_class, tuple(columns), where.wql() if where is not None else None)
+        with self._lock:
+            rows = self._cache.get(key)
+            if rows is None:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+        if rows is None:
+            # Un solo hilo consulta cada clase; los demás esperan su resultado
+            with key_lock:
+                with self._lock:
+                    rows = self._cache.get(key)
+                if rows is None:
+                    rows = self._fetch(wmi_class, columns, where)
+                    if span is not None:
+                        span.set(cache=False)
+                    with self._lock:
+                        self._cache[key] = rows
+        if span is not None and 'cache' not in span.attrs:
+            span.set(cache=True)
+        return [dict(row) for row in rows]
+
+    def _fetch(self, wmi_class, columns, where):
+        return self._call(self._fetch_rows, wmi_class, columns, where)
+
+    def _fetch_rows(self, wmi_class, columns, where):
+        conn = self._connection()
+        with self._lock:
+            self.queries_run += 1
+        rows = []
+        for item in conn.query(build_wql(wmi_class, columns, where)):
+            row = {}
+            for attr in columns:
+                try:
+                    row[attr] = getattr(item, attr, "N/A")
+                except Exception:
+                    row[attr] = "Error"
+            rows.append(row)
+        return rows
+
+    def clear(self):
+        """Vacía la caché para comenzar una nueva revisión"""
+        with self._lock:
+            self._cache.clear()
+            self._key_locks.clear()